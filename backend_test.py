@@ -4,17 +4,119 @@ Backend API Integration Tests for Admin Dashboard
 Tests DummyJSON API endpoints used by the application
 """
 
-import requests
+import argparse
 import json
+import requests
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
 
+from tests.adaptive import AdaptiveLimiters
+from tests.auth import TokenManager, print_auth_stats, token_expiry
+from tests.baseline import (
+    DEFAULT_STORE,
+    BaselineStore,
+    BenchmarkRun,
+    compare,
+    metrics_from_crawl,
+    metrics_from_latency,
+    metrics_from_load,
+)
+from tests.cache_sim import TraceWriter
+from tests.cassette import Cassette, CassetteWriter, recording_transport, replay_transport
+from tests.crawler import CATALOG_RESOURCES, DEFAULT_PAGE_SIZES, CrawlError, PaginationCrawler, print_sweep
+from tests.decoders import DECODERS, JsonDecoder, get_decoder
+from tests.cacheproxy import DEFAULT_CAPACITY, DEFAULT_STALE, CachingProxy
+from tests.dummyjson_server import StandInProcess, add_profile_arguments, server_from_args
+from tests.faultproxy import (
+    DEFAULT_BUDGETS,
+    SCENARIOS,
+    ScenarioObserver,
+    ScenarioResult,
+    parse_fault_specs,
+    print_scenarios,
+    scenario_budget,
+    start_proxies,
+)
+from tests.http_pool import SessionPool
+from tests.latency import LatencyRecorder
+from tests.load import LoadScenario, OpenLoopLoadGenerator, run_sharded
+from tests.profiling import PROFILE_MODES, CheckProfiler
+from tests.results import ResultSink
+from tests.schemas import SCHEMAS, SchemaReport
+from tests.search_bench import (
+    DEFAULT_DEBOUNCE_MS,
+    SEARCH_RESOURCES,
+    SearchBenchmark,
+    load_corpus,
+    print_search_result,
+)
+from tests.snapshot import Aggregates, Snapshot, print_aggregates
+from tests.soak import SoakRunner, SoakThresholds, print_soak_report
+from tests.synthetic import SyntheticStandIn
+
+DUMMYJSON_URL = "https://dummyjson.com"
+INTERNAL_API_URL = "https://abroad-navigator.preview.emergentagent.com"
+
 class DummyJSONAPITester:
-    def __init__(self):
-        self.base_url = "https://dummyjson.com"
+    def __init__(self, base_url=DUMMYJSON_URL, internal_base_url=INTERNAL_API_URL, http=None,
+                 results=None, retain_results=None, tokens=None, timeout=10, profiler=None, decoder=None):
+        self.base_url = base_url.rstrip('/')
+        self.internal_base_url = internal_base_url.rstrip('/')
+        self.http = http or SessionPool()
+        if self.http.recorder is None:
+            self.http.recorder = LatencyRecorder()
+        self.latency = self.http.recorder
+        # Running counters (and optional JSONL stream) that back the summary
+        self.results = results or ResultSink()
+        # Only keep every result dict in memory when nothing is streaming them to disk
+        self.retain_results = self.results.path is None if retain_results is None else retain_results
         self.test_results = []
+        # When False only failing checks are printed (soak runs)
+        self.verbose = True
         self.auth_token = None
-        
+        # Per-request timeout for every check; requests applies it to each socket read, not the whole request
+        self.timeout = timeout
+        # Schema drift accumulated across every validated response, per schema
+        self.schema_reports = {name: SchemaReport(name) for name in SCHEMAS}
+        self._schema_lock = threading.Lock()
+        # JSON decoder for every response body (tests.decoders)
+        self.decoder = decoder or JsonDecoder()
+        # Cached access/refresh pair, refreshed before expiry and shared with load workers
+        self.tokens = tokens or TokenManager(self.http, self.base_url, timeout=timeout, decoder=self.decoder)
+        # Optional CheckProfiler splitting each check into connect/wait/decode/validate
+        self.profiler = profiler
+        if profiler is not None:
+            self.http.observers.append(profiler.observe)
+        # {resource: [CrawlResult, ...]} from the last run_crawl, kept for baselines
+        self.crawl_sweeps = {}
+        self._local = threading.local()
+
+    # Suites in report order: (suite name, check methods)
+    SUITES = [
+        ("Authentication", ["check_valid_login", "check_token_refresh", "check_invalid_login"]),
+        ("Users API", ["check_list_users", "check_search_users", "check_single_user"]),
+        ("Products API", [
+            "check_list_products",
+            "check_search_products",
+            "check_category_filter",
+            "check_single_product",
+            "check_categories_list",
+        ]),
+        ("Internal API Routes", ["check_api_root", "check_status_post", "check_status_get"]),
+    ]
+
+    # Checks that must complete before the rest start (login sets self.auth_token)
+    PREREQUISITES = ["check_valid_login"]
+
+    # Checks that must wait for earlier checks in concurrent mode
+    DEPENDS_ON = {
+        "check_status_get": ["check_status_post"],
+    }
+
     def log_result(self, test_name, success, message, response_data=None):
         """Log test result"""
         result = {
@@ -24,34 +126,116 @@ class DummyJSONAPITester:
             'timestamp': datetime.now().isoformat(),
             'response_data': response_data
         }
-        self.test_results.append(result)
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name} - {message}")
-        
+        timing = self.http.pop_last_timing()
+        if timing is not None:
+            result['timing'] = timing.to_dict()
+        buffered = getattr(self._local, 'buffer', None)
+        if buffered is not None:
+            # Concurrent mode: held back until report order is known
+            buffered.append(result)
+            return
+        self._record_result(result)
+
+    def _phase(self, name):
+        return self.profiler.phase(name) if self.profiler is not None else nullcontext()
+
+    def decode_json(self, response):
+        """Decode a response body, timed as the decode phase when profiling"""
+        with self._phase("decode"):
+            return self.decoder.decode(response.content)
+
+    def validate_records(self, schema_name, records):
+        """Validate a page of records and fold its drift into the run-wide report"""
+        with self._phase("validate"):
+            report = SCHEMAS[schema_name].validate_batch(records)
+        with self._schema_lock:
+            self.schema_reports[schema_name].merge(report)
+        return report
+
+    def _record_result(self, result):
+        if self.retain_results:
+            self.test_results.append(result)
+        self.results.append(result)
+        if self.verbose or not result['success']:
+            status = "✅ PASS" if result['success'] else "❌ FAIL"
+            print(f"{status}: {result['test']} - {result['message']}")
+
+    def run_suite(self, suite_name):
+        """Run one suite's checks sequentially"""
+        if self.verbose:
+            print(f"\n=== Testing {suite_name} ===")
+        for check in dict(self.SUITES)[suite_name]:
+            self._call_check(check)
+
+    def _call_check(self, check):
+        if self.profiler is None:
+            return getattr(self, check)()
+        return self.profiler.run(check, getattr(self, check))
+
+    def _run_buffered(self, check):
+        """Run a check and return the results it logged instead of printing them"""
+        self._local.buffer = []
+        try:
+            self._call_check(check)
+            return self._local.buffer
+        finally:
+            self._local.buffer = None
+
+    def _run_after(self, dependencies, check):
+        for dependency in dependencies:
+            dependency.result()
+        return self._run_buffered(check)
+
+    def run_concurrently(self, concurrency):
+        """Run independent checks on a thread pool, reporting in suite order"""
+        results = {check: self._run_buffered(check) for check in self.PREREQUISITES}
+        remaining = [
+            check for _, checks in self.SUITES for check in checks
+            if check not in results
+        ]
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="check") as pool:
+            # Dependencies are listed earlier in SUITES, so the FIFO pool starts them first
+            futures = {}
+            for check in remaining:
+                dependencies = [futures[d] for d in self.DEPENDS_ON.get(check, []) if d in futures]
+                futures[check] = pool.submit(self._run_after, dependencies, check)
+            for check, future in futures.items():
+                results[check] = future.result()
+
+        for suite_name, checks in self.SUITES:
+            if self.verbose:
+                print(f"\n=== Testing {suite_name} ===")
+            for check in checks:
+                for result in results[check]:
+                    self._record_result(result)
+
+
     def test_authentication(self):
         """Test DummyJSON authentication endpoint"""
-        print("\n=== Testing Authentication ===")
-        
+        self.run_suite("Authentication")
+
+    def check_valid_login(self):
+        """Test login with correct credentials"""
         try:
-            # Test login with correct credentials
             login_data = {
                 "username": "emilys",
                 "password": "emilyspass",
                 "expiresInMins": 60
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/auth/login",
                 headers={'Content-Type': 'application/json'},
                 json=login_data,
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 # DummyJSON uses 'accessToken' instead of 'token'
                 if ('accessToken' in data or 'token' in data) and 'id' in data:
                     self.auth_token = data.get('accessToken') or data.get('token')
+                    self.tokens.adopt(data)
                     self.log_result(
                         "Authentication - Valid Login",
                         True,
@@ -77,8 +261,56 @@ class DummyJSONAPITester:
                 False,
                 f"Login request failed: {str(e)}"
             )
-            
-        # Test login with invalid credentials
+
+    def check_token_refresh(self):
+        """Test refreshing the cached token pair
+
+        DummyJSON tokens carry a one-second `iat` and no `jti`, so a refresh in
+        the same second as the login may legitimately return the same token;
+        what matters is that the refresh is accepted and yields a usable pair.
+        """
+        try:
+            previous_expiry = token_expiry(self.auth_token)
+            refreshes = self.tokens.stats.refreshes
+            new_token = self.tokens.refresh()
+            pair = self.tokens.pair
+            expires_at = token_expiry(new_token)
+
+            problems = []
+            if self.tokens.stats.refreshes == refreshes:
+                problems.append("refresh was rejected (fell back to a fresh login)")
+            if expires_at is None:
+                problems.append("access token is not a JWT with an exp claim")
+            if pair is None or token_expiry(pair.refresh_token) is None:
+                problems.append("refresh token missing or malformed")
+            if previous_expiry is not None and expires_at is not None and expires_at < previous_expiry:
+                problems.append("exp went backwards")
+
+            if not problems:
+                self.auth_token = new_token
+                expiry = datetime.fromtimestamp(expires_at).isoformat(timespec='seconds')
+                self.log_result(
+                    "Authentication - Token Refresh",
+                    True,
+                    f"Token refreshed (expires {expiry})",
+                    {'logins': self.tokens.stats.logins, 'refreshes': self.tokens.stats.refreshes}
+                )
+            else:
+                self.log_result(
+                    "Authentication - Token Refresh",
+                    False,
+                    f"Refresh problems: {'; '.join(problems)}"
+                )
+                
+        except Exception as e:
+            self.log_result(
+                "Authentication - Token Refresh",
+                False,
+                f"Token refresh failed: {str(e)}"
+            )
+
+    def check_invalid_login(self):
+        """Test login with invalid credentials"""
         try:
             invalid_login_data = {
                 "username": "invalid_user",
@@ -86,11 +318,11 @@ class DummyJSONAPITester:
                 "expiresInMins": 60
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/auth/login",
                 headers={'Content-Type': 'application/json'},
                 json=invalid_login_data,
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 400:
@@ -115,26 +347,36 @@ class DummyJSONAPITester:
     
     def test_users_api(self):
         """Test DummyJSON users endpoints"""
-        print("\n=== Testing Users API ===")
-        
-        # Test users list with pagination
+        self.run_suite("Users API")
+
+    def check_list_users(self):
+        """Test users list with pagination"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/users?limit=10&skip=0",
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if 'users' in data and 'total' in data and isinstance(data['users'], list):
-                    users_count = len(data['users'])
-                    total_count = data['total']
-                    self.log_result(
-                        "Users API - List Users",
-                        True,
-                        f"Retrieved {users_count} users out of {total_count} total",
-                        {'users_returned': users_count, 'total_users': total_count}
-                    )
+                    drift = self.validate_records('user', data['users'])
+                    if drift.ok:
+                        users_count = len(data['users'])
+                        total_count = data['total']
+                        self.log_result(
+                            "Users API - List Users",
+                            True,
+                            f"Retrieved {users_count} users out of {total_count} total",
+                            {'users_returned': users_count, 'total_users': total_count}
+                        )
+                    else:
+                        self.log_result(
+                            "Users API - List Users",
+                            False,
+                            f"User schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}",
+                            {'schema_drift': drift.errors}
+                        )
                 else:
                     self.log_result(
                         "Users API - List Users",
@@ -154,24 +396,34 @@ class DummyJSONAPITester:
                 False,
                 f"Users list request failed: {str(e)}"
             )
-        
-        # Test user search
+
+    def check_search_users(self):
+        """Test user search"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/users/search?q=john",
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if 'users' in data and isinstance(data['users'], list):
-                    search_results = len(data['users'])
-                    self.log_result(
-                        "Users API - Search Users",
-                        True,
-                        f"Search for 'john' returned {search_results} results",
-                        {'search_query': 'john', 'results_count': search_results}
-                    )
+                    drift = self.validate_records('user', data['users'])
+                    if drift.ok:
+                        search_results = len(data['users'])
+                        self.log_result(
+                            "Users API - Search Users",
+                            True,
+                            f"Search for 'john' returned {search_results} results",
+                            {'search_query': 'john', 'results_count': search_results}
+                        )
+                    else:
+                        self.log_result(
+                            "Users API - Search Users",
+                            False,
+                            f"User schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}",
+                            {'schema_drift': drift.errors}
+                        )
                 else:
                     self.log_result(
                         "Users API - Search Users",
@@ -191,23 +443,33 @@ class DummyJSONAPITester:
                 False,
                 f"User search request failed: {str(e)}"
             )
-        
-        # Test single user fetch
+
+    def check_single_user(self):
+        """Test single user fetch"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/users/1",
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if 'id' in data and 'firstName' in data and 'email' in data:
-                    self.log_result(
-                        "Users API - Single User",
-                        True,
-                        f"Retrieved user: {data.get('firstName')} {data.get('lastName')} ({data.get('email')})",
-                        {'user_id': data.get('id'), 'name': f"{data.get('firstName')} {data.get('lastName')}"}
-                    )
+                    drift = self.validate_records('user', [data])
+                    if drift.ok:
+                        self.log_result(
+                            "Users API - Single User",
+                            True,
+                            f"Retrieved user: {data.get('firstName')} {data.get('lastName')} ({data.get('email')})",
+                            {'user_id': data.get('id'), 'name': f"{data.get('firstName')} {data.get('lastName')}"}
+                        )
+                    else:
+                        self.log_result(
+                            "Users API - Single User",
+                            False,
+                            f"User schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}",
+                            {'schema_drift': drift.errors}
+                        )
                 else:
                     self.log_result(
                         "Users API - Single User",
@@ -230,26 +492,36 @@ class DummyJSONAPITester:
     
     def test_products_api(self):
         """Test DummyJSON products endpoints"""
-        print("\n=== Testing Products API ===")
-        
-        # Test products list with pagination
+        self.run_suite("Products API")
+
+    def check_list_products(self):
+        """Test products list with pagination"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/products?limit=12&skip=0",
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if 'products' in data and 'total' in data and isinstance(data['products'], list):
-                    products_count = len(data['products'])
-                    total_count = data['total']
-                    self.log_result(
-                        "Products API - List Products",
-                        True,
-                        f"Retrieved {products_count} products out of {total_count} total",
-                        {'products_returned': products_count, 'total_products': total_count}
-                    )
+                    drift = self.validate_records('product', data['products'])
+                    if drift.ok:
+                        products_count = len(data['products'])
+                        total_count = data['total']
+                        self.log_result(
+                            "Products API - List Products",
+                            True,
+                            f"Retrieved {products_count} products out of {total_count} total",
+                            {'products_returned': products_count, 'total_products': total_count}
+                        )
+                    else:
+                        self.log_result(
+                            "Products API - List Products",
+                            False,
+                            f"Product schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}",
+                            {'schema_drift': drift.errors}
+                        )
                 else:
                     self.log_result(
                         "Products API - List Products",
@@ -269,24 +541,34 @@ class DummyJSONAPITester:
                 False,
                 f"Products list request failed: {str(e)}"
             )
-        
-        # Test product search
+
+    def check_search_products(self):
+        """Test product search"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/products/search?q=phone",
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if 'products' in data and isinstance(data['products'], list):
-                    search_results = len(data['products'])
-                    self.log_result(
-                        "Products API - Search Products",
-                        True,
-                        f"Search for 'phone' returned {search_results} results",
-                        {'search_query': 'phone', 'results_count': search_results}
-                    )
+                    drift = self.validate_records('product', data['products'])
+                    if drift.ok:
+                        search_results = len(data['products'])
+                        self.log_result(
+                            "Products API - Search Products",
+                            True,
+                            f"Search for 'phone' returned {search_results} results",
+                            {'search_query': 'phone', 'results_count': search_results}
+                        )
+                    else:
+                        self.log_result(
+                            "Products API - Search Products",
+                            False,
+                            f"Product schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}",
+                            {'schema_drift': drift.errors}
+                        )
                 else:
                     self.log_result(
                         "Products API - Search Products",
@@ -306,24 +588,34 @@ class DummyJSONAPITester:
                 False,
                 f"Product search request failed: {str(e)}"
             )
-        
-        # Test category filter
+
+    def check_category_filter(self):
+        """Test category filter"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/products/category/smartphones",
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if 'products' in data and isinstance(data['products'], list):
-                    category_results = len(data['products'])
-                    self.log_result(
-                        "Products API - Category Filter",
-                        True,
-                        f"Category 'smartphones' returned {category_results} products",
-                        {'category': 'smartphones', 'results_count': category_results}
-                    )
+                    drift = self.validate_records('product', data['products'])
+                    if drift.ok:
+                        category_results = len(data['products'])
+                        self.log_result(
+                            "Products API - Category Filter",
+                            True,
+                            f"Category 'smartphones' returned {category_results} products",
+                            {'category': 'smartphones', 'results_count': category_results}
+                        )
+                    else:
+                        self.log_result(
+                            "Products API - Category Filter",
+                            False,
+                            f"Product schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}",
+                            {'schema_drift': drift.errors}
+                        )
                 else:
                     self.log_result(
                         "Products API - Category Filter",
@@ -343,23 +635,33 @@ class DummyJSONAPITester:
                 False,
                 f"Category filter request failed: {str(e)}"
             )
-        
-        # Test single product fetch
+
+    def check_single_product(self):
+        """Test single product fetch"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/products/1",
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if 'id' in data and 'title' in data and 'price' in data:
-                    self.log_result(
-                        "Products API - Single Product",
-                        True,
-                        f"Retrieved product: {data.get('title')} (${data.get('price')})",
-                        {'product_id': data.get('id'), 'title': data.get('title'), 'price': data.get('price')}
-                    )
+                    drift = self.validate_records('product', [data])
+                    if drift.ok:
+                        self.log_result(
+                            "Products API - Single Product",
+                            True,
+                            f"Retrieved product: {data.get('title')} (${data.get('price')})",
+                            {'product_id': data.get('id'), 'title': data.get('title'), 'price': data.get('price')}
+                        )
+                    else:
+                        self.log_result(
+                            "Products API - Single Product",
+                            False,
+                            f"Product schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}",
+                            {'schema_drift': drift.errors}
+                        )
                 else:
                     self.log_result(
                         "Products API - Single Product",
@@ -379,32 +681,42 @@ class DummyJSONAPITester:
                 False,
                 f"Single product request failed: {str(e)}"
             )
-        
-        # Test categories list
+
+    def check_categories_list(self):
+        """Test categories list"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/products/categories",
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if isinstance(data, list) and len(data) > 0:
-                    categories_count = len(data)
-                    # Handle both string array and object array formats
-                    if isinstance(data[0], dict):
-                        # New format: array of objects with slug, name, url
-                        sample_categories = [cat.get('name', cat.get('slug', str(cat))) for cat in data[:5]]
-                    else:
-                        # Old format: array of strings
-                        sample_categories = data[:5]
+                    drift = self.validate_records('category', [cat for cat in data if isinstance(cat, dict)])
+                    if drift.ok:
+                        categories_count = len(data)
+                        # Handle both string array and object array formats
+                        if isinstance(data[0], dict):
+                            # New format: array of objects with slug, name, url
+                            sample_categories = [cat.get('name', cat.get('slug', str(cat))) for cat in data[:5]]
+                        else:
+                            # Old format: array of strings
+                            sample_categories = data[:5]
                     
-                    self.log_result(
-                        "Products API - Categories List",
-                        True,
-                        f"Retrieved {categories_count} categories. Sample: {', '.join(sample_categories)}",
-                        {'categories_count': categories_count, 'sample_categories': sample_categories}
-                    )
+                        self.log_result(
+                            "Products API - Categories List",
+                            True,
+                            f"Retrieved {categories_count} categories. Sample: {', '.join(sample_categories)}",
+                            {'categories_count': categories_count, 'sample_categories': sample_categories}
+                        )
+                    else:
+                        self.log_result(
+                            "Products API - Categories List",
+                            False,
+                            f"Category schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}",
+                            {'schema_drift': drift.errors}
+                        )
                 else:
                     self.log_result(
                         "Products API - Categories List",
@@ -427,20 +739,19 @@ class DummyJSONAPITester:
     
     def test_internal_api_routes(self):
         """Test internal Next.js API routes (basic functionality)"""
-        print("\n=== Testing Internal API Routes ===")
-        
-        # Get base URL from environment
-        base_url = "https://abroad-navigator.preview.emergentagent.com"
-        
-        # Test root endpoint
+        self.run_suite("Internal API Routes")
+
+    def check_api_root(self):
+        """Test root endpoint"""
+        base_url = self.internal_base_url
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{base_url}/api/root",
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if 'message' in data:
                     self.log_result(
                         "Internal API - Root Endpoint",
@@ -467,29 +778,40 @@ class DummyJSONAPITester:
                 False,
                 f"Root endpoint request failed: {str(e)}"
             )
-        
-        # Test status endpoint POST
+
+    def check_status_post(self):
+        """Test status endpoint POST"""
+        base_url = self.internal_base_url
         try:
             status_data = {
                 "client_name": "test_client_admin_dashboard"
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{base_url}/api/status",
                 headers={'Content-Type': 'application/json'},
                 json=status_data,
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if 'id' in data and 'client_name' in data:
-                    self.log_result(
-                        "Internal API - Status POST",
-                        True,
-                        f"Status POST successful, ID: {data['id']}",
-                        {'status_id': data['id'], 'client_name': data['client_name']}
-                    )
+                    drift = self.validate_records('status', [data])
+                    if drift.ok:
+                        self.log_result(
+                            "Internal API - Status POST",
+                            True,
+                            f"Status POST successful, ID: {data['id']}",
+                            {'status_id': data['id'], 'client_name': data['client_name']}
+                        )
+                    else:
+                        self.log_result(
+                            "Internal API - Status POST",
+                            False,
+                            f"Status schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}",
+                            {'schema_drift': drift.errors}
+                        )
                 else:
                     self.log_result(
                         "Internal API - Status POST",
@@ -509,24 +831,35 @@ class DummyJSONAPITester:
                 False,
                 f"Status POST request failed: {str(e)}"
             )
-        
-        # Test status endpoint GET
+
+    def check_status_get(self):
+        """Test status endpoint GET"""
+        base_url = self.internal_base_url
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{base_url}/api/status",
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.decode_json(response)
                 if isinstance(data, list):
-                    status_count = len(data)
-                    self.log_result(
-                        "Internal API - Status GET",
-                        True,
-                        f"Status GET successful, retrieved {status_count} status records",
-                        {'status_records_count': status_count}
-                    )
+                    drift = self.validate_records('status', data)
+                    if drift.ok:
+                        status_count = len(data)
+                        self.log_result(
+                            "Internal API - Status GET",
+                            True,
+                            f"Status GET successful, retrieved {status_count} status records",
+                            {'status_records_count': status_count}
+                        )
+                    else:
+                        self.log_result(
+                            "Internal API - Status GET",
+                            False,
+                            f"Status schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}",
+                            {'schema_drift': drift.errors}
+                        )
                 else:
                     self.log_result(
                         "Internal API - Status GET",
@@ -547,41 +880,624 @@ class DummyJSONAPITester:
                 f"Status GET request failed: {str(e)}"
             )
     
-    def run_all_tests(self):
-        """Run all API tests"""
+    def export_timings(self, json_path=None, csv_path=None):
+        """Write latency histograms/percentiles to the given JSON and CSV paths"""
+        if json_path:
+            with open(json_path, 'w') as fh:
+                fh.write(self.latency.to_json())
+        if csv_path:
+            with open(csv_path, 'w', newline='') as fh:
+                fh.write(self.latency.to_csv())
+
+    def print_connection_stats(self, stats=None):
+        """Print new vs reused connections per host"""
+        stats = self.http.connection_stats() if stats is None else stats
+        if not stats:
+            return
+        print("\n🔌 CONNECTIONS:")
+        for origin, counts in stats.items():
+            reuse_rate = (counts['reused_connections'] / counts['requests'] * 100) if counts['requests'] else 0.0
+            print(f"  • {origin}: {counts['requests']} requests, {counts['new_connections']} new, "
+                  f"{counts['reused_connections']} reused ({reuse_rate:.0f}% reuse)")
+
+    def run_checks(self, concurrency=1):
+        """Run every suite once, up to `concurrency` checks at a time"""
+        if concurrency > 1:
+            self.run_concurrently(concurrency)
+        else:
+            # Run all test suites
+            self.test_authentication()
+            self.test_users_api()
+            self.test_products_api()
+            self.test_internal_api_routes()
+
+    def run_all_tests(self, concurrency=1, rounds=1):
+        """Run all API tests `rounds` times, up to `concurrency` checks at a time"""
         print("🚀 Starting Admin Dashboard API Integration Tests")
         print("=" * 60)
         
-        # Run all test suites
-        self.test_authentication()
-        self.test_users_api()
-        self.test_products_api()
-        self.test_internal_api_routes()
+        for round_number in range(rounds):
+            if rounds > 1:
+                print(f"\n🔁 Round {round_number + 1}/{rounds}")
+            self.run_checks(concurrency)
         
-        # Generate summary
+        return self.print_summary()
+
+    def print_summary(self):
+        """Print the test summary from the running counters; True if nothing failed"""
+        self.results.flush()
         print("\n" + "=" * 60)
         print("📊 TEST SUMMARY")
         print("=" * 60)
         
-        total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result['success'])
-        failed_tests = total_tests - passed_tests
+        total_tests = self.results.total
+        passed_tests = self.results.passed
+        failed_tests = self.results.failed
         
         print(f"Total Tests: {total_tests}")
         print(f"✅ Passed: {passed_tests}")
         print(f"❌ Failed: {failed_tests}")
-        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        if total_tests:
+            print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
         
         if failed_tests > 0:
             print("\n🔍 FAILED TESTS:")
-            for result in self.test_results:
-                if not result['success']:
-                    print(f"  • {result['test']}: {result['message']}")
+            if failed_tests > len(self.results.failures):
+                print(f"  (most recent {len(self.results.failures)} of {failed_tests})")
+            for test_name, message in self.results.failures:
+                print(f"  • {test_name}: {message}")
+
+        self.print_schema_drift()
+        self.latency.print_summary()
+        self.print_connection_stats()
+        self.print_limiter_stats()
+        self.print_auth_stats()
+        if self.profiler is not None:
+            self.profiler.print_summary()
         
         print("\n" + "=" * 60)
         return failed_tests == 0
 
+    def print_limiter_stats(self):
+        """Print where each host's adaptive concurrency limit settled"""
+        if self.http.limiter is not None:
+            self.http.limiter.print_summary()
+
+    def print_auth_stats(self, stats=None, total_requests=None):
+        """Print logins and refreshes as a share of all requests sent"""
+        stats = self.tokens.stats if stats is None else stats
+        if total_requests is None:
+            total_requests = sum(
+                endpoint.phases['total'].count + endpoint.errors for endpoint in self.latency.endpoints.values()
+            )
+        if stats.auth_requests or stats.cached or stats.shared:
+            print_auth_stats(stats, total_requests)
+
+    def print_schema_drift(self):
+        """Print per-field drift, including unexpected fields that do not fail checks"""
+        drifting = [report for report in self.schema_reports.values() if report.drift]
+        if not drifting:
+            return
+        print("\n🧬 SCHEMA DRIFT:")
+        for report in drifting:
+            print(f"  • {report.schema}: {report.invalid}/{report.records} records")
+            for path, issues in sorted(report.drift.items()):
+                counts = ", ".join(f"{issue} ×{n}" for issue, n in sorted(issues.items()))
+                print(f"      {path}: {counts}")
+
+    def run_load(self, scenario, processes=1, auth=False):
+        """Drive an open-loop read/write workload at the internal /api/status routes
+
+        With `auth` every request carries a bearer token from the token manager.
+        """
+        print("🚀 Starting /api/status Load Run")
+        print("=" * 60)
+        auth_stats = None
+        if processes > 1:
+            print(f"Sharding across {processes} worker processes")
+            http_options = {
+                'retries': self.http.retries,
+                'backoff_factor': self.http.backoff_factor,
+                'keep_alive': self.http.keep_alive,
+            }
+            if self.http.limiter is not None:
+                # Each shard adapts on its own; only this process's limits are reported
+                http_options['limiter_options'] = self.http.limiter.options
+            auth_options = {
+                'base_url': self.tokens.base_url,
+                'username': self.tokens.username,
+                'password': self.tokens.password,
+                'expires_in_mins': self.tokens.expires_in_mins,
+                'refresh_margin': self.tokens.refresh_margin,
+                'cache_path': self.tokens.cache_path,
+                'timeout': self.timeout,
+            } if auth else None
+            report, recorder, connections, auth_stats = run_sharded(
+                self.internal_base_url, scenario, processes, http_options, auth_options=auth_options
+            )
+            self.latency.merge(recorder)
+        else:
+            tokens = self.tokens if auth else None
+            report = OpenLoopLoadGenerator(self.http, self.internal_base_url, scenario, tokens=tokens).run()
+            connections = None
+            auth_stats = tokens.stats if tokens else None
+        report.print_summary()
+        self.latency.print_summary()
+        self.print_connection_stats(connections)
+        self.print_limiter_stats()
+        if auth_stats is not None:
+            self.print_auth_stats(auth_stats, report.completed + auth_stats.auth_requests)
+        print("\n" + "=" * 60)
+        return report
+
+    def run_crawl(self, resources=tuple(CATALOG_RESOURCES), page_sizes=DEFAULT_PAGE_SIZES,
+                  concurrency=8, repeats=1, cursor=False, project=False):
+        """Walk every page of each resource across page sizes and report the fastest"""
+        print("🚀 Starting Full-catalogue Crawl" + (" (cursor paging)" if cursor else ""))
+        print("=" * 60)
+        self.crawl_sweeps = {}
+        crawler = PaginationCrawler(self.http, self.base_url, concurrency=concurrency, timeout=self.timeout,
+                                    cursor=cursor, decoder=self.decoder, project=project)
+        best = {}
+        for resource in resources:
+            try:
+                results = crawler.sweep(resource, page_sizes, repeats=repeats)
+            except (CrawlError, requests.RequestException) as e:
+                print(f"❌ FAIL: Crawl {resource} - {e}")
+                best[resource] = None
+                continue
+            self.crawl_sweeps[resource] = results
+            best[resource] = print_sweep(resource, results)
+        self.latency.print_summary()
+        self.print_connection_stats()
+        print("\n" + "=" * 60)
+        return best
+
+    def run_soak(self, duration, interval, concurrency=1, thresholds=None, server_pid=None):
+        """Loop the checks for `duration` seconds, flagging leaks and latency drift"""
+        print(f"🚀 Starting Soak Run ({duration:.0f}s, one round every {interval:.0f}s)")
+        print("=" * 60)
+        self.verbose = False
+        self.retain_results = False
+        runner = SoakRunner(self, duration, interval, concurrency=concurrency, thresholds=thresholds,
+                            server_pid=server_pid)
+        report = runner.run()
+        print_soak_report(report)
+        passed = self.print_summary()
+        return passed and not report.flags
+
+    def fresh_http(self):
+        """A new, cold SessionPool with this tester's settings and latency recorder"""
+        return SessionPool(
+            pool_size=self.http.pool_size,
+            retries=self.http.retries,
+            backoff_factor=self.http.backoff_factor,
+            keep_alive=self.http.keep_alive,
+            recorder=self.latency,
+            transport=self.http.transport,
+            limiter=self.http.limiter,
+        )
+
+    def run_search_bench(self, queries, resources=tuple(SEARCH_RESOURCES),
+                         debounce_windows=DEFAULT_DEBOUNCE_MS, seed=None):
+        """Replay keystroke prefixes of `queries` cold then warm against the search endpoints"""
+        print("🚀 Starting Search-as-you-type Benchmark")
+        print("=" * 60)
+        bench = SearchBenchmark(self.fresh_http, self.base_url, queries, debounce_windows, timeout=self.timeout,
+                                seed=seed, decoder=self.decoder)
+        results = [bench.run(resource) for resource in resources]
+        for result in results:
+            print_search_result(result)
+        print("\n" + "=" * 60)
+        return results
+
+    def run_snapshot(self, path, previous=None, verify=False):
+        """Snapshot the full catalogue into columns and compute (or fold in) the dashboard aggregates
+
+        With `verify`, the folded-in aggregates are checked against a full
+        recompute, which costs as much as not folding them in at all.
+        """
+        print("🚀 Starting Catalogue Snapshot")
+        print("=" * 60)
+        try:
+            snapshot = Snapshot.fetch(self.http, self.base_url, timeout=self.timeout, decoder=self.decoder)
+        except (CrawlError, requests.RequestException) as e:
+            print(f"❌ FAIL: Snapshot - {e}")
+            return None
+        print(f"Fetched {len(snapshot.products['id'])} products and {len(snapshot.users['id'])} users")
+        diff = None
+        mismatches = []
+        if previous:
+            old, aggregates = Snapshot.load(previous)
+            aggregates = aggregates or Aggregates.compute(old)
+            diff = aggregates.update(old, snapshot)
+            if verify:
+                mismatches = aggregates.mismatches(Aggregates.compute(snapshot))
+        else:
+            aggregates = Aggregates.compute(snapshot)
+        snapshot.save(path, aggregates)
+        print_aggregates(aggregates, diff)
+        print(f"\n💾 Snapshot written to {path}")
+        if mismatches:
+            print(f"❌ FAIL: Incremental aggregates differ from a full recompute: {', '.join(mismatches)}")
+        elif previous and verify:
+            print("✅ Incremental aggregates match a full recompute")
+        print("\n" + "=" * 60)
+        return None if mismatches else aggregates
+
+    def run_fault_scenarios(self, names, rounds=3, concurrency=8, budgets=DEFAULT_BUDGETS, seed=None,
+                            max_error_rate=None, max_p99=None):
+        """Run the checks through a fault proxy under each named scenario and report tail latency
+
+        Every scenario gets fresh proxies and a cold session pool, so one
+        scenario's broken connections never leak into the next. Returns
+        True when every scenario stays within its budget (SCENARIO_BUDGETS,
+        with `max_error_rate` and `max_p99` overriding every scenario's).
+        """
+        limits = {name: scenario_budget(name, max_error_rate, max_p99) for name in names}
+        print(f"🚀 Starting Fault Scenarios ({rounds} rounds each, timeout {self.timeout:g}s)")
+        print("=" * 60)
+        results = []
+        for name in names:
+            print(f"\n🌩️  {name}: {', '.join(SCENARIOS[name]) or 'no faults'}")
+            result = ScenarioResult(name)
+            proxies = start_proxies((self.base_url, self.internal_base_url), parse_fault_specs(SCENARIOS[name]), seed)
+            base_url = proxies[self.base_url].base_url
+            internal_base_url = proxies[self.internal_base_url].base_url
+            http = SessionPool(pool_size=self.http.pool_size, retries=self.http.retries,
+                               backoff_factor=self.http.backoff_factor, keep_alive=self.http.keep_alive)
+            http.observers.append(ScenarioObserver(result, self.timeout))
+            sink = ResultSink()
+            tester = DummyJSONAPITester(base_url=base_url, internal_base_url=internal_base_url, http=http,
+                                        results=sink, retain_results=False, timeout=self.timeout)
+            tester.verbose = False
+            try:
+                for _ in range(rounds):
+                    tester.run_checks(concurrency)
+            finally:
+                http.close()
+                for proxy in proxies.values():
+                    proxy.stop()
+            result.checks_run, result.checks_failed = sink.total, sink.failed
+            for proxy in proxies.values():
+                for key, count in proxy.stats.items():
+                    result.injected[key] = result.injected.get(key, 0) + count
+            results.append(result)
+        print_scenarios(results, budgets, self.timeout, limits)
+        print("\n" + "=" * 60)
+        return not any(result.violations(limits[result.name]) for result in results)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Admin Dashboard API integration tests")
+    parser.add_argument("--base-url", default=DUMMYJSON_URL, help="DummyJSON base URL")
+    parser.add_argument("--internal-base-url", default=INTERNAL_API_URL, help="Base URL serving the Next.js /api routes")
+    parser.add_argument("--local", action="store_true",
+                        help="Start the bundled DummyJSON stand-in and point both base URLs at it")
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="With --local, serve N generated users and N products "
+                             "(cursor paging and indexed search; see tests/synthetic.py)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Run up to N independent checks at once (1 = sequential)")
+    parser.add_argument("--pool-size", type=int, default=10, help="Max pooled connections per host")
+    parser.add_argument("--retries", type=int, default=0, help="Retries on connection errors and 429/5xx")
+    parser.add_argument("--backoff", type=float, default=0.0, help="Exponential backoff factor between retries")
+    parser.add_argument("--no-keep-alive", action="store_true", help="Close the connection after every request")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="Per-request timeout in seconds (applied to each socket read by requests)")
+    parser.add_argument("--decoder", choices=list(DECODERS), default="json",
+                        help="JSON decoder for response bodies (orjson/msgspec when installed, stream = iterative)")
+    parser.add_argument("--timings-json", metavar="PATH", help="Write per-endpoint latency histograms as JSON")
+    parser.add_argument("--timings-csv", metavar="PATH", help="Write per-endpoint latency percentiles as CSV")
+    load = parser.add_argument_group("load mode")
+    load.add_argument("--load", action="store_true", help="Run an open-loop load test against /api/status")
+    load.add_argument("--rps", type=float, default=50.0, help="Target request rate")
+    load.add_argument("--duration", type=float, default=10.0, help="Run length in seconds")
+    load.add_argument("--write-ratio", type=float, default=0.5, help="Fraction of requests that are POSTs")
+    load.add_argument("--arrival", choices=["constant", "poisson"], default="constant", help="Arrival process")
+    load.add_argument("--load-workers", type=int, default=256, help="Max requests in flight")
+    load.add_argument("--processes", type=int, default=1, help="Shard the load across N worker processes")
+    load.add_argument("--max-error-rate", type=float, default=0.01, help="Error rate above which the run fails")
+    parser.add_argument("--rounds", type=int, default=1, help="Run the check suites N times")
+    parser.add_argument("--results-jsonl", metavar="PATH",
+                        help="Stream results to a JSONL file instead of keeping them in memory "
+                             "(summarise later with python -m tests.results PATH)")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", metavar="PATH", help="Record every request/response into a cassette")
+    cassette.add_argument("--replay", metavar="PATH", help="Serve every response from a recorded cassette")
+    parser.add_argument("--trace-out", metavar="PATH",
+                        help="Append every request to a JSONL access trace (input for tests.cache_sim)")
+    soak = parser.add_argument_group("soak mode")
+    soak.add_argument("--soak", action="store_true", help="Loop the checks and watch for leaks and drift")
+    soak.add_argument("--soak-duration", type=float, default=3600.0, help="Soak length in seconds")
+    soak.add_argument("--soak-interval", type=float, default=30.0, help="Seconds between round starts")
+    soak.add_argument("--max-rss-growth", type=float, default=50.0, help="Flag RSS growth above N MB/hour")
+    soak.add_argument("--max-fd-growth", type=int, default=20, help="Flag open FD growth above N")
+    soak.add_argument("--max-latency-drift", type=float, default=25.0,
+                      help="Flag endpoints whose fitted latency rises more than N%% over the run")
+    crawl = parser.add_argument_group("crawl mode")
+    crawl.add_argument("--crawl", action="store_true", help="Walk every page of /users and /products")
+    crawl.add_argument("--page-sizes", default=",".join(map(str, DEFAULT_PAGE_SIZES)),
+                       help="Comma-separated limits to sweep (0 = full dump)")
+    crawl.add_argument("--crawl-concurrency", type=int, default=8, help="Pages fetched at once")
+    crawl.add_argument("--crawl-repeats", type=int, default=1, help="Crawls per page size (best is kept)")
+    crawl.add_argument("--project", action="store_true",
+                       help="Materialise only the fields the schemas validate (unexpected fields go unreported)")
+    crawl.add_argument("--crawl-cursor", action="store_true",
+                       help="Follow nextCursor instead of skip offsets (needs --synthetic)")
+    search = parser.add_argument_group("search benchmark")
+    search.add_argument("--search-bench", action="store_true", help="Benchmark search-as-you-type prefixes")
+    search.add_argument("--query-corpus", metavar="PATH", help="File with one search query per line")
+    search.add_argument("--debounce-windows", default=",".join(map(str, DEFAULT_DEBOUNCE_MS)),
+                        help="Comma-separated debounce windows in ms to model")
+    adaptive = parser.add_argument_group("adaptive concurrency")
+    adaptive.add_argument("--adaptive", action="store_true",
+                          help="Limit in-flight requests per host with an AIMD/latency-gradient limiter")
+    adaptive.add_argument("--adaptive-initial", type=int, default=4, help="Starting in-flight limit per host")
+    adaptive.add_argument("--adaptive-max", type=int, default=200, help="Upper bound for the in-flight limit")
+    adaptive.add_argument("--latency-tolerance", type=float, default=2.0,
+                          help="Back off when smoothed latency exceeds N x the baseline")
+    adaptive.add_argument("--limit-timeline", metavar="PATH",
+                          help="Write the limit and per-second throughput per host (.json or CSV)")
+    auth = parser.add_argument_group("auth tokens")
+    auth.add_argument("--auth-cache", metavar="PATH",
+                      help="Share the access/refresh token pair across processes through this file")
+    auth.add_argument("--token-expiry", type=int, default=60, help="Requested access token lifetime in minutes")
+    auth.add_argument("--refresh-margin", type=float, default=60.0,
+                      help="Refresh this many seconds before the access token expires")
+    load.add_argument("--load-auth", action="store_true", help="Send a managed bearer token with every load request")
+    snapshot = parser.add_argument_group("snapshot mode")
+    snapshot.add_argument("--snapshot", metavar="PATH",
+                          help="Write a columnar .npz snapshot of every product and user plus dashboard aggregates")
+    snapshot.add_argument("--previous-snapshot", metavar="PATH",
+                          help="Update the aggregates stored in an earlier snapshot instead of recomputing")
+    snapshot.add_argument("--verify-incremental", action="store_true",
+                          help="Also recompute the aggregates in full and fail when the updated ones differ")
+    faults = parser.add_argument_group("fault injection")
+    faults.add_argument("--fault", action="append", metavar="ROUTE:key=value,...",
+                        help="Route every request through a fault proxy, e.g. '*:delay=lognormal:150:0.6,jitter=50' "
+                             "or 'products_search:reset=0.1'; keys: delay, jitter, bandwidth, reset, reset_after, "
+                             "stall, stall_ms, slowloris, trickle_bytes, trickle_ms")
+    faults.add_argument("--fault-scenarios", metavar="NAMES",
+                        help=f"Comma-separated scenarios to measure, or 'all' ({', '.join(SCENARIOS)})")
+    faults.add_argument("--fault-rounds", type=int, default=3, help="Check rounds per scenario")
+    faults.add_argument("--budgets", default=",".join(f"{b:g}" for b in DEFAULT_BUDGETS),
+                        help="Comma-separated end-to-end budgets in seconds to report against")
+    faults.add_argument("--scenario-max-error-rate", type=float,
+                        help="Override every scenario's share of requests allowed to fail beyond "
+                             "those hit by an injected reset or stall")
+    faults.add_argument("--scenario-max-p99", type=float, metavar="SECONDS",
+                        help="Override every scenario's p99 end-to-end latency budget")
+    caching = parser.add_argument_group("caching proxy")
+    caching.add_argument("--cache-proxy", action="store_true",
+                         help="Send DummyJSON requests through a shared request-coalescing caching proxy")
+    caching.add_argument("--cache-capacity", type=float, default=DEFAULT_CAPACITY / 2 ** 20,
+                         help="Proxy memory tier size in MiB")
+    caching.add_argument("--cache-ttl", type=float,
+                         help="Freshness in seconds when the origin sends no max-age (default: the stores' TTLs)")
+    caching.add_argument("--cache-stale", type=float, default=DEFAULT_STALE,
+                         help="Seconds past expiry an entry is still served while it revalidates")
+    profiling = parser.add_argument_group("profiling")
+    profiling.add_argument("--profile", choices=PROFILE_MODES,
+                           help="Time every check by phase and profile it with a sampler or cProfile")
+    profiling.add_argument("--profile-interval", type=float, default=2.0, help="Sampling interval in milliseconds")
+    profiling.add_argument("--profile-stacks", metavar="PATH",
+                           help="Write collapsed stacks for flamegraph.pl or speedscope")
+    baseline = parser.add_argument_group("benchmark baselines")
+    baseline.add_argument("--save-baseline", action="store_true",
+                          help="Store this run's latency histograms under the current git commit")
+    baseline.add_argument("--compare-baseline", metavar="REF",
+                          help="Compare this run with the runs stored for a git ref; regressions fail the run")
+    baseline.add_argument("--baseline-dir", default=DEFAULT_STORE, help="Baseline store directory")
+    baseline.add_argument("--regression-threshold", type=float, default=0.10,
+                          help="Relative p50 slowdown (whole 95%% CI above it) that counts as a regression")
+    baseline.add_argument("--regression-alpha", type=float, default=0.01, help="Mann-Whitney significance level")
+    baseline.add_argument("--baseline-html", metavar="PATH", help="Write the comparison as HTML")
+    baseline.add_argument("--baseline-min-samples", type=int, default=20,
+                          help="Samples per side below which a metric is not compared")
+    baseline.add_argument("--baseline-include-dirty", action="store_true",
+                          help="Pool stored runs taken from a dirty checkout")
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
+
+def scenario_from_args(args):
+    return LoadScenario(
+        rps=args.rps,
+        duration=args.duration,
+        write_ratio=args.write_ratio,
+        arrival=args.arrival,
+        max_workers=args.load_workers,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+
+def run_mode(args):
+    """Name of the mode selected by the flags, as stored in baselines"""
+    for mode in ("fault_scenarios", "soak", "snapshot", "search_bench", "crawl", "load"):
+        if getattr(args, mode):
+            return mode.replace("_", "-")
+    return "checks"
+
+# Flags that shape the measured traffic; runs differing in any of them are not pooled or compared
+CLIENT_FLAGS = ("timeout", "pool_size", "retries", "backoff", "no_keep_alive", "decoder", "adaptive", "profile")
+WORKLOAD_FLAGS = {
+    "checks": ("concurrency", "rounds"),
+    "load": ("rps", "duration", "write_ratio", "arrival", "load_workers", "processes", "load_auth"),
+    "crawl": ("page_sizes", "crawl_concurrency", "crawl_repeats", "crawl_cursor", "project"),
+}
+
+def run_workload(args, mode):
+    """The workload settings stored with a baseline run of `mode`"""
+    return {name: getattr(args, name) for name in CLIENT_FLAGS + WORKLOAD_FLAGS.get(mode, ("concurrency",))}
+
+def run_target(args):
+    """What this run measured, so baselines only pool and compare like with like"""
+    if args.replay:
+        return f"replay {args.replay}"
+    if args.local:
+        parts = ["local"]
+        if args.synthetic:
+            parts.append(f"synthetic={args.synthetic}")
+        for name in ("latency", "jitter", "error_rate", "capacity"):
+            if getattr(args, name):
+                parts.append(f"{name}={getattr(args, name):g}")
+        parts += [f"route={spec}" for spec in args.route or ()]
+    else:
+        parts = list(dict.fromkeys((args.base_url, args.internal_base_url)))
+    parts += [f"fault={spec}" for spec in args.fault or ()]
+    if args.cache_proxy:
+        parts.append("cache-proxy")
+    return " ".join(parts)
+
+def record_baseline(args, tester, mode, report=None):
+    """Save and/or compare this run's benchmark metrics; False if the comparison found a regression"""
+    metrics = metrics_from_latency(tester.latency)
+    summary = {}
+    if report is not None:
+        metrics.update(metrics_from_load(report))
+        summary = {"achieved_rps": round(report.achieved_rps, 2), "error_rate": round(report.error_rate, 4)}
+    if tester.crawl_sweeps:
+        metrics.update(metrics_from_crawl(tester.crawl_sweeps))
+        summary = {f"{result.resource} limit={result.page_size} records/s": round(result.records_per_sec)
+                   for results in tester.crawl_sweeps.values() for result in results}
+    run = BenchmarkRun.capture(mode, metrics, summary, target=run_target(args), workload=run_workload(args, mode))
+    store = BaselineStore(args.baseline_dir)
+    ok = True
+    if args.compare_baseline:
+        try:
+            ok = compare(store, args.compare_baseline, run, mode, threshold=args.regression_threshold,
+                         alpha=args.regression_alpha, min_samples=args.baseline_min_samples,
+                         html_path=args.baseline_html, include_dirty=args.baseline_include_dirty)
+        except KeyError as e:
+            print(f"❌ {e.args[0]}")
+            ok = False
+    if args.save_baseline:
+        print(f"💾 Baseline saved to {store.save(run)}")
+    return ok
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = None
+    base_url, internal_base_url = args.base_url, args.internal_base_url
+    if args.local and args.soak:
+        # out of process, so the stand-in's growing state is not counted as client memory
+        server = StandInProcess(args, synthetic=args.synthetic)
+        base_url = internal_base_url = server.start()
+        print(f"🧪 Using local DummyJSON stand-in at {base_url} (pid {server.pid})")
+    elif args.local:
+        app = None
+        if args.synthetic:
+            build_start = time.perf_counter()
+            app = SyntheticStandIn(users=args.synthetic, products=args.synthetic, seed=args.seed or 0)
+            print(f"🧬 Generated {args.synthetic} synthetic users and products "
+                  f"in {time.perf_counter() - build_start:.1f}s")
+        server = server_from_args(args, app=app)
+        base_url = internal_base_url = server.start()
+        print(f"🧪 Using local DummyJSON stand-in at {base_url}")
+
+    proxies = {}
+    cache_proxy = None
+    load_report = None
+    try:
+        if args.fault:
+            proxies = start_proxies((base_url, internal_base_url), parse_fault_specs(args.fault), seed=args.seed)
+            base_url, internal_base_url = proxies[base_url].base_url, proxies[internal_base_url].base_url
+            print(f"🌩️  Routing through fault proxies: {'; '.join(args.fault)}")
+        if args.cache_proxy:
+            cache_proxy = CachingProxy(base_url, capacity_bytes=int(args.cache_capacity * 2 ** 20),
+                                       ttl=args.cache_ttl, stale=args.cache_stale, timeout=args.timeout)
+            base_url = cache_proxy.start()
+            print(f"🗄️  Routing DummyJSON requests through a caching proxy at {base_url}")
+        pool_size = max(args.pool_size, args.load_workers) if args.load else args.pool_size
+        limiter = None
+        if args.adaptive:
+            limiter = AdaptiveLimiters(initial_limit=args.adaptive_initial, max_limit=args.adaptive_max,
+                                       tolerance=args.latency_tolerance)
+            pool_size = max(pool_size, args.adaptive_max)
+        transport = cassette_writer = cassette = None
+        if args.record:
+            cassette_writer = CassetteWriter(args.record)
+            transport = recording_transport(cassette_writer)
+        elif args.replay:
+            cassette = Cassette(args.replay)
+            transport = replay_transport(cassette)
+            print(f"📼 Replaying {len(cassette)} recorded responses from {args.replay}")
+        http = SessionPool(pool_size=pool_size, retries=args.retries, backoff_factor=args.backoff,
+                           keep_alive=not args.no_keep_alive, transport=transport, limiter=limiter)
+        trace = TraceWriter(args.trace_out) if args.trace_out else None
+        if trace:
+            http.observers.append(trace)
+        results = ResultSink(args.results_jsonl)
+        decoder = get_decoder(args.decoder)
+        tokens = TokenManager(http, base_url, expires_in_mins=args.token_expiry, refresh_margin=args.refresh_margin,
+                              cache_path=args.auth_cache, timeout=args.timeout, decoder=decoder)
+        profiler = None
+        if args.profile:
+            profiler = CheckProfiler(args.profile, interval=args.profile_interval / 1000)
+            profiler.start()
+        tester = DummyJSONAPITester(base_url=base_url, internal_base_url=internal_base_url, http=http,
+                                    results=results, tokens=tokens, timeout=args.timeout, profiler=profiler,
+                                    decoder=decoder)
+        if args.fault_scenarios:
+            names = list(SCENARIOS) if args.fault_scenarios == "all" else args.fault_scenarios.split(",")
+            budgets = [float(budget) for budget in args.budgets.split(",")]
+            success = tester.run_fault_scenarios(names, rounds=args.fault_rounds, concurrency=max(1, args.concurrency),
+                                                 budgets=budgets, seed=args.seed,
+                                                 max_error_rate=args.scenario_max_error_rate,
+                                                 max_p99=args.scenario_max_p99)
+        elif args.soak:
+            thresholds = SoakThresholds(args.max_rss_growth, args.max_fd_growth, args.max_latency_drift)
+            success = tester.run_soak(args.soak_duration, args.soak_interval, concurrency=args.concurrency,
+                                      thresholds=thresholds, server_pid=server.pid if server else None)
+        elif args.snapshot:
+            success = tester.run_snapshot(args.snapshot, previous=args.previous_snapshot,
+                                          verify=args.verify_incremental) is not None
+        elif args.search_bench:
+            windows = [int(window) for window in args.debounce_windows.split(",")]
+            bench_results = tester.run_search_bench(load_corpus(args.query_corpus), debounce_windows=windows,
+                                                    seed=args.seed)
+            success = not any(
+                bucket.errors for result in bench_results
+                for stats in result.phases.values() for bucket in stats.values()
+            )
+        elif args.crawl:
+            page_sizes = [int(size) for size in args.page_sizes.split(",")]
+            best = tester.run_crawl(page_sizes=page_sizes, concurrency=args.crawl_concurrency,
+                                    repeats=args.crawl_repeats, cursor=args.crawl_cursor, project=args.project)
+            success = all(best.values())
+        elif args.load:
+            load_report = tester.run_load(scenario_from_args(args), processes=args.processes, auth=args.load_auth)
+            success = load_report.error_rate <= args.max_error_rate
+        else:
+            success = tester.run_all_tests(concurrency=args.concurrency, rounds=args.rounds)
+        tester.export_timings(json_path=args.timings_json, csv_path=args.timings_csv)
+        if args.save_baseline or args.compare_baseline:
+            success = record_baseline(args, tester, run_mode(args), load_report) and success
+        if limiter is not None and args.limit_timeline:
+            limiter.export(args.limit_timeline)
+        if profiler is not None:
+            profiler.stop()
+            if args.profile_stacks:
+                profiler.write_stacks(args.profile_stacks)
+                print(f"🔥 Collapsed stacks written to {args.profile_stacks}")
+        if cache_proxy is not None:
+            cache_proxy.print_stats()
+        http.close()
+        results.close()
+        if cassette_writer:
+            cassette_writer.close()
+            print(f"📼 Recorded cassette to {args.record}")
+        if cassette:
+            cassette.close()
+        if trace:
+            trace.close()
+    finally:
+        if cache_proxy is not None:
+            cache_proxy.stop()
+        for proxy in proxies.values():
+            proxy.stop()
+        if server:
+            server.stop()
+    return 0 if success else 1
+
 if __name__ == "__main__":
-    tester = DummyJSONAPITester()
-    success = tester.run_all_tests()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
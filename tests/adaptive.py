@@ -0,0 +1,217 @@
+"""
+Adaptive Concurrency Limits for Admin Dashboard API Tests
+Per-host AIMD limiter with a latency gradient: grows in-flight requests while
+latency stays near its baseline, cuts them on 429/503, errors or latency
+inflation, honours Retry-After, and keeps a timeline of the limit
+"""
+
+import csv
+import io
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from tests.http_pool import origin_of
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = datetime.now(timezone.utc) if now is None else now
+    return max(0.0, (when - now).total_seconds())
+
+
+class AdaptiveLimiter:
+    """Concurrency limit for one host
+
+    Increase is additive: +1 per `limit` successful responses, i.e. roughly
+    one per round trip while the limit is actually in use. Decrease is
+    multiplicative: ×`backoff` on throttling or errors, or ×(tolerated /
+    observed latency) when the short-window latency average exceeds
+    `tolerance` × the long-window baseline average. At most one decrease
+    happens per smoothed round trip, so a burst of 429s from one window only
+    counts once.
+    """
+
+    def __init__(self, name="", initial_limit=4, min_limit=1, max_limit=200, backoff=0.5,
+                 tolerance=2.0, smoothing=0.1, baseline_window=500):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.baseline_window = baseline_window
+        self.inflight = 0
+        self.baseline = None  # seconds; long-window EWMA of latency
+        self.latency = None  # seconds; short-window EWMA of latency
+        self.paused_until = 0.0
+        self.throttled = 0
+        self.errors = 0
+        self.decreases = 0
+        self.wait_time = 0.0
+        self.start = time.monotonic()
+        # (elapsed s, limit, in flight, smoothed latency ms, event) on every limit change
+        self.timeline = [(0.0, self.limit, 0, None, "start")]
+        # whole second -> [responses, throttled, latency sum s]
+        self.seconds = {}
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def current(self):
+        return max(self.min_limit, int(self.limit))
+
+    def acquire(self):
+        """Block until a slot is free and no Retry-After pause is active"""
+        waited_from = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    self._cond.wait(self.paused_until - now)
+                elif self.inflight >= self.current:
+                    self._cond.wait()
+                else:
+                    break
+            self.inflight += 1
+            self.wait_time += now - waited_from
+
+    def release(self, status=None, latency=None, retry_after=None, error=None):
+        """Return a slot and adapt the limit to how the request went"""
+        with self._cond:
+            self.inflight -= 1
+            now = time.monotonic()
+            bucket = self.seconds.setdefault(int(now - self.start), [0, 0, 0.0])
+            bucket[0] += 1
+            pause = parse_retry_after(retry_after)
+            if pause:
+                self.paused_until = max(self.paused_until, now + pause)
+            if error is not None or status in THROTTLE_STATUSES:
+                bucket[1] += 1
+                if error is not None:
+                    self.errors += 1
+                else:
+                    self.throttled += 1
+                self._decrease(now, self.backoff, "error" if error is not None else f"http {status}")
+            elif latency is not None:
+                bucket[2] += latency
+                self._observe(now, latency)
+            self._cond.notify_all()
+
+    def _observe(self, now, latency):
+        if self.baseline is None:
+            self.baseline = self.latency = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+            # The baseline never sits above recent latency, so recovery is not mistaken for inflation
+            self.baseline = min(self.latency, self.baseline + (latency - self.baseline) / self.baseline_window)
+        tolerated = self.baseline * self.tolerance
+        if self.latency > tolerated:
+            self._decrease(now, max(self.backoff, tolerated / self.latency), "latency")
+        elif self.inflight + 1 >= self.current / 2 and self.limit < self.max_limit:
+            # Only grow while the limit is actually being used
+            before = self.current
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            if self.current != before:
+                self._mark(now, "increase")
+
+    def _decrease(self, now, factor, event):
+        if now - self._last_decrease < (self.latency or 0.0):
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        self.limit = max(self.min_limit, self.limit * factor)
+        self._mark(now, event)
+
+    def _mark(self, now, event):
+        latency_ms = round(self.latency * 1000, 3) if self.latency is not None else None
+        self.timeline.append((round(now - self.start, 3), round(self.limit, 2), self.inflight, latency_ms, event))
+
+    def throughput(self):
+        """[(second, responses, throttled or failed, mean latency ms, limit at end of second)]"""
+        rows = []
+        marks = iter(self.timeline)
+        mark = next(marks)
+        limit = mark[1]
+        for second in range(max(self.seconds, default=-1) + 1):
+            while mark is not None and mark[0] < second + 1:
+                limit = mark[1]
+                mark = next(marks, None)
+            responses, throttled, latency_sum = self.seconds.get(second, (0, 0, 0.0))
+            ok = responses - throttled
+            rows.append((second, responses, throttled, round(latency_sum / ok * 1000, 3) if ok else None, limit))
+        return rows
+
+
+class AdaptiveLimiters:
+    """One AdaptiveLimiter per origin, created on first use with shared options"""
+
+    def __init__(self, **options):
+        self.options = options
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        origin = origin_of(url)
+        limiter = self.hosts.get(origin)
+        if limiter is None:
+            with self._lock:
+                limiter = self.hosts.get(origin)
+                if limiter is None:
+                    limiter = self.hosts[origin] = AdaptiveLimiter(origin, **self.options)
+        return limiter
+
+    def to_dict(self):
+        return {
+            origin: {
+                "timeline": [dict(zip(("elapsed_s", "limit", "inflight", "latency_ms", "event"), row))
+                             for row in limiter.timeline],
+                "throughput": [dict(zip(("second", "responses", "throttled", "latency_ms", "limit"), row))
+                               for row in limiter.throughput()],
+            }
+            for origin, limiter in self.hosts.items()
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_csv(self):
+        """Per-second throughput with the limit alongside, one row per host and second"""
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["host", "second", "responses", "throttled", "latency_ms", "limit"])
+        for origin, limiter in self.hosts.items():
+            for row in limiter.throughput():
+                writer.writerow([origin, *row])
+        return out.getvalue()
+
+    def export(self, path):
+        """Write the limit timeline as JSON (.json) or per-second CSV (anything else)"""
+        with open(path, "w", newline="") as fh:
+            fh.write(self.to_json() if path.endswith(".json") else self.to_csv())
+
+    def print_summary(self):
+        if not self.hosts:
+            return
+        print("\n📉 ADAPTIVE CONCURRENCY:")
+        for origin, limiter in self.hosts.items():
+            limits = [row[1] for row in limiter.timeline]
+            baseline = f"{limiter.baseline * 1000:.2f} ms" if limiter.baseline is not None else "n/a"
+            print(f"  • {origin}: limit {limiter.current} (min {min(limits):g}, max {max(limits):g}), "
+                  f"{limiter.decreases} decreases, {limiter.throttled} throttled, {limiter.errors} errors, "
+                  f"baseline {baseline}, queued {limiter.wait_time:.2f}s total")
@@ -0,0 +1,247 @@
+"""
+Auth Token Lifecycle for Admin Dashboard API Tests
+Caches the DummyJSON access/refresh token pair, refreshes it just before it
+expires with one refresh in flight at a time, and shares it across threads
+and worker processes through a lock-protected cache file
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+from tests.decoders import JsonDecoder
+
+try:
+    import fcntl
+except ImportError:  # optional: without it the cache file is shared unlocked
+    fcntl = None
+
+# The account the dashboard's login form uses in the tests
+DEFAULT_USERNAME = "emilys"
+DEFAULT_PASSWORD = "emilyspass"
+
+
+class AuthError(Exception):
+    """Raised when neither a refresh nor a fresh login yields a token"""
+
+
+def token_expiry(token):
+    """The `exp` claim of a JWT access token, or None if it is not a readable JWT"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class TokenPair:
+    access_token: str
+    refresh_token: str
+    expires_at: float
+
+    def fresh(self, margin, now):
+        return now < self.expires_at - margin
+
+
+@dataclass
+class TokenStats:
+    """Where each token() call got its token from"""
+    logins: int = 0
+    refreshes: int = 0
+    failed_refreshes: int = 0
+    cached: int = 0
+    shared: int = 0  # adopted from the cache file written by another worker
+
+    @property
+    def auth_requests(self):
+        return self.logins + self.refreshes + self.failed_refreshes
+
+    def merge(self, other):
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+        return self
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class TokenManager:
+    """Single-flight access token cache, optionally shared through `cache_path`
+
+    token() returns the cached access token until it is within `refresh_margin`
+    seconds of expiry. The first caller past that point refreshes while the
+    others wait on the same lock and then reuse its result; with a cache file,
+    an flock extends that to every process pointed at the same path.
+    """
+
+    def __init__(self, http, base_url, username=DEFAULT_USERNAME, password=DEFAULT_PASSWORD,
+                 expires_in_mins=60, refresh_margin=60.0, cache_path=None, timeout=10, decoder=None):
+        self.http = http
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.expires_in_mins = expires_in_mins
+        self.refresh_margin = refresh_margin
+        self.cache_path = cache_path
+        self.timeout = timeout
+        # Decodes login/refresh bodies the same way the checks decode theirs (tests.decoders)
+        self.decoder = decoder or JsonDecoder()
+        self.stats = TokenStats()
+        self._pair = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, outcome):
+        with self._stats_lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+
+    def _expiry(self, access_token, requested_at):
+        # Prefer the token's own claim; fall back to when we asked for it
+        expires_at = token_expiry(access_token)
+        return expires_at if expires_at is not None else requested_at + self.expires_in_mins * 60
+
+    def adopt(self, data, requested_at=None):
+        """Cache the body of a login made elsewhere (e.g. by a check); counts as a login"""
+        requested_at = time.time() if requested_at is None else requested_at
+        access_token = data.get("accessToken") or data.get("token")
+        pair = TokenPair(access_token, data.get("refreshToken"), self._expiry(access_token, requested_at))
+        self._count("logins")
+        with self._lock:
+            self._pair = pair
+            with self._shared_cache() as cache:
+                cache.write(pair)
+        return pair
+
+    def token(self):
+        """A valid access token, logging in or refreshing only when needed"""
+        pair = self._pair
+        if pair is not None and pair.fresh(self.refresh_margin, time.time()):
+            self._count("cached")
+            return pair.access_token
+        with self._lock:
+            # Single flight: whoever waited here re-checks what the leader fetched
+            pair = self._pair
+            if pair is not None and pair.fresh(self.refresh_margin, time.time()):
+                self._count("cached")
+                return pair.access_token
+            with self._shared_cache() as cache:
+                shared = cache.read()
+                if shared is not None and shared.fresh(self.refresh_margin, time.time()):
+                    self._count("shared")
+                    self._pair = shared
+                    return shared.access_token
+                pair = self._renew(shared or pair)
+                cache.write(pair)
+            self._pair = pair
+            return pair.access_token
+
+    def refresh(self):
+        """Force a refresh now (falling back to login) and return the new access token"""
+        with self._lock:
+            with self._shared_cache() as cache:
+                pair = self._renew(cache.read() or self._pair)
+                cache.write(pair)
+            self._pair = pair
+            return pair.access_token
+
+    @property
+    def pair(self):
+        """The cached TokenPair, or None before the first login"""
+        return self._pair
+
+    def headers(self):
+        return {"Authorization": f"Bearer {self.token()}"}
+
+    def _renew(self, stale):
+        if stale is not None and stale.refresh_token:
+            pair = self._request("/auth/refresh", {"refreshToken": stale.refresh_token,
+                                                   "expiresInMins": self.expires_in_mins})
+            if pair is not None:
+                self._count("refreshes")
+                return pair
+            self._count("failed_refreshes")
+        pair = self._request("/auth/login", {"username": self.username, "password": self.password,
+                                             "expiresInMins": self.expires_in_mins})
+        if pair is None:
+            raise AuthError(f"Login as {self.username} at {self.base_url} failed")
+        self._count("logins")
+        return pair
+
+    def _request(self, path, payload):
+        requested_at = time.time()
+        response = self.http.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+        if response.status_code != 200:
+            return None
+        data = self.decoder.decode(response.content)
+        access_token = data.get("accessToken") or data.get("token")
+        if not access_token:
+            return None
+        return TokenPair(access_token, data.get("refreshToken"), self._expiry(access_token, requested_at))
+
+    @contextmanager
+    def _shared_cache(self):
+        if not self.cache_path:
+            yield _NoCache()
+            return
+        with open(f"{self.cache_path}.lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield _CacheFile(self.cache_path, self.base_url, self.username)
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class _NoCache:
+    def read(self):
+        return None
+
+    def write(self, pair):
+        pass
+
+
+class _CacheFile:
+    """Token pair persisted as JSON; only read back for the same origin and user"""
+
+    def __init__(self, path, base_url, username):
+        self.path = path
+        self.owner = {"base_url": base_url, "username": username}
+
+    def read(self):
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if any(data.get(key) != value for key, value in self.owner.items()):
+            return None
+        return TokenPair(data["access_token"], data["refresh_token"], data["expires_at"])
+
+    def write(self, pair):
+        # Live tokens: owner-only from the moment the file exists, so the rename never exposes them
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(temp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({**self.owner, **asdict(pair)}, fh)
+        os.replace(temp_path, self.path)
+
+
+def print_auth_stats(stats, total_requests):
+    """Auth traffic as a share of every request sent"""
+    auth = stats.auth_requests
+    share = auth / total_requests * 100 if total_requests else 0.0
+    print(f"\n🔑 AUTH: {stats.logins} logins, {stats.refreshes} refreshes"
+          f"{f' ({stats.failed_refreshes} failed)' if stats.failed_refreshes else ''}, "
+          f"{stats.cached} cached, {stats.shared} shared via cache file "
+          f"— {auth}/{total_requests} requests ({share:.2f}%) spent on auth")
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Benchmark Baselines for Admin Dashboard API Tests
+Stores latency histograms from check, load and crawl runs keyed by git
+commit, and compares two commits per metric with bootstrap confidence
+intervals and a Mann-Whitney U test, gating on regressions
+"""
+
+import argparse
+import html
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+from tests.latency import Histogram, bucket_value
+
+try:
+    import numpy as np
+except ImportError:  # optional: without it the bootstrap uses fewer, pure-Python resamples
+    np = None
+
+STORE_VERSION = 2
+DEFAULT_STORE = ".benchmarks"
+
+
+def git_revision(ref="HEAD", cwd=None):
+    """Full commit hash for a ref, or None outside a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"], cwd=cwd,
+                              capture_output=True, text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def git_dirty(cwd=None):
+    """True when tracked files have uncommitted changes"""
+    try:
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=cwd,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return bool(status.strip())
+
+
+@dataclass
+class BenchmarkRun:
+    """One run's latency histograms (microseconds, lower is better) plus informational scalars
+
+    `target` names what was measured (a base URL, the local stand-in and its
+    profile, a replayed cassette) and `workload` the settings that shaped the
+    traffic (rate, duration, concurrency, page sizes, ...); runs differing in
+    either are never pooled or compared.
+    """
+    mode: str
+    metrics: dict  # metric name -> Histogram
+    summary: dict = field(default_factory=dict)
+    commit: str = None
+    dirty: bool = False
+    created: float = field(default_factory=time.time)
+    target: str = None  # None for runs stored before targets were recorded
+    workload: dict = field(default_factory=dict)
+
+    @classmethod
+    def capture(cls, mode, metrics, summary=None, target=None, workload=None, cwd=None):
+        """A run stamped with the current checkout's commit"""
+        return cls(mode, metrics, summary or {}, git_revision(cwd=cwd), git_dirty(cwd), target=target,
+                   workload=workload or {})
+
+    def to_dict(self):
+        return {
+            "version": STORE_VERSION,
+            "mode": self.mode,
+            "target": self.target,
+            "workload": self.workload,
+            "commit": self.commit,
+            "dirty": self.dirty,
+            "created": self.created,
+            "summary": self.summary,
+            "metrics": {name: hist.to_dict() for name, hist in self.metrics.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version", 1) > STORE_VERSION:
+            raise ValueError(f"Baseline format {data['version']} is newer than this tester ({STORE_VERSION})")
+        metrics = {name: Histogram.from_dict(hist) for name, hist in data["metrics"].items()}
+        return cls(data["mode"], metrics, data.get("summary", {}), data.get("commit"), data.get("dirty", False),
+                   data.get("created", 0.0), data.get("target"), data.get("workload", {}))
+
+
+def metrics_from_latency(recorder, phase="total"):
+    """One metric per endpoint template from a LatencyRecorder"""
+    return {endpoint: stats.phases[phase] for endpoint, stats in recorder.endpoints.items()
+            if stats.phases[phase].count}
+
+
+def metrics_from_load(report):
+    """Response time (from intended start) per load operation"""
+    return {f"load {operation} response": stats.response for operation, stats in report.operations.items()
+            if stats.response.count}
+
+
+def metrics_from_crawl(sweeps):
+    """Page latency per resource and page size from {resource: [CrawlResult, ...]}"""
+    metrics = {}
+    for resource, results in sweeps.items():
+        for result in results or ():
+            hist = metrics.setdefault(f"crawl {resource} limit={result.page_size} page", Histogram())
+            for latency in result.page_latencies:
+                hist.record(latency * 1_000_000)
+    return metrics
+
+
+class BaselineStore:
+    """Runs stored as <root>/<commit>/<mode>-<timestamp>.json; several runs of a commit are pooled"""
+
+    def __init__(self, root=DEFAULT_STORE):
+        self.root = root
+
+    def save(self, run):
+        directory = os.path.join(self.root, run.commit or "uncommitted")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{run.mode}-{time.strftime('%Y%m%dT%H%M%S', time.gmtime(run.created))}"
+                                       f"-{os.getpid()}.json")
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(run.to_dict(), fh)
+        return path
+
+    def commits(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(os.listdir(self.root), key=lambda c: os.path.getmtime(os.path.join(self.root, c)))
+
+    def resolve(self, ref):
+        """Stored commit for a git ref or a stored commit prefix"""
+        commit = git_revision(ref)
+        candidates = [c for c in self.commits() if c == commit or c.startswith(ref)]
+        if not candidates:
+            raise KeyError(f"No stored baseline for '{ref}' in {self.root}")
+        if len(candidates) > 1:
+            raise KeyError(f"'{ref}' matches several stored commits: {', '.join(c[:10] for c in candidates)}")
+        return candidates[0]
+
+    def runs(self, commit, mode=None):
+        directory = os.path.join(self.root, commit)
+        runs = []
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".json"):
+                with open(os.path.join(directory, name), encoding="utf-8") as fh:
+                    run = BenchmarkRun.from_dict(json.load(fh))
+                if mode is None or run.mode == mode:
+                    runs.append(run)
+        return runs
+
+    def pooled(self, ref, mode, target=None, include_dirty=False, workload=None):
+        """Every stored run of `mode` at `ref` with one target and workload merged into one BenchmarkRun
+
+        Runs taken from a dirty checkout are left out unless `include_dirty`.
+        With no `target` or `workload`, the stored runs must all share one.
+        """
+        commit = self.resolve(ref)
+        runs = self.runs(commit, mode)
+        if not runs:
+            raise KeyError(f"No '{mode}' runs stored for {commit[:10]}")
+        if not include_dirty:
+            clean = [run for run in runs if not run.dirty]
+            if not clean:
+                raise KeyError(f"Only dirty '{mode}' runs stored for {commit[:10]}"
+                               " (include them with --include-dirty or --baseline-include-dirty)")
+            runs = clean
+        targets = sorted({run.target for run in runs}, key=str)
+        if target is None and len(targets) > 1:
+            raise KeyError(f"'{mode}' runs for {commit[:10]} measured several targets "
+                           f"({'; '.join(map(str, targets))}); pick one with --target")
+        target = targets[0] if target is None else target
+        runs = [run for run in runs if run.target == target]
+        if not runs:
+            raise KeyError(f"No '{mode}' runs stored for {commit[:10]} against {target} "
+                           f"(stored: {'; '.join(map(str, targets))})")
+        workloads = list({_workload_key(run.workload): run.workload for run in runs}.values())
+        if workload is None and len(workloads) > 1:
+            raise KeyError(f"'{mode}' runs for {commit[:10]} used several workloads ({workload_diff(workloads)}); "
+                           f"keep them in separate --baseline-dir stores")
+        workload = workloads[0] if workload is None else workload
+        matching = [run for run in runs if _workload_key(run.workload) == _workload_key(workload)]
+        if not matching:
+            raise KeyError(f"No '{mode}' runs stored for {commit[:10]} with this workload "
+                           f"({workload_diff(workloads + [workload])})")
+        runs = matching
+        metrics = {}
+        for run in runs:
+            for name, hist in run.metrics.items():
+                metrics.setdefault(name, Histogram()).merge(hist)
+        return BenchmarkRun(mode, metrics, runs[-1].summary, commit, any(r.dirty for r in runs), runs[-1].created,
+                            target, workload)
+
+
+def _workload_key(workload):
+    return json.dumps(workload, sort_keys=True)
+
+
+def workload_diff(workloads):
+    """The settings that differ between workloads, e.g. "rps: 50 / 500" """
+    names = sorted({name for workload in workloads for name in workload})
+    differing = [name for name in names if len({json.dumps(w.get(name)) for w in workloads}) > 1]
+    return "; ".join(f"{name}: {' / '.join(str(w.get(name, '-')) for w in workloads)}" for name in differing)
+
+
+# -- statistics ---------------------------------------------------------------
+
+def _buckets(hist):
+    """(sorted representative values, counts) of a histogram"""
+    keys = sorted(hist.counts)
+    return [bucket_value(key) for key in keys], [hist.counts[key] for key in keys]
+
+
+def mann_whitney(base, candidate):
+    """Two-sided Mann-Whitney U p-value between two histograms
+
+    Values in one bucket are treated as ties, so ranks come from bucket
+    counts directly instead of expanding every sample. Normal approximation
+    with tie and continuity correction.
+    """
+    n1, n2 = base.count, candidate.count
+    if not n1 or not n2:
+        return None
+    keys = sorted(set(base.counts) | set(candidate.counts))
+    rank_sum = 0.0
+    ties = 0
+    seen = 0
+    for key in keys:
+        a, b = base.counts.get(key, 0), candidate.counts.get(key, 0)
+        t = a + b
+        rank_sum += b * (seen + (t + 1) / 2)
+        ties += t ** 3 - t
+        seen += t
+    u = rank_sum - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))) if n > 1 else 0.0
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return math.erfc(max(0.0, z) / math.sqrt(2))
+
+
+def _percentile_index(cumulative, count, pct):
+    rank = max(1, -(-count * pct // 100))
+    for index, seen in enumerate(cumulative):
+        if seen >= rank:
+            return index
+    return len(cumulative) - 1
+
+
+def bootstrap_change(base, candidate, pct=50, resamples=1000, confidence=0.95, seed=0):
+    """Confidence interval for candidate/base - 1 at percentile `pct`, resampling bucket counts"""
+    if not base.count or not candidate.count:
+        return None
+    tail = (1 - confidence) / 2 * 100
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        stats = []
+        for hist in (base, candidate):
+            values, counts = _buckets(hist)
+            draws = rng.multinomial(hist.count, np.array(counts) / hist.count, size=resamples)
+            rank = max(1, -(-hist.count * pct // 100))
+            stats.append(np.array(values, dtype=np.float64)[(draws.cumsum(axis=1) >= rank).argmax(axis=1)])
+        changes = stats[1] / np.maximum(stats[0], 1.0) - 1
+        low, high = np.percentile(changes, [tail, 100 - tail])
+        return float(low), float(high)
+    # Pure Python: resample at most 2000 draws per side, 200 times
+    rng = random.Random(seed)
+    resamples = min(resamples, 200)
+    changes = []
+    sides = []
+    for hist in (base, candidate):
+        values, counts = _buckets(hist)
+        sides.append((values, counts, min(hist.count, 2000)))
+    for _ in range(resamples):
+        stat = []
+        for values, counts, n in sides:
+            tally = [0] * len(values)
+            for index in rng.choices(range(len(values)), weights=counts, k=n):
+                tally[index] += 1
+            cumulative, seen = [], 0
+            for c in tally:
+                seen += c
+                cumulative.append(seen)
+            stat.append(values[_percentile_index(cumulative, n, pct)])
+        changes.append(stat[1] / max(stat[0], 1.0) - 1)
+    changes.sort()
+    last = len(changes) - 1
+    return changes[int(last * tail / 100)], changes[int(last * (100 - tail) / 100)]
+
+
+@dataclass
+class MetricComparison:
+    name: str
+    base_count: int
+    candidate_count: int
+    base_p50: float = None  # milliseconds
+    candidate_p50: float = None
+    change: float = None  # relative p50 change
+    ci: tuple = None
+    p99_change: float = None
+    p_value: float = None
+    verdict: str = "missing"  # regression | improvement | unchanged | insufficient | missing
+
+
+def compare_runs(base, candidate, threshold=0.10, alpha=0.01, min_samples=20, pct=50):
+    """Compare every metric: a regression needs p < alpha and the whole CI above +threshold"""
+    rows = []
+    for name in sorted(set(base.metrics) | set(candidate.metrics)):
+        a, b = base.metrics.get(name), candidate.metrics.get(name)
+        row = MetricComparison(name, a.count if a else 0, b.count if b else 0)
+        rows.append(row)
+        if a is None or b is None:
+            continue
+        row.base_p50, row.candidate_p50 = a.percentile(pct) / 1000, b.percentile(pct) / 1000
+        row.change = row.candidate_p50 / max(row.base_p50, 0.001) - 1
+        row.p99_change = b.percentile(99) / max(a.percentile(99), 1) - 1
+        if min(a.count, b.count) < min_samples:
+            row.verdict = "insufficient"
+            continue
+        row.p_value = mann_whitney(a, b)
+        row.ci = bootstrap_change(a, b, pct)
+        if row.p_value < alpha and row.ci[0] > threshold:
+            row.verdict = "regression"
+        elif row.p_value < alpha and row.ci[1] < -threshold:
+            row.verdict = "improvement"
+        else:
+            row.verdict = "unchanged"
+    return rows
+
+
+VERDICT_ICONS = {"regression": "❌", "improvement": "🚀", "unchanged": "✅", "insufficient": "·", "missing": "∅"}
+
+
+def _pct(value):
+    return f"{value * 100:+.1f}%" if value is not None else "-"
+
+
+def _ci(ci):
+    return f"[{ci[0] * 100:+.1f}%, {ci[1] * 100:+.1f}%]" if ci else "-"
+
+
+def _ms(value):
+    return f"{value:.2f}" if value is not None else "-"
+
+
+def print_comparison(rows, base, candidate, threshold, alpha):
+    print("\n" + "=" * 60)
+    print(f"📏 BASELINE COMPARISON ({base.mode})")
+    print("=" * 60)
+    print(f"Target: {base.target}")
+    if base.workload:
+        print("Workload: " + ", ".join(f"{name}={value}" for name, value in sorted(base.workload.items())))
+    print(f"Base {base.commit[:10] if base.commit else '?'}{' (dirty)' if base.dirty else ''} → "
+          f"candidate {candidate.commit[:10] if candidate.commit else 'this run'}{' (dirty)' if candidate.dirty else ''}; "
+          f"regression = p < {alpha:g} and 95% CI of Δp50 above +{threshold * 100:g}%")
+    width = max([len(row.name) for row in rows] + [6])
+    print(f"  {'metric'.ljust(width)} {'n base':>7} {'n cand':>7} {'p50 base':>9} {'p50 cand':>9} {'Δp50':>8} "
+          f"{'95% CI':>19} {'Δp99':>8} {'p':>8}")
+    for row in rows:
+        p_value = f"{row.p_value:.1e}" if row.p_value is not None else "-"
+        print(f"  {row.name.ljust(width)} {row.base_count:>7} {row.candidate_count:>7} {_ms(row.base_p50):>9} "
+              f"{_ms(row.candidate_p50):>9} {_pct(row.change):>8} {_ci(row.ci):>19} {_pct(row.p99_change):>8} "
+              f"{p_value:>8} {VERDICT_ICONS[row.verdict]} {row.verdict}")
+    regressions = [row.name for row in rows if row.verdict == "regression"]
+    print(f"\n{'❌' if regressions else '✅'} {len(regressions)} regression(s)"
+          + (f": {', '.join(regressions)}" if regressions else ""))
+
+
+def html_report(rows, base, candidate, threshold, alpha):
+    colours = {"regression": "#fde2e1", "improvement": "#e3f6e5", "insufficient": "#f4f4f4", "missing": "#f4f4f4"}
+    body = []
+    for row in rows:
+        cells = [row.name, row.base_count, row.candidate_count, _ms(row.base_p50), _ms(row.candidate_p50),
+                 _pct(row.change), _ci(row.ci), _pct(row.p99_change),
+                 f"{row.p_value:.1e}" if row.p_value is not None else "-", row.verdict]
+        body.append(f'<tr style="background:{colours.get(row.verdict, "#fff")}">'
+                    + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in cells) + "</tr>")
+    headers = ("metric", "n base", "n cand", "p50 base ms", "p50 cand ms", "Δp50", "95% CI", "Δp99", "p", "verdict")
+    summary = "".join(f"<li>{html.escape(str(k))}: {html.escape(str(base.summary.get(k, '-')))} → "
+                      f"{html.escape(str(candidate.summary.get(k, '-')))}</li>"
+                      for k in sorted(set(base.summary) | set(candidate.summary)))
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Baseline comparison</title>
+<style>body{{font-family:sans-serif;margin:2em}}table{{border-collapse:collapse}}
+td,th{{border:1px solid #ccc;padding:4px 8px;text-align:right}}td:first-child,th:first-child{{text-align:left}}</style>
+</head><body>
+<h1>Baseline comparison: {html.escape(base.mode)}</h1>
+<p>Base <code>{html.escape(base.commit or '?')}</code> → candidate <code>{html.escape(candidate.commit or 'this run')}</code>,
+both against <code>{html.escape(str(base.target))}</code>.
+Regression = Mann-Whitney p &lt; {alpha:g} and the bootstrap 95% CI of the p50 change entirely above +{threshold * 100:g}%.</p>
+<table><tr>{''.join(f'<th>{h}</th>' for h in headers)}</tr>
+{''.join(body)}
+</table>
+{f'<h2>Run summary</h2><ul>{summary}</ul>' if summary else ''}
+</body></html>
+"""
+
+
+def compare(store, base_ref, candidate, mode, threshold=0.10, alpha=0.01, min_samples=20, html_path=None,
+            target=None, include_dirty=False):
+    """Compare `candidate` (a BenchmarkRun or stored ref) with the stored `base_ref`
+
+    True if no metric regressed and at least one metric had enough samples
+    on both sides to be compared. Raises KeyError when the two sides were
+    measured against different targets.
+    """
+    if not isinstance(candidate, BenchmarkRun):
+        candidate = store.pooled(candidate, mode, target, include_dirty)
+    base = store.pooled(base_ref, mode, candidate.target, include_dirty, candidate.workload)
+    if base.target != candidate.target:
+        raise KeyError(f"Cannot compare runs against {base.target} with runs against {candidate.target}")
+    if _workload_key(base.workload) != _workload_key(candidate.workload):
+        raise KeyError(f"Cannot compare runs with different workloads ({workload_diff([base.workload, candidate.workload])})")
+    rows = compare_runs(base, candidate, threshold, alpha, min_samples)
+    print_comparison(rows, base, candidate, threshold, alpha)
+    if html_path:
+        with open(html_path, "w", encoding="utf-8") as fh:
+            fh.write(html_report(rows, base, candidate, threshold, alpha))
+        print(f"📝 HTML report written to {html_path}")
+    compared = [row for row in rows if row.verdict in ("regression", "improvement", "unchanged")]
+    if not compared:
+        print(f"⚠️  No metric was compared: none had {min_samples} samples on both sides")
+    return bool(compared) and not any(row.verdict == "regression" for row in rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List and compare stored benchmark baselines")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="Baseline store directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show stored commits and their runs")
+    diff = commands.add_parser("compare", help="Compare two stored commits; exits 1 on regression")
+    diff.add_argument("base", help="Git ref or stored commit prefix of the baseline")
+    diff.add_argument("candidate", nargs="?", default="HEAD", help="Git ref or stored commit prefix (default HEAD)")
+    diff.add_argument("--mode", default="checks", help="checks, load, crawl, ...")
+    diff.add_argument("--threshold", type=float, default=0.10, help="Relative p50 slowdown that counts")
+    diff.add_argument("--alpha", type=float, default=0.01, help="Mann-Whitney significance level")
+    diff.add_argument("--min-samples", type=int, default=20, help="Skip metrics with fewer samples")
+    diff.add_argument("--target", help="Compare runs against this target when a commit has several")
+    diff.add_argument("--include-dirty", action="store_true", help="Pool runs taken from a dirty checkout")
+    diff.add_argument("--html", metavar="PATH", help="Also write an HTML report")
+    args = parser.parse_args(argv)
+    store = BaselineStore(args.store)
+    if args.command == "list":
+        for commit in store.commits():
+            runs = store.runs(commit)
+            modes = ", ".join(sorted({f"{run.mode} @ {run.target}" for run in runs}))
+            print(f"{commit[:10]}  {len(runs)} run(s): {modes}{' (dirty)' if any(r.dirty for r in runs) else ''}")
+        return 0
+    try:
+        ok = compare(store, args.base, args.candidate, args.mode, args.threshold, args.alpha, args.min_samples,
+                     args.html, target=args.target, include_dirty=args.include_dirty)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        return 2
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
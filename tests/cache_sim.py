@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+Cache-policy Simulator for the Admin Dashboard Stores
+Replays JSONL access traces over the DummyJSON endpoints through the cache
+key scheme used by usersStore/productsStore and alternative policies
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from tests.dummyjson_server import match_route
+
+MINUTE = 60.0
+STORE_TTL = 5 * MINUTE
+CATEGORIES_TTL = 10 * MINUTE
+
+# Rough serialized record sizes, used when a trace line carries no "bytes"
+AVG_RECORD_BYTES = {"users": 1900, "products": 1900}
+CATEGORIES_BYTES = 1000
+ENVELOPE_BYTES = 40
+# One dashboard list page (limit 12), for sizing the TinyLFU admission window
+TYPICAL_PAGE_BYTES = ENVELOPE_BYTES + 12 * AVG_RECORD_BYTES["products"]
+
+
+@dataclass(frozen=True)
+class Access:
+    """One GET from a trace, decoded into the parameters the stores key on"""
+    t: float
+    resource: str
+    kind: str  # "list", "item" or "categories"
+    limit: int = 0
+    skip: int = 0
+    query: str = ""
+    category: str = ""
+    item_id: str = ""
+    size: int = 0
+    session: str = ""  # browser the request came from; "" when the trace does not say
+
+
+def parse_access(line):
+    """Decode a trace record into an Access, or None if the stores never cache it"""
+    if line.get("method", "GET") != "GET":
+        return None
+    split = urlsplit(line["url"])
+    route, params = match_route("GET", split.path)
+    if route is None or route.startswith("api_"):
+        return None
+    query = {k: v[-1] for k, v in parse_qs(split.query).items()}
+    resource = "users" if route.startswith("users") else "products"
+    if route == "products_categories":
+        access = Access(line["t"], resource, "categories")
+    elif route in ("users_get", "products_get"):
+        access = Access(line["t"], resource, "item", item_id=params["id"])
+    else:
+        access = Access(
+            line["t"], resource, "list",
+            limit=int(query.get("limit", 30)),
+            skip=int(query.get("skip", 0)),
+            query=query.get("q", ""),
+            category=unquote(params.get("slug", "")),
+        )
+    size = line.get("bytes")
+    if size is None:
+        size = estimate_bytes(access)
+    return Access(**{**access.__dict__, "size": int(size), "session": str(line.get("session", ""))})
+
+
+def estimate_bytes(access):
+    if access.kind == "categories":
+        return CATEGORIES_BYTES
+    per_record = AVG_RECORD_BYTES[access.resource]
+    if access.kind == "item":
+        return per_record
+    return ENVELOPE_BYTES + per_record * (access.limit or 100)
+
+
+def store_key(access):
+    """The exact cache key usersStore/productsStore build for this access"""
+    if access.kind == "categories":
+        return "categories"
+    if access.kind == "item":
+        return f"{access.resource[:-1]}-{access.item_id}"
+    if access.resource == "users":
+        return f"users-{access.limit}-{access.skip}-{access.query}"
+    return f"products-{access.limit}-{access.skip}-{access.query}-{access.category}"
+
+
+def ttl_for(key):
+    return CATEGORIES_TTL if key == "categories" else STORE_TTL
+
+
+class StoreKeys:
+    """Key scheme of the current stores: one entry per (limit, skip, query, category)"""
+    name = "store keys"
+
+    def keys(self, access):
+        return [(store_key(access), access.size)]
+
+    def fetch_bytes(self, access, missing):
+        return access.size
+
+
+class PerSessionKeys:
+    """Store keys scoped to the requesting browser
+
+    usersStore/productsStore live in each browser, so one session never
+    hits another's entries. Keying every entry by session through a single
+    unbounded ttl-dict is exactly one private dict per session.
+    """
+    name = "per-session"
+
+    def keys(self, access):
+        return [(f"{access.session}|{store_key(access)}", access.size)]
+
+    def fetch_bytes(self, access, missing):
+        return access.size
+
+
+class NormalizedKeys:
+    """Collapse equivalent page windows into aligned blocks of `block` records
+
+    Queries are trimmed and case-folded, and the search query is dropped when a
+    category is set, because productsStore ignores it in that case. A list access
+    maps to the blocks covering [skip, skip + limit) and hits only when all are cached.
+    A miss is fetched widened to block boundaries (one request spanning the
+    missing blocks), so every cached block holds records that were really
+    fetched, and the widened bytes are charged to the origin.
+    """
+    name = "normalized"
+
+    def __init__(self, block=10):
+        self.block = block
+
+    def keys(self, access):
+        if access.kind != "list":
+            return StoreKeys().keys(access)
+        query = "" if access.category else access.query.strip().lower()
+        prefix = f"{access.resource}|{query}|{access.category}"
+        first, last, per_record = self._window(access)
+        return [(f"{prefix}|{index}", per_record * self.block) for index in range(first, last + 1)]
+
+    def _window(self, access):
+        """First and last block of the window, and the bytes per record"""
+        per_record = AVG_RECORD_BYTES[access.resource]
+        limit = access.limit or max(self.block, access.size // per_record)
+        if access.size > ENVELOPE_BYTES:
+            per_record = (access.size - ENVELOPE_BYTES) // limit
+        return access.skip // self.block, (access.skip + limit - 1) // self.block, per_record
+
+    def fetch_bytes(self, access, missing):
+        if access.kind != "list":
+            return access.size
+        first, last, per_record = self._window(access)
+        missing_blocks = [int(key.rsplit("|", 1)[1]) for key, _ in missing]
+        span = max(missing_blocks) - min(missing_blocks) + 1
+        return ENVELOPE_BYTES + span * self.block * per_record
+
+
+class TTLDictPolicy:
+    """The stores' cache: a plain dict with a fixed TTL and no size bound"""
+    name = "ttl-dict"
+
+    def __init__(self, capacity_bytes=None):
+        self.entries = {}
+        self.bytes_used = 0
+
+    def get(self, key, now):
+        entry = self.entries.get(key)
+        return entry is not None and now - entry[0] < ttl_for(key)
+
+    def put(self, key, size, now):
+        # Expired entries are overwritten, never deleted
+        old = self.entries.get(key)
+        if old:
+            self.bytes_used -= old[1]
+        self.entries[key] = (now, size)
+        self.bytes_used += size
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class LRUPolicy:
+    """Byte-bounded LRU with the store TTLs"""
+    name = "lru"
+
+    def __init__(self, capacity_bytes):
+        self.capacity = capacity_bytes
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+
+    def get(self, key, now):
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        if now - entry[0] >= ttl_for(key):
+            self._remove(key)
+            return False
+        self.entries.move_to_end(key)
+        return True
+
+    def _remove(self, key):
+        _, size = self.entries.pop(key)
+        self.bytes_used -= size
+
+    def evict(self):
+        """Drop and return the least recently used entry"""
+        key, (stored, size) = self.entries.popitem(last=False)
+        self.bytes_used -= size
+        return key, stored, size
+
+    def put(self, key, size, now):
+        if key in self.entries:
+            self._remove(key)
+        if size > self.capacity:
+            return
+        while self.bytes_used + size > self.capacity:
+            self.evict()
+        self.entries[key] = (now, size)
+        self.bytes_used += size
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class LFUPolicy:
+    """Byte-bounded LFU (least frequently used, LRU among ties) with the store TTLs"""
+    name = "lfu"
+
+    def __init__(self, capacity_bytes):
+        self.capacity = capacity_bytes
+        self.entries = {}  # key -> [stored, size, freq]
+        self.buckets = {}  # freq -> OrderedDict of keys
+        self.bytes_used = 0
+
+    def _unlink(self, key, freq):
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+
+    def _remove(self, key):
+        stored, size, freq = self.entries.pop(key)
+        self._unlink(key, freq)
+        self.bytes_used -= size
+
+    def get(self, key, now):
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        if now - entry[0] >= ttl_for(key):
+            self._remove(key)
+            return False
+        self._unlink(key, entry[2])
+        entry[2] += 1
+        self.buckets.setdefault(entry[2], OrderedDict())[key] = None
+        return True
+
+    def put(self, key, size, now):
+        freq = 1
+        if key in self.entries:
+            freq = self.entries[key][2] + 1
+            self._remove(key)
+        if size > self.capacity:
+            return
+        while self.bytes_used + size > self.capacity:
+            victim = next(iter(self.buckets[min(self.buckets)]))
+            self._remove(victim)
+        self.entries[key] = [now, size, freq]
+        self.buckets.setdefault(freq, OrderedDict())[key] = None
+        self.bytes_used += size
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class CountMinSketch:
+    """4-row count-min sketch with periodic halving (the TinyLFU frequency estimator)"""
+
+    def __init__(self, width=4096, sample_size=40960):
+        self.width = width
+        self.rows = [[0] * width for _ in range(4)]
+        self.seeds = [0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F]
+        self.sample_size = sample_size
+        self.additions = 0
+
+    def _indexes(self, key):
+        h = hash(key)
+        return [((h ^ seed) * 0x01000193) % self.width for seed in self.seeds]
+
+    def add(self, key):
+        for row, index in zip(self.rows, self._indexes(key)):
+            row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.rows = [[count >> 1 for count in row] for row in self.rows]
+            self.additions //= 2
+
+    def estimate(self, key):
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+
+class TinyLFUPolicy:
+    """W-TinyLFU: a 1% LRU window feeding a main LRU guarded by a frequency sketch"""
+    name = "tinylfu"
+
+    def __init__(self, capacity_bytes):
+        # 1% of capacity, but never less than two typical list pages: a window
+        # smaller than one response would send every page straight to admission
+        window = min(capacity_bytes // 2, max(capacity_bytes // 100, 2 * TYPICAL_PAGE_BYTES))
+        self.window = LRUPolicy(window)
+        self.main = LRUPolicy(capacity_bytes - window)
+        self.sketch = CountMinSketch()
+
+    @property
+    def bytes_used(self):
+        return self.window.bytes_used + self.main.bytes_used
+
+    def get(self, key, now):
+        self.sketch.add(key)
+        return self.window.get(key, now) or self.main.get(key, now)
+
+    def put(self, key, size, now):
+        if key in self.main.entries:
+            self.main._remove(key)
+        window = self.window
+        if key in window.entries:
+            window._remove(key)
+        if size > window.capacity:
+            # Larger than the whole window: go straight to admission
+            self._promote(key, now, size)
+            return
+        while window.bytes_used + size > window.capacity:
+            self._promote(*window.evict())
+        window.entries[key] = (now, size)
+        window.bytes_used += size
+
+    def _promote(self, key, stored, size):
+        main = self.main
+        if size > main.capacity:
+            return
+        if main.bytes_used + size <= main.capacity:
+            main.put(key, size, stored)
+            return
+        candidate = self.sketch.estimate(key)
+        freed, victims = 0, []
+        for victim_key, (_, victim_size) in main.entries.items():
+            if self.sketch.estimate(victim_key) >= candidate:
+                return  # candidate loses admission
+            victims.append(victim_key)
+            freed += victim_size
+            if main.bytes_used - freed + size <= main.capacity:
+                break
+        for victim_key in victims:
+            main._remove(victim_key)
+        main.put(key, size, stored)
+
+    def __len__(self):
+        return len(self.window) + len(self.main)
+
+
+class TTLSizeCapPolicy:
+    """The stores' TTL dict plus a byte cap: expired entries go first, then the oldest"""
+    name = "ttl+cap"
+
+    def __init__(self, capacity_bytes):
+        self.capacity = capacity_bytes
+        self.entries = OrderedDict()  # insertion order == age order
+        self.bytes_used = 0
+
+    def get(self, key, now):
+        entry = self.entries.get(key)
+        return entry is not None and now - entry[0] < ttl_for(key)
+
+    def put(self, key, size, now):
+        old = self.entries.pop(key, None)
+        if old:
+            self.bytes_used -= old[1]
+        if size > self.capacity:
+            return
+        if self.bytes_used + size > self.capacity:
+            for stale in [k for k, (stored, _) in self.entries.items() if now - stored >= ttl_for(k)]:
+                self.bytes_used -= self.entries.pop(stale)[1]
+        while self.bytes_used + size > self.capacity:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes_used -= evicted
+        self.entries[key] = (now, size)
+        self.bytes_used += size
+
+    def __len__(self):
+        return len(self.entries)
+
+
+POLICIES = {
+    policy.name: policy
+    for policy in (TTLDictPolicy, LRUPolicy, LFUPolicy, TinyLFUPolicy, TTLSizeCapPolicy)
+}
+
+
+@dataclass
+class PolicyReport:
+    policy: str
+    keys: str
+    requests: int = 0
+    cacheable: int = 0
+    hits: int = 0
+    origin_requests: int = 0
+    origin_bytes: int = 0
+    bytes_from_cache: int = 0
+    peak_bytes: int = 0
+    peak_entries: int = 0
+
+    @property
+    def hit_ratio(self):
+        return self.hits / self.cacheable if self.cacheable else 0.0
+
+    @property
+    def origin_savings(self):
+        return 1 - self.origin_requests / self.requests if self.requests else 0.0
+
+
+def simulate(trace, policy, keys=None):
+    """Replay decoded trace records through one policy and key scheme"""
+    keys = keys or StoreKeys()
+    report = PolicyReport(policy.name, keys.name)
+    for line in trace:
+        report.requests += 1
+        access = parse_access(line)
+        if access is None:
+            report.origin_requests += 1
+            report.origin_bytes += line.get("bytes", 0)
+            continue
+        report.cacheable += 1
+        parts = keys.keys(access)
+        missing = [(key, size) for key, size in parts if not policy.get(key, access.t)]
+        if not missing:
+            report.hits += 1
+            report.bytes_from_cache += access.size
+            continue
+        # Missing blocks of one window are fetched with a single origin request
+        report.origin_requests += 1
+        report.origin_bytes += keys.fetch_bytes(access, missing)
+        for key, size in missing:
+            policy.put(key, size, access.t)
+        report.peak_bytes = max(report.peak_bytes, policy.bytes_used)
+        report.peak_entries = max(report.peak_entries, len(policy))
+    return report
+
+
+def compare_policies(trace, capacity_bytes, block=10):
+    """The current per-browser stores, then every policy as a shared cache with store and normalized keys"""
+    trace = list(trace)
+    reports = [simulate(trace, TTLDictPolicy(), PerSessionKeys())]
+    for key_scheme in (StoreKeys(), NormalizedKeys(block)):
+        for policy_cls in POLICIES.values():
+            reports.append(simulate(trace, policy_cls(capacity_bytes), key_scheme))
+    return reports
+
+
+def read_trace(path):
+    """Yield records from a JSONL trace, skipping lines without a url"""
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "url" in record and "t" in record:
+                yield record
+
+
+def synthesize_trace(sessions=200, duration=3600.0, seed=None):
+    """Generate dashboard browsing sessions against the tester's endpoints
+
+    Sessions page through users and products, open detail pages, filter by
+    category and search, following the page sizes the UI offers. Each record
+    carries its session id, since the stores cache per browser.
+    """
+    rng = random.Random(seed)
+    categories = ["beauty", "fragrances", "furniture", "groceries", "laptops",
+                  "smartphones", "mobile-accessories", "tablets"]
+    queries = ["john", "emily", "phone", "laptop", "apple", "mascara", "sofa"]
+    records = []
+    for session in range(sessions):
+        t = rng.uniform(0, duration)
+        for _ in range(rng.randint(3, 30)):
+            t += rng.expovariate(1 / 8.0)
+            roll = rng.random()
+            if roll < 0.3:
+                limit = rng.choice([10, 10, 10, 25, 50])
+                skip = limit * min(int(rng.expovariate(0.6)), 20)
+                url = f"/users?limit={limit}&skip={skip}"
+            elif roll < 0.4:
+                url = f"/users/search?q={rng.choice(queries)}&limit=10&skip=0"
+            elif roll < 0.5:
+                url = f"/users/{int(rng.paretovariate(1.2)) % 208 + 1}"
+            elif roll < 0.75:
+                skip = 12 * min(int(rng.expovariate(0.5)), 16)
+                url = f"/products?limit=12&skip={skip}"
+            elif roll < 0.82:
+                url = f"/products/category/{rng.choice(categories)}?limit=12&skip=0"
+            elif roll < 0.87:
+                url = f"/products/search?q={rng.choice(queries)}&limit=12&skip=0"
+            elif roll < 0.95:
+                url = f"/products/{int(rng.paretovariate(1.2)) % 194 + 1}"
+            else:
+                url = "/products/categories"
+            records.append({"t": round(t, 3), "method": "GET", "url": url, "session": session})
+    records.sort(key=lambda record: record["t"])
+    return records
+
+
+class TraceWriter:
+    """SessionPool observer that appends every request as a JSONL trace line"""
+
+    def __init__(self, path):
+        self._fh = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+
+    def __call__(self, method, url, timing):
+        split = urlsplit(url)
+        path = split.path + (f"?{split.query}" if split.query else "")
+        record = {
+            "t": round(time.monotonic() - self._start, 6),
+            "method": method,
+            "url": path,
+            "status": timing.status,
+            "bytes": timing.size,
+        }
+        with self._lock:
+            self._fh.write(json.dumps(record) + "\n")
+
+    def close(self):
+        with self._lock:
+            self._fh.close()
+
+
+def print_reports(reports):
+    print(f"  {'policy':<10} {'keys':<11} {'requests':>8} {'hit %':>7} {'origin':>7} "
+          f"{'saved %':>8} {'origin KiB':>10} {'peak KiB':>9} {'entries':>8}")
+    for r in reports:
+        print(f"  {r.policy:<10} {r.keys:<11} {r.requests:>8} {r.hit_ratio * 100:>7.1f} {r.origin_requests:>7} "
+              f"{r.origin_savings * 100:>8.1f} {r.origin_bytes / 1024:>10.0f} {r.peak_bytes / 1024:>9.0f} "
+              f"{r.peak_entries:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay access traces through cache policies")
+    parser.add_argument("--trace", help="JSONL trace with t, url and optional method/bytes fields")
+    parser.add_argument("--sessions", type=int, default=200, help="Synthetic sessions when no trace is given")
+    parser.add_argument("--duration", type=float, default=3600.0, help="Synthetic trace length in seconds")
+    parser.add_argument("--capacity-kib", type=float, default=1024, help="Byte budget for bounded policies")
+    parser.add_argument("--block", type=int, default=10, help="Block size for normalized page windows")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        trace = list(read_trace(args.trace))
+        source = args.trace
+    else:
+        trace = synthesize_trace(args.sessions, args.duration, args.seed)
+        source = f"{args.sessions} synthetic sessions"
+    print(f"🧮 Cache policy simulation over {len(trace)} requests ({source}), "
+          f"capacity {args.capacity_kib:.0f} KiB")
+    print_reports(compare_policies(trace, int(args.capacity_kib * 1024), args.block))
+
+
+if __name__ == "__main__":
+    main()
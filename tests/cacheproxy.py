@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+"""
+Request-coalescing Caching Proxy for the DummyJSON Routes
+A shared local HTTP/1.1 reverse proxy serving the tester's GET routes from a
+bounded LRU+TTL memory tier with single-flight coalescing, stale-while-
+revalidate and ETag revalidation, plus a benchmark replaying concurrent
+dashboard sessions with and without it
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+from tests.cache_sim import CATEGORIES_TTL, STORE_TTL, synthesize_trace
+from tests.dummyjson_server import HTTP_REASONS, RouteProfile, StandInServer, match_route
+from tests.http_pool import SessionPool
+from tests.latency import Histogram
+
+# The GET routes DummyJSONAPITester covers; everything else is passed through
+CACHEABLE_ROUTES = (
+    "users_list", "users_search", "users_get",
+    "products_list", "products_search", "products_category", "products_categories", "products_get",
+)
+DEFAULT_STALE = 60.0
+DEFAULT_CAPACITY = 64 * 1024 * 1024
+# Not forwarded or stored; Content-Length and Age are recomputed per response
+HOP_BY_HOP = frozenset({"connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te",
+                        "trailer", "transfer-encoding", "upgrade", "content-length", "age"})
+MAX_IDLE_UPSTREAM = 32
+DEFAULT_ORIGIN_TIMEOUT = 10.0
+# Anything that means the origin gave no usable answer; a hung origin surfaces as TimeoutError
+ORIGIN_ERRORS = (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError)
+# Admins opening the dashboard together request these first
+LANDING_PAGES = ("/users?limit=10&skip=0", "/products?limit=12&skip=0", "/products/categories")
+
+
+def cache_key(target):
+    """Path plus query parameters in sorted order, so ?skip=0&limit=12 and ?limit=12&skip=0 share an entry"""
+    split = urlsplit(target)
+    query = urlencode(sorted(parse_qsl(split.query, keep_blank_values=True)))
+    return f"{split.path}?{query}" if query else split.path
+
+
+def _header(headers, name):
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _etag_matches(if_none_match, etag):
+    return if_none_match == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+@dataclass
+class CacheEntry:
+    """A stored 200 response; fresh for `ttl` seconds, then servable stale for `stale` more"""
+    headers: list
+    body: bytes
+    stored: float
+    ttl: float
+    stale: float
+    etag: str = None
+    last_modified: str = None
+
+    @property
+    def size(self):
+        return len(self.body) + sum(len(key) + len(value) for key, value in self.headers)
+
+    def age(self, now):
+        return now - self.stored
+
+    def fresh(self, now):
+        return self.age(now) < self.ttl
+
+    def servable_stale(self, now):
+        return self.age(now) < self.ttl + self.stale
+
+
+class MemoryTier:
+    """Byte- and entry-bounded LRU of CacheEntry
+
+    Entries past their stale window are kept until evicted: their
+    validators still let a revalidation come back as a cheap 304.
+    """
+
+    def __init__(self, capacity_bytes=DEFAULT_CAPACITY, max_entries=None):
+        self.capacity = capacity_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key):
+        self.bytes_used -= self.entries.pop(key).size
+
+    def put(self, key, entry):
+        if key in self.entries:
+            self._remove(key)
+        if entry.size > self.capacity:
+            return
+        while self.entries and (self.bytes_used + entry.size > self.capacity
+                                or self.max_entries and len(self.entries) >= self.max_entries):
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes_used -= evicted.size
+            self.evictions += 1
+        self.entries[key] = entry
+        self.bytes_used += entry.size
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class CachingProxy:
+    """Reverse proxy from a local port to `upstream` with a shared response cache
+
+    Concurrent misses for one key share a single origin request. A stale
+    entry is served at once while one background request revalidates it
+    (stale-while-revalidate), and an origin failure falls back to any stored
+    entry (stale-if-error). Revalidation sends If-None-Match/If-Modified-Since
+    so unchanged pages come back as bodiless 304s. Requests carrying
+    Authorization or Cookie headers are never cached. `time_scale` divides
+    every TTL so compressed trace replays expire entries on schedule.
+    Each origin exchange is bounded by `timeout` seconds, so a hung upstream
+    fails its flight (and the requests coalesced onto it) like any other
+    origin error instead of pinning the key forever.
+    """
+
+    def __init__(self, upstream, capacity_bytes=DEFAULT_CAPACITY, max_entries=None, ttl=None,
+                 stale=DEFAULT_STALE, time_scale=1.0, timeout=DEFAULT_ORIGIN_TIMEOUT, host="127.0.0.1", port=0):
+        split = urlsplit(upstream)
+        self.upstream = upstream.rstrip("/")
+        self.upstream_host = split.hostname
+        self.upstream_tls = split.scheme == "https"
+        self.upstream_port = split.port or (443 if self.upstream_tls else 80)
+        self.upstream_netloc = split.netloc
+        self.tier = MemoryTier(capacity_bytes, max_entries)
+        self.ttl = ttl
+        self.stale = stale / time_scale
+        self.time_scale = time_scale
+        self.timeout = timeout
+        self.host = host
+        self.port = port
+        self.stats = dict.fromkeys(
+            ("requests", "hits", "stale", "coalesced", "misses", "revalidations", "not_modified",
+             "client_not_modified", "bypass", "origin_requests", "origin_errors", "origin_timeouts"), 0)
+        self._flights = {}  # cache key -> task fetching it from the origin
+        self._idle = []
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def origin_reduction(self):
+        requests_seen = self.stats["requests"]
+        return 1 - self.stats["origin_requests"] / requests_seen if requests_seen else 0.0
+
+    def ttl_for(self, route, headers):
+        """Seconds a response stays fresh, or None if it must not be stored
+
+        The origin's Cache-Control wins; without max-age the stores' own
+        TTLs apply (or the `ttl` override).
+        """
+        directives = {}
+        for part in (_header(headers, "cache-control") or "").split(","):
+            name, _, value = part.strip().partition("=")
+            directives[name.lower()] = value.strip('"')
+        if "no-store" in directives or "private" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0.0
+        for name in ("s-maxage", "max-age"):
+            if directives.get(name, "").isdigit():
+                return int(directives[name]) / self.time_scale
+        if self.ttl is not None:
+            return self.ttl / self.time_scale
+        return (CATEGORIES_TTL if route == "products_categories" else STORE_TTL) / self.time_scale
+
+    async def _read_request(self, reader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head[:-4].decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        body = await reader.readexactly(length) if length else b""
+        return method, target, version, headers, body
+
+    async def _read_chunked(self, reader):
+        parts = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass  # trailers
+                return b"".join(parts)
+            parts.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    async def _read_response(self, reader, method):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head[:-4].decode("latin-1").split("\r\n")
+        version, status = lines[0].split(" ", 2)[:2]
+        status = int(status)
+        headers = []
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            headers.append((key.strip(), value.strip()))
+        keep_alive = (_header(headers, "connection") or "").lower() != "close" and version == "HTTP/1.1"
+        if method == "HEAD" or status in (204, 304) or status < 200:
+            body = b""
+        elif "chunked" in (_header(headers, "transfer-encoding") or "").lower():
+            body = await self._read_chunked(reader)
+        elif _header(headers, "content-length") is not None:
+            body = await reader.readexactly(int(_header(headers, "content-length")))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        headers = [(key, value) for key, value in headers if key.lower() not in HOP_BY_HOP]
+        return status, headers, body, keep_alive
+
+    async def _origin(self, method, target, headers, body=b""):
+        """One request to the upstream over a pooled keep-alive connection"""
+        self.stats["origin_requests"] += 1
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.upstream_netloc}",
+                 *(f"{key}: {value}" for key, value in headers.items())]
+        if body or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {len(body)}")
+        raw = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+        while True:
+            reused = bool(self._idle)
+            if reused:
+                reader, writer = self._idle.pop()
+            else:
+                reader, writer = await asyncio.open_connection(
+                    self.upstream_host, self.upstream_port,
+                    ssl=ssl.create_default_context() if self.upstream_tls else None,
+                    server_hostname=self.upstream_host if self.upstream_tls else None,
+                )
+            try:
+                writer.write(raw)
+                await writer.drain()
+                status, response_headers, payload, keep_alive = await self._read_response(reader, method)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused and method == "GET":
+                    continue  # the origin closed an idle connection; GETs are safe to resend
+                raise
+            except BaseException:
+                # Timed out, cancelled or unparseable: the connection is mid-exchange and unusable
+                writer.close()
+                raise
+            if keep_alive and len(self._idle) < MAX_IDLE_UPSTREAM:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+            return status, response_headers, payload
+
+    async def _exchange(self, method, target, headers, body=b""):
+        """_origin bounded end to end (connect, send, read) by `timeout`"""
+        try:
+            return await asyncio.wait_for(self._origin(method, target, headers, body), self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["origin_timeouts"] += 1
+            raise
+
+    async def _fetch(self, key, route, target, entry):
+        """Fetch `target` for the cache, revalidating `entry` if there is one
+
+        Returns the CacheEntry to serve, or a (status, headers, body) response
+        that must not be stored.
+        """
+        headers = {"Accept": "application/json", "Accept-Encoding": "identity"}
+        if entry is not None:
+            self.stats["revalidations"] += 1
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        try:
+            status, response_headers, body = await self._exchange("GET", target, headers)
+        except ORIGIN_ERRORS as e:
+            self.stats["origin_errors"] += 1
+            if entry is not None:
+                return entry
+            return 502, [("Content-Type", "application/json")], json.dumps({"message": f"Bad gateway: {str(e) or type(e).__name__}"}).encode()
+        now = time.monotonic()
+        if status == 304 and entry is not None:
+            self.stats["not_modified"] += 1
+            entry.stored = now
+            ttl = self.ttl_for(route, response_headers)
+            if ttl is not None:
+                entry.ttl = ttl
+            self.tier.put(key, entry)
+            return entry
+        ttl = self.ttl_for(route, response_headers)
+        if status != 200 or ttl is None:
+            return status, response_headers, body
+        entry = CacheEntry(response_headers, body, now, ttl, self.stale,
+                           etag=_header(response_headers, "etag"),
+                           last_modified=_header(response_headers, "last-modified"))
+        self.tier.put(key, entry)
+        return entry
+
+    def _fly(self, key, route, target, entry):
+        """Start the single origin fetch for `key` that concurrent requests wait on"""
+        flight = self._flights[key] = asyncio.ensure_future(self._fetch(key, route, target, entry))
+        flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        return flight
+
+    def _serve_entry(self, entry, label, request_headers):
+        headers = [*entry.headers, ("Age", str(int(entry.age(time.monotonic()) * self.time_scale))),
+                   ("X-Cache", label)]
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and entry.etag and _etag_matches(if_none_match, entry.etag):
+            self.stats["client_not_modified"] += 1
+            return 304, headers, b""
+        return 200, headers, entry.body
+
+    async def _serve(self, method, target, headers, body):
+        self.stats["requests"] += 1
+        route, _ = match_route(method, urlsplit(target).path)
+        if route not in CACHEABLE_ROUTES or method != "GET" or "authorization" in headers or "cookie" in headers:
+            self.stats["bypass"] += 1
+            forward = {key: value for key, value in headers.items() if key not in HOP_BY_HOP and key != "host"}
+            try:
+                status, response_headers, payload = await self._exchange(method, target, forward, body)
+            except ORIGIN_ERRORS as e:
+                self.stats["origin_errors"] += 1
+                status, response_headers = 502, [("Content-Type", "application/json")]
+                payload = json.dumps({"message": f"Bad gateway: {str(e) or type(e).__name__}"}).encode()
+            return status, [*response_headers, ("X-Cache", "BYPASS")], payload
+
+        key = cache_key(target)
+        now = time.monotonic()
+        entry = self.tier.get(key)
+        if entry is not None and entry.fresh(now):
+            self.stats["hits"] += 1
+            return self._serve_entry(entry, "HIT", headers)
+        if entry is not None and entry.servable_stale(now):
+            self.stats["stale"] += 1
+            if key not in self._flights:
+                self._fly(key, route, target, entry)
+            return self._serve_entry(entry, "STALE", headers)
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.stats["coalesced"] += 1
+            label = "COALESCED"
+        else:
+            self.stats["misses"] += 1
+            flight = self._fly(key, route, target, entry)
+            label = "REVALIDATED" if entry is not None else "MISS"
+        # Shielded so a client hanging up does not cancel the fetch others wait on
+        result = await asyncio.shield(flight)
+        if isinstance(result, CacheEntry):
+            return self._serve_entry(result, label, headers)
+        status, response_headers, payload = result
+        return status, [*response_headers, ("X-Cache", label)], payload
+
+    async def _respond(self, writer, method, status, headers, body, keep_alive):
+        lines = [f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'Unknown')}",
+                 *(f"{key}: {value}" for key, value in headers),
+                 f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (b"" if method == "HEAD" else body))
+        await writer.drain()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    method, target, version, headers, body = await self._read_request(reader)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+                    break
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                status, response_headers, payload = await self._serve(method, target, headers, body)
+                await self._respond(writer, method, status, response_headers, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self):
+        """Run the proxy on a background thread and return its base URL"""
+        def runner():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.serve())
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=runner, name="cache-proxy", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self.base_url
+
+    def stop(self):
+        if self._loop and self._server:
+            def shutdown():
+                self._server.close()
+                for task in asyncio.all_tasks(self._loop):
+                    task.cancel()
+            self._loop.call_soon_threadsafe(shutdown)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def print_stats(self):
+        stats = self.stats
+        cacheable = stats["requests"] - stats["bypass"]
+        served = stats["hits"] + stats["stale"]
+        print(f"\n🗄️  CACHE PROXY: {stats['requests']} requests, {stats['origin_requests']} to the origin "
+              f"({self.origin_reduction * 100:.1f}% fewer)")
+        print(f"  hit {stats['hits']}  stale {stats['stale']}  coalesced {stats['coalesced']}  miss {stats['misses']}  "
+              f"bypass {stats['bypass']}  ({served / cacheable * 100 if cacheable else 0:.1f}% of cacheable answered "
+              f"from memory, {stats['coalesced']} more shared an origin request)")
+        print(f"  revalidations {stats['revalidations']} ({stats['not_modified']} answered 304)  "
+              f"client 304s {stats['client_not_modified']}  origin errors {stats['origin_errors']} "
+              f"({stats['origin_timeouts']} timeouts)")
+        print(f"  {len(self.tier)} entries, {self.tier.bytes_used / 1024:.0f} KiB, {self.tier.evictions} evictions")
+
+
+def dashboard_trace(sessions=200, duration=300.0, burst=50, seed=None):
+    """cache_sim's browsing sessions plus `burst` admins opening the landing pages at the same moment"""
+    records = synthesize_trace(sessions, duration, seed)
+    records += [{"t": 0.0, "method": "GET", "url": url} for _ in range(burst) for url in LANDING_PAGES]
+    records.sort(key=lambda record: record["t"])
+    return records
+
+
+@dataclass
+class ReplayResult:
+    """Latency from each request's intended start (µs), overall and by the proxy's X-Cache label"""
+    target: str
+    requests: int = 0
+    errors: int = 0
+    origin_requests: int = 0
+    elapsed: float = 0.0
+    latency: Histogram = field(default_factory=Histogram)
+    by_cache: dict = field(default_factory=dict)
+
+
+def replay(base_url, trace, speedup=20.0, workers=64, timeout=10.0, target="direct"):
+    """Fire every trace request at t / speedup, open loop, the way OpenLoopLoadGenerator schedules"""
+    result = ReplayResult(target)
+    lock = threading.Lock()
+    http = SessionPool(pool_size=workers)
+
+    def send(intended, url):
+        error = False
+        try:
+            response = http.get(f"{base_url}{url}", timeout=timeout)
+            label = response.headers.get("X-Cache", "DIRECT")
+            error = response.status_code >= 500
+        except requests.RequestException:
+            label, error = "ERROR", True
+        elapsed = (time.perf_counter() - intended) * 1_000_000
+        with lock:
+            result.requests += 1
+            result.errors += error
+            result.latency.record(elapsed)
+            result.by_cache.setdefault(label, Histogram()).record(elapsed)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="replay") as pool:
+        start = time.perf_counter()
+        for record in trace:
+            intended = start + record["t"] / speedup
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, intended, record["url"])
+    result.elapsed = time.perf_counter() - start
+    http.close()
+    return result
+
+
+def probe_overhead(upstream, proxy_url, trace, samples=200, timeout=10.0, seed=None):
+    """The proxy's own added latency, measured one request at a time so nothing queues
+
+    Each sample takes a trace URL with a unique `_probe` parameter (a
+    guaranteed miss; the origin ignores it) and times a direct request, the
+    proxied miss and a proxied hit of that URL back to back, so origin
+    jitter and drift affect all three alike.
+    """
+    rng = random.Random(seed)
+    urls = [record["url"] for record in trace]
+    hists = {"direct": Histogram(), "proxy miss": Histogram(), "proxy hit": Histogram()}
+    http = SessionPool(pool_size=2)
+    for sample in range(samples):
+        url = rng.choice(urls)
+        url = f"{url}{'&' if '?' in url else '?'}_probe={sample}"
+        for name, base_url in (("direct", upstream), ("proxy miss", proxy_url), ("proxy hit", proxy_url)):
+            start = time.perf_counter()
+            http.get(f"{base_url}{url}", timeout=timeout)
+            hists[name].record((time.perf_counter() - start) * 1_000_000)
+    http.close()
+    return hists
+
+
+def benchmark(upstream=None, sessions=200, duration=300.0, burst=50, speedup=20.0, workers=64,
+              origin_latency_ms=40.0, origin_jitter_ms=10.0, capacity_bytes=DEFAULT_CAPACITY, ttl=None,
+              stale=DEFAULT_STALE, origin_timeout=DEFAULT_ORIGIN_TIMEOUT, probes=200, seed=None):
+    """Replay one dashboard trace straight at the origin, then through a fresh CachingProxy
+
+    The replays give origin reduction and end-to-end latency under load;
+    the proxy's own overhead comes from probe_overhead on a separate proxy,
+    so the probes neither queue behind the replay nor skew its counters.
+    Without `upstream` the origin is a synthetic stand-in sized like
+    DummyJSON (208 users, 194 products) with the given latency.
+    """
+    from tests.synthetic import SyntheticStandIn
+
+    trace = dashboard_trace(sessions, duration, burst, seed)
+    server = None
+    if upstream is None:
+        profile = RouteProfile(latency_ms=origin_latency_ms, jitter_ms=origin_jitter_ms)
+        server = StandInServer(default_profile=profile, seed=seed,
+                               app=SyntheticStandIn(users=208, products=194, seed=seed or 0))
+        upstream = server.start()
+    try:
+        direct = replay(upstream, trace, speedup, workers, target="direct")
+        direct.origin_requests = direct.requests
+        with CachingProxy(upstream, capacity_bytes, ttl=ttl, stale=stale, time_scale=speedup,
+                          timeout=origin_timeout) as proxy:
+            proxied = replay(proxy.base_url, trace, speedup, workers, target="proxy")
+        proxied.origin_requests = proxy.stats["origin_requests"]
+        with CachingProxy(upstream, capacity_bytes, timeout=origin_timeout) as probe_proxy:
+            overhead = probe_overhead(upstream, probe_proxy.base_url, trace, probes, origin_timeout, seed)
+    finally:
+        if server:
+            server.stop()
+    return direct, proxied, proxy, overhead
+
+
+def _ms(hist, pct):
+    value = hist.percentile(pct)
+    return value / 1000 if value is not None else 0.0
+
+
+def print_benchmark(direct, proxied, proxy, overhead, sessions, burst):
+    print("\n" + "=" * 60)
+    print(f"🗄️  CACHING PROXY BENCHMARK ({sessions} sessions + {burst} simultaneous dashboard loads)")
+    print("=" * 60)
+    base = overhead["direct"]
+    print(f"  Added latency, one request at a time ({base.count} paired samples):")
+    print(f"  {'path':<12} {'p50 ms':>8} {'p99 ms':>8} {'Δp50 ms':>8} {'Δp99 ms':>8}")
+    for name, hist in overhead.items():
+        print(f"  {name:<12} {_ms(hist, 50):>8.2f} {_ms(hist, 99):>8.2f} {_ms(hist, 50) - _ms(base, 50):>+8.2f} "
+              f"{_ms(hist, 99) - _ms(base, 99):>+8.2f}")
+    print("\n  Trace replay (latency from intended start, so it includes replay-client queueing):")
+    print(f"  {'path':<8} {'requests':>8} {'origin':>8} {'reduction':>9} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p99 ms':>8} {'errors':>7}")
+    for result in (direct, proxied):
+        reduction = 1 - result.origin_requests / result.requests if result.requests else 0.0
+        print(f"  {result.target:<8} {result.requests:>8} {result.origin_requests:>8} {reduction * 100:>8.1f}% "
+              f"{_ms(result.latency, 50):>8.2f} {_ms(result.latency, 90):>8.2f} {_ms(result.latency, 99):>8.2f} "
+              f"{result.errors:>7}")
+    print(f"\n  {'X-Cache':<12} {'requests':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for label, hist in sorted(proxied.by_cache.items(), key=lambda item: -item[1].count):
+        print(f"  {label:<12} {hist.count:>8} {_ms(hist, 50):>8.2f} {_ms(hist, 99):>8.2f}")
+    proxy.print_stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared request-coalescing caching proxy for the DummyJSON routes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Run the proxy in front of an upstream until interrupted")
+    serve.add_argument("upstream", nargs="?", default="https://dummyjson.com")
+    serve.add_argument("--port", type=int, default=8787)
+    bench = commands.add_parser("bench", help="Replay dashboard sessions with and without the proxy")
+    bench.add_argument("--upstream", help="Origin to benchmark against (default: a local synthetic stand-in)")
+    bench.add_argument("--sessions", type=int, default=200, help="Browsing sessions in the trace")
+    bench.add_argument("--duration", type=float, default=300.0, help="Seconds over which sessions start")
+    bench.add_argument("--burst", type=int, default=50, help="Admins loading the landing pages at the same moment")
+    bench.add_argument("--speedup", type=float, default=20.0, help="Replay the trace N times faster (TTLs scale too)")
+    bench.add_argument("--workers", type=int, default=64, help="Max requests in flight")
+    bench.add_argument("--origin-latency", type=float, default=40.0, help="Stand-in origin latency in ms")
+    bench.add_argument("--probes", type=int, default=200, help="Paired samples for the added-latency measurement")
+    bench.add_argument("--seed", type=int, default=None)
+    for sub in (serve, bench):
+        sub.add_argument("--capacity-mib", type=float, default=DEFAULT_CAPACITY / 2 ** 20, help="Memory tier size")
+        sub.add_argument("--ttl", type=float, help="Freshness in seconds when the origin sends no max-age "
+                                                   "(default: the stores' 5 min, 10 min for categories)")
+        sub.add_argument("--stale", type=float, default=DEFAULT_STALE,
+                         help="Seconds past expiry an entry is still served while it revalidates")
+        sub.add_argument("--origin-timeout", type=float, default=DEFAULT_ORIGIN_TIMEOUT,
+                         help="Seconds an origin exchange may take before it counts as an origin error")
+    args = parser.parse_args(argv)
+    capacity = int(args.capacity_mib * 2 ** 20)
+
+    if args.command == "serve":
+        proxy = CachingProxy(args.upstream, capacity, ttl=args.ttl, stale=args.stale, timeout=args.origin_timeout,
+                             port=args.port)
+        print(f"🗄️  Caching {args.upstream} at {proxy.start()} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            proxy.stop()
+            proxy.print_stats()
+        return
+
+    direct, proxied, proxy, overhead = benchmark(
+        upstream=args.upstream,
+        sessions=args.sessions,
+        duration=args.duration,
+        burst=args.burst,
+        speedup=args.speedup,
+        workers=args.workers,
+        origin_latency_ms=args.origin_latency,
+        capacity_bytes=capacity,
+        ttl=args.ttl,
+        stale=args.stale,
+        origin_timeout=args.origin_timeout,
+        probes=args.probes,
+        seed=args.seed,
+    )
+    print_benchmark(direct, proxied, proxy, overhead, args.sessions, args.burst)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+HTTP Cassettes for Admin Dashboard API Tests
+Records every request/response the tester makes into a compact indexed file
+and replays it from a memory-mapped cassette with O(1) lookups
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from tests.dummyjson_server import HTTP_REASONS
+
+# File layout:
+#   MAGIC | body bytes ... | index JSON | <u64 index offset, u64 index length> | MAGIC
+MAGIC = b"DJCASS1\n"
+TRAILER = struct.Struct("<QQ")
+FORMAT_VERSION = 1
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Raised in replay mode when a request was never recorded"""
+
+
+def request_key(method, url, body):
+    """Origin-independent key: method + path/query + body hash
+
+    The origin is left out so a cassette recorded against one host (e.g. a
+    stand-in on a random port) replays against any base URL.
+    """
+    split = urlsplit(url)
+    target = split.path + (f"?{split.query}" if split.query else "")
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    body_hash = hashlib.sha1(body or b"").hexdigest()
+    return hashlib.sha1(f"{method.upper()}\n{target}\n{body_hash}".encode("utf-8")).hexdigest()
+
+
+class CassetteWriter:
+    """Append-only cassette writer; thread-safe, index written on close()"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = open(path, "wb")
+        self._fh.write(MAGIC)
+        self._offset = len(MAGIC)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def add(self, method, url, request_body, status, headers, body):
+        key = request_key(method, url, request_body)
+        with self._lock:
+            self._fh.write(body)
+            entry = [self._offset, len(body), status, list(headers.items()), method, url]
+            self._entries.setdefault(key, []).append(entry)
+            self._offset += len(body)
+
+    def close(self):
+        with self._lock:
+            if self._fh.closed:
+                return
+            index = json.dumps({"version": FORMAT_VERSION, "entries": self._entries}).encode("utf-8")
+            self._fh.write(index)
+            self._fh.write(TRAILER.pack(self._offset, len(index)))
+            self._fh.write(MAGIC)
+            self._fh.close()
+
+
+class Cassette:
+    """Memory-mapped cassette with O(1) lookup by request key
+
+    Repeated requests replay their recorded responses in order, and the last
+    one repeats once the recording is exhausted.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if self._map[:len(MAGIC)] != MAGIC or self._map[-len(MAGIC):] != MAGIC:
+            raise ValueError(f"{path} is not a cassette (or was not closed after recording)")
+        trailer_start = len(self._map) - len(MAGIC) - TRAILER.size
+        index_offset, index_length = TRAILER.unpack_from(self._map, trailer_start)
+        index = json.loads(self._map[index_offset:index_offset + index_length])
+        if index["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported cassette version {index['version']}")
+        self.entries = index["entries"]
+        self._cursors = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.entries.values())
+
+    def lookup(self, method, url, body):
+        """Return (status, headers, body memoryview) for a request, or None"""
+        key = request_key(method, url, body)
+        entries = self.entries.get(key)
+        if not entries:
+            return None
+        with self._lock:
+            position = self._cursors.get(key, 0)
+            self._cursors[key] = position + 1
+        offset, length, status, headers, _, _ = entries[min(position, len(entries) - 1)]
+        return status, headers, self._view[offset:offset + length]
+
+    def rewind(self):
+        with self._lock:
+            self._cursors.clear()
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+
+class RecordingAdapter:
+    """Wraps a real transport adapter and writes every exchange to a CassetteWriter"""
+
+    def __init__(self, adapter, writer):
+        self._adapter = adapter
+        self._writer = writer
+
+    def __getattr__(self, name):
+        return getattr(self._adapter, name)
+
+    def send(self, request, **kwargs):
+        response = self._adapter.send(request, **kwargs)
+        body = response.content
+        self._writer.add(request.method, request.url, request.body, response.status_code,
+                         response.headers, body)
+        return response
+
+    def close(self):
+        self._adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves responses straight from a Cassette; nothing touches the network"""
+
+    def __init__(self, cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        hit = self.cassette.lookup(request.method, request.url, request.body)
+        if hit is None:
+            raise CassetteMiss(f"No recorded response for {request.method} {request.url}", request=request)
+        status, headers, body = hit
+        response = requests.Response()
+        response.status_code = status
+        response.reason = HTTP_REASONS.get(status, "Unknown")
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        # requests needs bytes here; the cassette itself only hands out views
+        response._content = bytes(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def recording_transport(writer):
+    """SessionPool transport hook that records through `writer`"""
+    return lambda adapter: RecordingAdapter(adapter, writer)
+
+
+def replay_transport(cassette):
+    """SessionPool transport hook that replays from `cassette`"""
+    return lambda adapter: ReplayAdapter(cassette)
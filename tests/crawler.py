@@ -0,0 +1,159 @@
+"""
+Full-catalogue Pagination Crawler for Admin Dashboard API Tests
+Walks every page of /users and /products the way usersStore.fetchUsers and
+productsStore.fetchProducts do, sweeping page sizes to find the fastest one
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from tests.decoders import JsonDecoder, projection
+from tests.schemas import SCHEMA_SPECS, SCHEMAS, SchemaReport
+
+# resource -> (list path, key holding the records)
+CATALOG_RESOURCES = {
+    "users": ("/users", "users"),
+    "products": ("/products", "products"),
+}
+
+# resource -> schema every crawled record is validated against
+RESOURCE_SCHEMAS = {
+    "users": "user",
+    "products": "product",
+}
+
+# limit=0 asks DummyJSON for the whole collection; 10 and 12 are the store defaults
+DEFAULT_PAGE_SIZES = (0, 10, 12, 30, 50, 100, 200)
+
+
+class CrawlError(Exception):
+    """Raised when a page request fails or the catalogue comes back incomplete"""
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of walking one resource at one page size"""
+    resource: str
+    page_size: int
+    total: int = 0
+    records: int = 0
+    pages: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+    missing_ids: int = 0
+    page_latencies: list = field(default_factory=list)
+    schema: object = None  # SchemaReport when the crawler validates records
+
+    @property
+    def records_per_sec(self):
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_sec(self):
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def complete(self):
+        return self.records == self.total and not self.missing_ids
+
+
+class PaginationCrawler:
+    """Fetch every page of a resource, up to `concurrency` pages at a time"""
+
+    def __init__(self, http, base_url, concurrency=8, timeout=10, validate=True, cursor=False,
+                 decoder=None, project=False):
+        self.http = http
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.validate = validate
+        # Follow nextCursor page by page (synthetic stand-in) instead of fanning out skips
+        self.cursor = cursor
+        self.decoder = decoder or JsonDecoder()
+        # Only materialise the fields the schema validates (hides unexpected-field drift)
+        self.projections = {
+            key: projection(SCHEMA_SPECS[RESOURCE_SCHEMAS[resource]])
+            for resource, (_, key) in CATALOG_RESOURCES.items()
+        } if project else {}
+
+    def _fetch_page(self, path, key, limit, skip=None, cursor=None):
+        start = time.perf_counter()
+        position = f"cursor={cursor}" if cursor is not None else f"skip={skip}"
+        response = self.http.get(f"{self.base_url}{path}?limit={limit}&{position}", timeout=self.timeout)
+        if response.status_code != 200:
+            raise CrawlError(f"{path}?limit={limit}&{position} failed with status {response.status_code}")
+        data = self.decoder.page(response.content, key, self.projections.get(key))
+        if cursor is not None and "nextCursor" not in data:
+            raise CrawlError(f"{path} does not support cursor pagination")
+        page = (data[key], data["total"], len(response.content), time.perf_counter() - start)
+        return page if cursor is None else (page, data["nextCursor"])
+
+    def crawl(self, resource, page_size):
+        """Walk the whole resource using the reported `total` and return a CrawlResult"""
+        path, key = CATALOG_RESOURCES[resource]
+        result = CrawlResult(resource, page_size)
+        schema = SCHEMAS[RESOURCE_SCHEMAS[resource]] if self.validate else None
+        if schema:
+            result.schema = SchemaReport(schema.name)
+        seen = set()
+
+        def absorb(page):
+            records, total, size, latency = page
+            result.total = total
+            result.records += len(records)
+            result.pages += 1
+            result.bytes += size
+            result.page_latencies.append(latency)
+            seen.update(record["id"] for record in records)
+            if schema:
+                schema.validate_batch(records, result.schema)
+
+        start = time.perf_counter()
+        if self.cursor and page_size:
+            # Each page names the next, so cursor crawls are sequential
+            cursor = 0
+            while cursor is not None:
+                page, cursor = self._fetch_page(path, key, page_size, cursor=cursor)
+                absorb(page)
+        else:
+            absorb(self._fetch_page(path, key, page_size, 0))
+            if page_size:
+                skips = range(page_size, result.total, page_size)
+                with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="crawl") as pool:
+                    for page in pool.map(lambda skip: self._fetch_page(path, key, page_size, skip), skips):
+                        absorb(page)
+        result.elapsed = time.perf_counter() - start
+        result.missing_ids = max(0, result.total - len(seen))
+        return result
+
+    def sweep(self, resource, page_sizes=DEFAULT_PAGE_SIZES, repeats=1):
+        """Crawl once per page size (best of `repeats`) and return the results"""
+        results = []
+        for page_size in page_sizes:
+            runs = [self.crawl(resource, page_size) for _ in range(repeats)]
+            results.append(max(runs, key=lambda run: run.records_per_sec))
+        return results
+
+
+def best_page_size(results):
+    """The complete crawl with the highest records/sec, or None"""
+    complete = [result for result in results if result.complete]
+    return max(complete, key=lambda result: result.records_per_sec) if complete else None
+
+
+def print_sweep(resource, results):
+    print(f"\n=== Crawl Sweep: {resource} ===")
+    print(f"  {'limit':>6} {'pages':>6} {'records':>8} {'elapsed s':>10} {'rec/s':>10} {'KiB/s':>10}  complete")
+    for result in results:
+        print(f"  {result.page_size:>6} {result.pages:>6} {result.records:>8} {result.elapsed:>10.3f} "
+              f"{result.records_per_sec:>10.0f} {result.bytes_per_sec / 1024:>10.1f}  "
+              f"{'✅' if result.complete else '❌'}")
+    drift = next((result.schema for result in results if result.schema and result.schema.drift), None)
+    if drift:
+        print(f"  ⚠️  Schema drift in {drift.invalid}/{drift.records} records: {drift.describe()}")
+    best = best_page_size(results)
+    if best:
+        label = "full dump (limit=0)" if best.page_size == 0 else f"limit={best.page_size}"
+        print(f"  🏁 Optimal page size for {resource}: {label} at {best.records_per_sec:.0f} records/s")
+    return best
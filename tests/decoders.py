@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Pluggable JSON Decoders for Admin Dashboard API Tests
+stdlib json, orjson and msgspec when installed, and a streaming parser that
+yields list records one at a time, with schema-driven field projection and a
+throughput/peak-memory benchmark across payload sizes
+"""
+
+import argparse
+import codecs
+import gc
+import json
+import re
+import time
+import tracemalloc
+from typing import Any
+
+from tests.schemas import SCHEMA_SPECS, Optional
+
+try:
+    import orjson
+except ImportError:  # optional: the orjson decoder is only offered when installed
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional: the msgspec decoder is only offered when installed
+    msgspec = None
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# List envelope members besides the records (nextCursor comes from the synthetic stand-in)
+PAGE_SCALARS = ("total", "skip", "limit", "nextCursor")
+
+
+def projection(spec):
+    """Projection tree for a schema spec: the fields a validator reads, nested the same way"""
+    if isinstance(spec, Optional):
+        return projection(spec.spec)
+    if isinstance(spec, dict):
+        return {key: projection(value) for key, value in spec.items()}
+    if isinstance(spec, list):
+        return [projection(spec[0])]
+    return True
+
+
+def fields_projection(fields):
+    """Projection keeping only the given top-level fields, e.g. table columns"""
+    return dict.fromkeys(fields, True)
+
+
+def project(value, tree):
+    """Copy of `value` keeping only what `tree` names; anything of an unexpected shape is kept as is"""
+    if tree is True:
+        return value
+    if isinstance(tree, dict) and isinstance(value, dict):
+        return {key: project(value[key], sub) for key, sub in tree.items() if key in value}
+    if isinstance(tree, list) and isinstance(value, list):
+        return [project(item, tree[0]) for item in value]
+    return value
+
+
+class JsonDecoder:
+    """stdlib json; projection happens after the whole document is built"""
+    name = "json"
+
+    def decode(self, body):
+        return json.loads(body)
+
+    def page(self, body, key, tree=None):
+        """Decode a list envelope like {"products": [...], "total": ...}, projecting its records"""
+        data = self.decode(body)
+        if tree is not None and isinstance(data.get(key), list):
+            data[key] = [project(record, tree) for record in data[key]]
+        return data
+
+
+class OrjsonDecoder(JsonDecoder):
+    name = "orjson"
+
+    def decode(self, body):
+        return orjson.loads(body)
+
+
+class MsgspecDecoder(JsonDecoder):
+    """msgspec; with a projection only the projected fields are ever materialised
+
+    The projection is compiled into Struct types that ignore unknown keys,
+    with the envelope's PAGE_SCALARS declared next to the records so one
+    typed decode yields the whole page. A page whose shape does not fit those
+    types (schema drift) falls back to a plain decode so the validator still
+    sees and reports it.
+    """
+    name = "msgspec"
+
+    def __init__(self):
+        self._plain = msgspec.json.Decoder()
+        self._typed = {}
+
+    def decode(self, body):
+        return self._plain.decode(body)
+
+    def _struct(self, tree, name):
+        if tree is True:
+            return Any
+        if isinstance(tree, list):
+            return list[self._struct(tree[0], name)]
+        fields = [(key, self._struct(sub, f"{name}_{key}") | msgspec.UnsetType, msgspec.UNSET)
+                  for key, sub in tree.items()]
+        return msgspec.defstruct(name, fields, forbid_unknown_fields=False)
+
+    def page(self, body, key, tree=None):
+        if tree is None:
+            return self.decode(body)
+        cached = self._typed.get((key, id(tree)))
+        if cached is None:
+            scalars = [(name, Any | msgspec.UnsetType, msgspec.UNSET) for name in PAGE_SCALARS if name != key]
+            envelope = msgspec.defstruct("Page", [(key, list[self._struct(tree, "Record")])] + scalars,
+                                         forbid_unknown_fields=False)
+            # The tree is kept alongside so its id cannot be reused by another projection
+            cached = self._typed[(key, id(tree))] = (tree, msgspec.json.Decoder(envelope))
+        decoder = cached[1]
+        try:
+            # to_builtins leaves out UNSET fields, so absent scalars stay absent
+            return msgspec.to_builtins(decoder.decode(body))
+        except msgspec.ValidationError:
+            return super().page(body, key, tree)
+
+
+class StreamingPage:
+    """Iterates the records of one list envelope as they are parsed
+
+    `chunks` is any iterable of bytes (e.g. response.iter_content(65536)) or
+    a single bytes/str body. Only the unparsed tail of the input and the
+    current record are held; the envelope's other members end up in
+    `envelope` once iteration finishes. Each record is decoded whole and
+    then projected: skipping values in Python is slower than raw_decode.
+    """
+
+    def __init__(self, chunks, key, tree=None, trim_at=65536):
+        if isinstance(chunks, (bytes, bytearray, str)):
+            chunks = [chunks]
+        self.key = key
+        self.tree = tree
+        self.envelope = {}
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._trim_at = trim_at
+
+    def _more(self):
+        """Append the next chunk; False at end of input"""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            self._buf += self._utf8.decode(b"", final=True)
+            return False
+        if self._pos >= self._trim_at:
+            self._buf, self._pos = self._buf[self._pos:], 0
+        self._buf += chunk if isinstance(chunk, str) else self._utf8.decode(chunk)
+        return True
+
+    def _skip_ws(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._more():
+                return
+
+    def _expect(self, chars):
+        self._skip_ws()
+        if self._pos >= len(self._buf) or self._buf[self._pos] not in chars:
+            found = self._buf[self._pos:self._pos + 20] or "end of input"
+            raise ValueError(f"Expected one of {chars!r} at offset {self._pos}, found {found!r}")
+        self._pos += 1
+        return self._buf[self._pos - 1]
+
+    def _value(self):
+        """Decode one complete value, reading more input while it is cut off"""
+        self._skip_ws()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._more():
+                    continue
+                raise
+            # A number or literal that ends exactly at the buffer edge may continue in the next chunk
+            if end == len(self._buf) and self._more():
+                continue
+            self._pos = end
+            return value
+
+    def __iter__(self):
+        self._expect("{")
+        self._skip_ws()
+        if self._buf.startswith("}", self._pos):
+            self._pos += 1
+            return
+        while True:
+            name = self._value()
+            self._expect(":")
+            self._skip_ws()
+            if name == self.key and self._buf.startswith("[", self._pos):
+                self._pos += 1
+                self._skip_ws()
+                if self._buf.startswith("]", self._pos):
+                    self._pos += 1
+                else:
+                    while True:
+                        record = self._value()
+                        yield project(record, self.tree) if self.tree is not None else record
+                        if self._expect(",]") == "]":
+                            break
+            else:
+                self.envelope[name] = self._value()
+            if self._expect(",}") == "}":
+                return
+
+
+class StreamingDecoder(JsonDecoder):
+    """Iterative parser: records are decoded (then projected) one at a time"""
+    name = "stream"
+
+    def records(self, chunks, key, tree=None):
+        return StreamingPage(chunks, key, tree)
+
+    def page(self, body, key, tree=None):
+        stream = StreamingPage(body, key, tree)
+        records = list(stream)
+        stream.envelope[key] = records
+        return stream.envelope
+
+
+DECODERS = {"json": JsonDecoder, "stream": StreamingDecoder}
+if orjson is not None:
+    DECODERS["orjson"] = OrjsonDecoder
+if msgspec is not None:
+    DECODERS["msgspec"] = MsgspecDecoder
+
+
+def get_decoder(name="json"):
+    if name not in DECODERS:
+        raise ValueError(f"Decoder '{name}' is not available, expected one of: {', '.join(DECODERS)}")
+    return DECODERS[name]()
+
+
+def build_payload(resource, size, seed=0):
+    """A DummyJSON-style `limit=0` dump of `size` synthetic records, as bytes"""
+    from tests.synthetic import SyntheticCollection
+
+    collection = SyntheticCollection(resource, size, seed=seed)
+    records = [collection.record(record_id) for record_id in collection.ids[:size]]
+    return json.dumps({resource: records, "total": len(records), "skip": 0, "limit": len(records)}).encode()
+
+
+def _decode_once(decoder, body, key, tree, consume, chunk_size=65536):
+    if not hasattr(decoder, "records"):
+        return len(decoder.page(body, key, tree)[key])
+    # Fed in chunks the way response.iter_content() would deliver them
+    chunks = (body[offset:offset + chunk_size] for offset in range(0, len(body), chunk_size))
+    if consume:
+        # Stream and drop: what a validator that does not keep records pays
+        return sum(1 for _ in decoder.records(chunks, key, tree))
+    return len(decoder.page(chunks, key, tree)[key])
+
+
+def benchmark(sizes=(100, 1_000, 10_000), resource="products", decoders=None, tree=None, repeats=3, seed=0):
+    """[(size, payload bytes, decoder, mode, MB/s, records/s, peak KiB)] for every decoder and mode
+
+    Modes are full (whole document), projected (only `tree`'s fields kept)
+    and, for the streaming decoder, consume (projected records dropped as
+    soon as they are parsed). Peak memory is traced in a separate pass.
+    """
+    tree = projection(SCHEMA_SPECS["product" if resource == "products" else "user"]) if tree is None else tree
+    rows = []
+    for size in sizes:
+        body = build_payload(resource, size, seed)
+        for name in decoders or DECODERS:
+            decoder = get_decoder(name)
+            modes = [("full", None, False), ("projected", tree, False)]
+            if hasattr(decoder, "records"):
+                modes.append(("consume", tree, True))
+            for mode, mode_tree, consume in modes:
+                best = float("inf")
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    count = _decode_once(decoder, body, resource, mode_tree, consume)
+                    best = min(best, time.perf_counter() - start)
+                gc.collect()
+                tracemalloc.start()
+                result = _decode_once(decoder, body, resource, mode_tree, consume)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                del result
+                rows.append((size, len(body), name, mode, len(body) / best / 1e6, count / best, peak / 1024))
+    return rows
+
+
+def print_benchmark(rows):
+    print("\n" + "=" * 60)
+    print("🧾 JSON DECODE BENCHMARK")
+    print("=" * 60)
+    print(f"  {'records':>8} {'payload':>10} {'decoder':<8} {'mode':<10} {'MB/s':>8} {'records/s':>11} {'peak KiB':>10}")
+    for size, payload, name, mode, mb_s, records_s, peak in rows:
+        print(f"  {size:>8} {payload / 1024:>8.0f}Ki {name:<8} {mode:<10} {mb_s:>8.1f} {records_s:>11,.0f} "
+              f"{peak:>10,.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark JSON decoders on DummyJSON-style list dumps")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated record counts")
+    parser.add_argument("--resource", choices=["products", "users"], default="products")
+    parser.add_argument("--decoders", help=f"Comma-separated subset of: {', '.join(DECODERS)}")
+    parser.add_argument("--fields", help="Project only these top-level fields instead of the schema's")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+    tree = fields_projection(args.fields.split(",")) if args.fields else None
+    rows = benchmark(
+        sizes=[int(size) for size in args.sizes.split(",")],
+        resource=args.resource,
+        decoders=args.decoders.split(",") if args.decoders else None,
+        tree=tree,
+        repeats=args.repeats,
+    )
+    print_benchmark(rows)
+
+
+if __name__ == "__main__":
+    main()
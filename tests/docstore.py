@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+In-process Document Store for the /api/status Route
+A Mongo-compatible stand-in for the status_checks collection (insertOne,
+insertMany, find/sort/limit/projection, single-field indexes) used to
+benchmark the route's current insert and read paths against batched inserts
+and timestamp-indexed cursor pagination across collection sizes
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import time
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+from tests.latency import Histogram
+
+# Mongo splits insertMany into batches of at most this many documents
+MAX_WRITE_BATCH = 100_000
+# Documents in a find's first reply; the rest arrive via getMore
+FIRST_BATCH = 101
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+CLIENT_NAME = "load_client_admin_dashboard"
+
+
+def _to_ms(value):
+    return value.timestamp() * 1000 if isinstance(value, datetime) else float(value)
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"$date": round(value.timestamp() * 1000)}
+    raise TypeError(f"Cannot store {type(value).__name__}")
+
+
+def _decode(obj):
+    if len(obj) == 1 and "$date" in obj:
+        return datetime.fromtimestamp(obj["$date"] / 1000, timezone.utc)
+    return obj
+
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"), default=_encode)
+_DECODER = json.JSONDecoder(object_hook=_decode)
+
+
+def _matches(doc, query):
+    """Equality and $lt/$lte/$gt/$gte/$ne/$in per field; enough for the status route"""
+    for field, condition in query.items():
+        value = doc.get(field)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        for op, operand in condition.items():
+            if op == "$in":
+                ok = value in operand
+            elif op == "$ne":
+                ok = value != operand
+            elif value is None:
+                ok = False
+            elif op == "$lt":
+                ok = value < operand
+            elif op == "$lte":
+                ok = value <= operand
+            elif op == "$gt":
+                ok = value > operand
+            elif op == "$gte":
+                ok = value >= operand
+            else:
+                raise ValueError(f"Unsupported query operator {op}")
+            if not ok:
+                return False
+    return True
+
+
+def _project(doc, projection):
+    if not projection:
+        return doc
+    include = {field for field, flag in projection.items() if flag and field != "_id"}
+    if include:
+        keep = include | ({"_id"} if projection.get("_id", 1) else set())
+        return {field: value for field, value in doc.items() if field in keep}
+    return {field: value for field, value in doc.items() if field not in projection}
+
+
+class Index:
+    """Ascending index on one date or numeric field, ties broken by insertion order (i.e. _id)
+
+    Keys live in an array of floats aligned with document positions and
+    `order` lists positions in (key, position) order. Timestamps mostly
+    arrive in order, so maintenance is usually an append.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.keys = array("d")
+        self.order = array("Q")
+
+    def add(self, position, value):
+        key = _to_ms(value) if value is not None else -math.inf
+        self.keys.append(key)
+        if not self.order or key >= self.keys[self.order[-1]]:
+            self.order.append(position)
+        else:
+            at = bisect_right(self.order, key, key=self.keys.__getitem__)
+            self.order.insert(at, position)
+
+    def entry(self, slot):
+        position = self.order[slot]
+        return self.keys[position], position
+
+    def slot_after(self, bound):
+        """First slot whose (key, position) is greater than `bound`"""
+        key, position = bound
+        start = bisect_left(self.order, key, key=self.keys.__getitem__)
+        end = bisect_right(self.order, key, lo=start, key=self.keys.__getitem__)
+        return bisect_right(self.order, position, lo=start, hi=end)
+
+    def slot_before(self, bound):
+        """Slot just past the last entry less than `bound` (exclusive upper slice end)"""
+        key, position = bound
+        start = bisect_left(self.order, key, key=self.keys.__getitem__)
+        end = bisect_right(self.order, key, lo=start, key=self.keys.__getitem__)
+        return bisect_left(self.order, position, lo=start, hi=end)
+
+
+class Cursor:
+    """find() result: chain sort/limit/projection, then iterate
+
+    With a sort on an indexed field the cursor walks the index (IXSCAN) and
+    only decodes the documents it returns; otherwise it scans and decodes
+    the collection (COLLSCAN), keeping a top-k heap when sorting.
+    `max_key`/`min_key` are exclusive bounds on (index key, _id order) like
+    Mongo's min()/max(), and `last_key` is the bound to resume after.
+    """
+
+    def __init__(self, collection, query=None, projection=None):
+        self.collection = collection
+        self.query = query or {}
+        self.projection = projection
+        self._sort = None
+        self._limit = 0
+        self._min_key = self._max_key = None
+        self._hint = None
+        self.last_key = None
+        self.stats = {"plan": None, "docsExamined": 0, "keysExamined": 0, "returned": 0}
+
+    def sort(self, key, direction=1):
+        fields = [(key, direction)] if isinstance(key, str) else list(key)
+        primary = [(field, d) for field, d in fields if field != "_id"]
+        if len(primary) > 1:
+            raise ValueError("The stand-in sorts on one field plus _id")
+        self._sort = primary[0] if primary else ("_id", fields[0][1])
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def hint(self, index):
+        """"$natural" forces a collection scan, as in Mongo"""
+        self._hint = index
+        return self
+
+    def max_key(self, bound):
+        self._max_key = bound
+        return self
+
+    def min_key(self, bound):
+        self._min_key = bound
+        return self
+
+    def __iter__(self):
+        collection = self.collection
+        collection.round_trips += 1
+        stats = self.stats
+        index = collection.indexes.get(self._sort[0]) if self._sort and self._hint != "$natural" else None
+        if self._sort and self._sort[0] == "_id":
+            rows = self._walk(range(len(collection)), self._sort[1], key=lambda p: (p, p))
+        elif index is not None:
+            rows = self._walk_index(index, self._sort[1])
+        elif self._sort:
+            rows = self._top_k()
+        else:
+            rows = self._walk(range(len(collection)), 1, key=None)
+        returned = 0
+        for key, doc in rows:
+            returned += 1
+            if returned == FIRST_BATCH + 1:
+                collection.round_trips += 1  # getMore
+            self.last_key = key
+            yield _project(doc, self.projection)
+            if returned == self._limit:
+                break
+        stats["returned"] = returned
+
+    def _walk(self, positions, direction, key):
+        self.stats["plan"] = "COLLSCAN"
+        ordered = positions if direction > 0 else reversed(positions)
+        for position in ordered:
+            doc = self.collection.document(position)
+            self.stats["docsExamined"] += 1
+            if _matches(doc, self.query):
+                yield (key(position) if key else None), doc
+
+    def _walk_index(self, index, direction):
+        self.stats["plan"] = "IXSCAN"
+        lo = index.slot_after(self._min_key) if self._min_key else 0
+        hi = index.slot_before(self._max_key) if self._max_key else len(index.order)
+        slots = range(lo, hi) if direction > 0 else range(hi - 1, lo - 1, -1)
+        for slot in slots:
+            self.stats["keysExamined"] += 1
+            key = index.entry(slot)
+            doc = self.collection.document(key[1])
+            self.stats["docsExamined"] += 1
+            if _matches(doc, self.query):
+                yield key, doc
+
+    def _top_k(self):
+        """Blocking in-memory sort: every document is decoded to find the top `limit`"""
+        self.stats["plan"] = "COLLSCAN+SORT"
+        field, direction = self._sort
+        candidates = (
+            ((_to_ms(doc.get(field)), position), doc)
+            for position, doc in ((p, self.collection.document(p)) for p in range(len(self.collection)))
+            if _matches(doc, self.query)
+        )
+        self.stats["docsExamined"] = len(self.collection)
+        pick = heapq.nsmallest if direction > 0 else heapq.nlargest
+        limit = self._limit or len(self.collection)
+        return iter(pick(limit, candidates, key=lambda row: row[0]))
+
+    def to_list(self):
+        return list(self)
+
+    def explain(self):
+        return dict(self.stats)
+
+
+class Collection:
+    """Documents as extended-JSON bytes in one append-only buffer, plus optional indexes
+
+    Every public call counts the round trips a real driver would make, so
+    benchmarks can add a modelled network cost to the measured CPU time.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._data = bytearray()
+        self._offsets = array("Q", [0])
+        self.indexes = {}
+        self.round_trips = 0
+        self._process = int.from_bytes(os.urandom(5), "big")
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def _object_id(self, position):
+        # Counter = position, so _id order is insertion order (as with a single writer)
+        return f"{int(time.time()):08x}{self._process:010x}{position & 0xFFFFFF:06x}"
+
+    def _append(self, doc):
+        position = len(self)
+        doc = {"_id": self._object_id(position), **doc}
+        self._data += _ENCODER.encode(doc).encode()
+        self._offsets.append(len(self._data))
+        for field, index in self.indexes.items():
+            index.add(position, doc.get(field))
+        return doc["_id"]
+
+    def document(self, position):
+        return _DECODER.decode(self._data[self._offsets[position]:self._offsets[position + 1]].decode())
+
+    def insert_one(self, doc):
+        self.round_trips += 1
+        return self._append(doc)
+
+    def insert_many(self, docs):
+        docs = list(docs)
+        self.round_trips += max(1, -(-len(docs) // MAX_WRITE_BATCH))
+        return [self._append(doc) for doc in docs]
+
+    def create_index(self, field):
+        self.round_trips += 1
+        if field not in self.indexes:
+            index = Index(field)
+            for position in range(len(self)):
+                index.add(position, self.document(position).get(field))
+            self.indexes[field] = index
+        return f"{field}_1"
+
+    def find(self, query=None, projection=None):
+        return Cursor(self, query, projection)
+
+    def count_documents(self, query):
+        self.round_trips += 1
+        if not query:
+            return len(self)
+        return sum(1 for p in range(len(self)) if _matches(self.document(p), query))
+
+
+class Database:
+    def __init__(self):
+        self.collections = {}
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = Collection(name)
+        return self.collections[name]
+
+    collection = __getitem__
+
+
+def status_document(client_name=CLIENT_NAME, timestamp=None):
+    return {"id": str(uuid.uuid4()), "client_name": client_name,
+            "timestamp": timestamp or datetime.now(timezone.utc)}
+
+
+class StatusRoutes:
+    """The /api/status handlers, as they are today and as proposed"""
+
+    def __init__(self, db, batch_size=500, max_delay=0.05):
+        self.checks = db["status_checks"]
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._pending = []
+        self._oldest = None
+
+    # -- current route -----------------------------------------------------
+
+    def create(self, body):
+        """insertOne per request"""
+        status = status_document(body["client_name"])
+        self.checks.insert_one(status)
+        return status
+
+    def list_all(self):
+        """find({}).limit(1000), then copy every document to drop _id
+
+        With no sort this returns the 1000 *oldest* checks in natural order,
+        so new checks stop appearing once the collection passes 1000.
+        """
+        docs = self.checks.find({}).limit(1000).to_list()
+        return [{k: v for k, v in doc.items() if k != "_id"} for doc in docs]
+
+    # -- proposed route ----------------------------------------------------
+
+    def create_batched(self, body):
+        """Answer at once and write behind in insertMany batches
+
+        A check is lost if the process dies before its batch is flushed;
+        `max_delay` bounds that window (and how stale a read can be).
+        """
+        status = status_document(body["client_name"])
+        self._pending.append(status)
+        now = time.monotonic()
+        if self._oldest is None:
+            self._oldest = now
+        if len(self._pending) >= self.batch_size or now - self._oldest >= self.max_delay:
+            self.flush()
+        return status
+
+    def flush(self):
+        if self._pending:
+            self.checks.insert_many(self._pending)
+            self._pending = []
+        self._oldest = None
+
+    def list_page(self, cursor=None, limit=100):
+        """Newest first through the timestamp index, _id projected out server-side
+
+        `cursor` is the opaque nextCursor of the previous page.
+        """
+        query = self.checks.find({}, {"_id": 0}).sort([("timestamp", -1), ("_id", -1)]).limit(limit)
+        if cursor:
+            key, position = cursor.split(":")
+            query.max_key((float(key), int(position)))
+        docs = query.to_list()
+        last = query.last_key
+        next_cursor = f"{last[0]!r}:{last[1]}" if last is not None and len(docs) == limit else None
+        return {"items": docs, "nextCursor": next_cursor}
+
+
+# -- benchmark ----------------------------------------------------------------
+
+def prefill(collection, size, start=None, interval_ms=50.0, chunk=50_000):
+    """Bulk-load `size` status checks spaced `interval_ms` apart, ending now"""
+    start = start or time.time() - size * interval_ms / 1000
+    written = len(collection)
+    while written < size:
+        n = min(chunk, size - written)
+        collection.insert_many(
+            status_document(timestamp=datetime.fromtimestamp(start + (written + i) * interval_ms / 1000, timezone.utc))
+            for i in range(n)
+        )
+        written += n
+
+
+def _time_inserts(routes, create, count):
+    trips = routes.checks.round_trips
+    start = time.perf_counter()
+    for _ in range(count):
+        create({"client_name": CLIENT_NAME})
+    routes.flush()
+    return time.perf_counter() - start, routes.checks.round_trips - trips
+
+
+def _time_reads(checks, read, repeats):
+    hist = Histogram()
+    trips = checks.round_trips
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = read()
+        body = json.dumps(result, default=str)  # the route serialises what it read
+        hist.record((time.perf_counter() - start) * 1_000_000)
+    docs = len(result["items"] if isinstance(result, dict) else result)
+    return hist, (checks.round_trips - trips) / repeats, len(body), docs
+
+
+def benchmark(sizes=DEFAULT_SIZES, inserts=5_000, batch_size=500, repeats=20, deep_pages=20, page_size=100,
+              max_scan=2_000_000, rtt_ms=0.5):
+    """Per collection size: insert throughput (insertOne vs insertMany batches) and read latency
+
+    Measured times are in-process CPU; `rtt_ms` × round trips is added as a
+    modelled network cost. Reads are compared at equal result sizes: the
+    current 1000-document read against unindexed and indexed newest-first
+    reads of 1000, then indexed `page_size` pages. Unindexed sorted reads
+    are skipped above `max_scan` documents.
+    """
+    rows = []
+    db = Database()
+    checks = db["status_checks"]
+    checks.create_index("timestamp")
+    routes = StatusRoutes(db, batch_size=batch_size)
+    for size in sorted(sizes):
+        build = time.perf_counter()
+        prefill(checks, size)
+        build = time.perf_counter() - build
+        row = {"size": len(checks), "build_s": build, "inserts": {}, "reads": {}}
+        for name, create in (("insertOne", routes.create), (f"insertMany×{batch_size}", routes.create_batched)):
+            elapsed, trips = _time_inserts(routes, create, inserts)
+            row["inserts"][name] = (inserts / elapsed, inserts / (elapsed + trips * rtt_ms / 1000), trips)
+
+        reads = [("current find().limit(1000)", routes.list_all)]
+        if len(checks) <= max_scan:
+            reads.append(("sort(ts).limit(1000), no index",
+                          lambda: checks.find({}, {"_id": 0}).sort("timestamp", -1).hint("$natural").limit(1000).to_list()))
+        reads.append(("indexed cursor, limit 1000", lambda: routes.list_page(limit=1000)))
+        reads.append((f"indexed cursor, limit {page_size}", lambda: routes.list_page(limit=page_size)))
+        cursor = None
+        for _ in range(deep_pages - 1):
+            cursor = routes.list_page(cursor, page_size)["nextCursor"]
+        reads.append((f"indexed cursor, limit {page_size}, page {deep_pages}",
+                      lambda: routes.list_page(cursor, page_size)))
+        for name, read in reads:
+            slow = "no index" in name
+            hist, trips, body, docs = _time_reads(checks, read, max(1, repeats // 10) if slow else repeats)
+            p50, p99 = hist.percentile(50) / 1000, hist.percentile(99) / 1000
+            row["reads"][name] = (p50, p99, p50 + trips * rtt_ms, trips, body, docs)
+        rows.append(row)
+    return rows
+
+
+def print_benchmark(rows, rtt_ms):
+    print("\n" + "=" * 60)
+    print(f"🍃 STATUS_CHECKS BENCHMARK (modelled RTT {rtt_ms:g} ms)")
+    print("=" * 60)
+    for row in rows:
+        print(f"\n  {row['size']:,} documents (bulk-loaded in {row['build_s']:.1f}s)")
+        print(f"    {'insert path':<38} {'docs/s':>12} {f'docs/s @RTT':>13} {'round trips':>12}")
+        for name, (rate, modelled, trips) in row["inserts"].items():
+            print(f"    {name:<38} {rate:>12,.0f} {modelled:>13,.0f} {trips:>12,}")
+        print(f"    {'read path':<38} {'docs':>6} {'p50 ms':>9} {'p99 ms':>9} {'p50 @RTT':>9} {'body KiB':>9}")
+        for name, (p50, p99, modelled, trips, body, docs) in row["reads"].items():
+            print(f"    {name:<38} {docs:>6} {p50:>9.2f} {p99:>9.2f} {modelled:>9.2f} {body / 1024:>9.0f}")
+    print("\n  insertOne and insertMany measure the same in-process CPU per document (docs/s); the\n"
+          "  batching win comes only from the modelled RTT × round trips (docs/s @RTT).\n"
+          "  The current read returns the 1000 oldest checks (no sort), so its cost stays flat while its\n"
+          "  answer goes stale; sorting newest-first without an index decodes every document.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark /api/status insert and read paths on a Mongo stand-in")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated collection sizes, e.g. 10000,100000,1000000,10000000")
+    parser.add_argument("--inserts", type=int, default=5_000, help="Inserts timed per path and size")
+    parser.add_argument("--batch-size", type=int, default=500, help="insertMany batch size for batched ingestion")
+    parser.add_argument("--repeats", type=int, default=20, help="Reads timed per path and size")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--deep-page", type=int, default=20, help="Page number timed for deep cursor reads")
+    parser.add_argument("--max-scan", type=int, default=2_000_000,
+                        help="Skip unindexed sorted reads above this many documents")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Modelled client-server round trip")
+    args = parser.parse_args(argv)
+    rows = benchmark(
+        sizes=[int(size) for size in args.sizes.split(",")],
+        inserts=args.inserts,
+        batch_size=args.batch_size,
+        repeats=args.repeats,
+        deep_pages=args.deep_page,
+        page_size=args.page_size,
+        max_scan=args.max_scan,
+        rtt_ms=args.rtt_ms,
+    )
+    print_benchmark(rows, args.rtt_ms)
+
+
+if __name__ == "__main__":
+    main()
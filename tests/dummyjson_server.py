@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Local DummyJSON Stand-in Server for Admin Dashboard API Tests
+Serves fixture-backed copies of the DummyJSON endpoints and the internal
+/api routes with configurable per-route latency, jitter and error injection
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import multiprocessing
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# DummyJSON refresh tokens outlive access tokens by a wide margin
+REFRESH_TOKEN_MINUTES = 30 * 24 * 60
+
+# (route name, method, path pattern, endpoint template)
+ROUTES = [
+    ("auth_login", "POST", re.compile(r"^/auth/login$"), "/auth/login"),
+    ("auth_refresh", "POST", re.compile(r"^/auth/refresh$"), "/auth/refresh"),
+    ("users_search", "GET", re.compile(r"^/users/search$"), "/users/search"),
+    ("users_get", "GET", re.compile(r"^/users/(?P<id>[^/]+)$"), "/users/{id}"),
+    ("users_list", "GET", re.compile(r"^/users$"), "/users"),
+    ("products_search", "GET", re.compile(r"^/products/search$"), "/products/search"),
+    ("products_categories", "GET", re.compile(r"^/products/categories$"), "/products/categories"),
+    ("products_category", "GET", re.compile(r"^/products/category/(?P<slug>[^/]+)$"), "/products/category/{slug}"),
+    ("products_get", "GET", re.compile(r"^/products/(?P<id>[^/]+)$"), "/products/{id}"),
+    ("products_list", "GET", re.compile(r"^/products$"), "/products"),
+    ("api_root", "GET", re.compile(r"^/api/?(root)?$"), "/api/root"),
+    ("api_status_create", "POST", re.compile(r"^/api/status$"), "/api/status"),
+    ("api_status_list", "GET", re.compile(r"^/api/status$"), "/api/status"),
+]
+
+ROUTE_NAMES = [name for name, _, _, _ in ROUTES]
+
+HTTP_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+
+
+@dataclass(frozen=True)
+class RouteProfile:
+    """Latency and failure behaviour injected into a single route"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    # Requests in flight on the route before it answers 429 (0 = unlimited)
+    capacity: int = 0
+    retry_after_s: float = 1.0
+
+    def delay_seconds(self, rng, inflight=0):
+        """Draw one response delay, never negative
+
+        With a capacity the delay inflates linearly with in-flight requests,
+        the way a saturating backend queues work.
+        """
+        jitter = rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        load_factor = 1.0 + inflight / self.capacity if self.capacity else 1.0
+        return max(0.0, self.latency_ms * load_factor + jitter) / 1000.0
+
+    def overloaded(self, inflight):
+        return bool(self.capacity) and inflight >= self.capacity
+
+
+def match_route(method, path):
+    """Return (route name, path params) for a request, or (None, None)"""
+    for name, route_method, pattern, _ in ROUTES:
+        if route_method != method:
+            continue
+        match = pattern.match(path)
+        if match:
+            return name, match.groupdict()
+    return None, None
+
+
+def endpoint_template(method, path):
+    """Collapse a concrete request path into its endpoint template label"""
+    path = urlsplit(path).path
+    for name, route_method, pattern, template in ROUTES:
+        if route_method == method and pattern.match(path):
+            return f"{method} {template}"
+    return f"{method} {path}"
+
+
+def entity_tag(body):
+    """Weak ETag in the W/"<length hex>-<sha1 base64>" format Express (and so DummyJSON) sends"""
+    digest = base64.b64encode(hashlib.sha1(body).digest()).decode("ascii")[:27]
+    return f'W/"{len(body):x}-{digest}"'
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def issue_token(user_id, minutes):
+    """Unsigned JWT-shaped token carrying `id`, `iat` and `exp` like DummyJSON's
+
+    Like DummyJSON's there is no `jti`, so two tokens issued for the same user
+    and lifetime within one second are identical.
+    """
+    now = int(time.time())
+    header = _b64url(json.dumps({"alg": "none", "typ": "JWT"}).encode("utf-8"))
+    claims = {"id": user_id, "iat": now, "exp": now + minutes * 60}
+    return f"{header}.{_b64url(json.dumps(claims).encode('utf-8'))}."
+
+
+def _load_fixture(name):
+    with open(FIXTURES_DIR / f"{name}.json", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+class DummyJSONStandIn:
+    """In-memory implementation of the DummyJSON and internal API routes"""
+
+    def __init__(self, users=None, products=None, categories=None):
+        self.users = users if users is not None else _load_fixture("users")
+        self.products = products if products is not None else _load_fixture("products")
+        self.categories = categories if categories is not None else _load_fixture("categories")
+        self.users_by_id = {str(user["id"]): user for user in self.users}
+        self.products_by_id = {str(product["id"]): product for product in self.products}
+        self.status_checks = []
+        # refresh token -> (user id, expiry epoch seconds)
+        self.refresh_tokens = {}
+
+    @staticmethod
+    def _page(items, query, key):
+        limit = int(query.get("limit", 30))
+        skip = int(query.get("skip", 0))
+        page = items[skip:] if limit == 0 else items[skip:skip + limit]
+        return {key: page, "total": len(items), "skip": skip, "limit": len(page)}
+
+    @staticmethod
+    def _public_user(user):
+        return {k: v for k, v in user.items() if k != "password"}
+
+    def _token_pair(self, user_id, minutes):
+        refresh_token = issue_token(user_id, REFRESH_TOKEN_MINUTES)
+        self.refresh_tokens[refresh_token] = (user_id, time.time() + REFRESH_TOKEN_MINUTES * 60)
+        return {"accessToken": issue_token(user_id, minutes), "refreshToken": refresh_token}
+
+    def handle(self, route, params, query, body):
+        """Dispatch a matched route and return (status, payload)"""
+        if route == "auth_login":
+            username = body.get("username")
+            password = body.get("password")
+            for user in self.users:
+                if user["username"] == username and user["password"] == password:
+                    minutes = int(body.get("expiresInMins", 60))
+                    payload = {k: user[k] for k in ("id", "username", "email", "firstName", "lastName", "gender", "image")}
+                    payload.update(self._token_pair(user["id"], minutes))
+                    return 200, payload
+            return 400, {"message": "Invalid credentials"}
+
+        if route == "auth_refresh":
+            # Refresh tokens are single use: a refresh rotates the pair
+            user_id, expires_at = self.refresh_tokens.pop(body.get("refreshToken"), (None, 0))
+            if user_id is None or expires_at < time.time():
+                return 401, {"message": "Invalid refresh token"}
+            return 200, self._token_pair(user_id, int(body.get("expiresInMins", 60)))
+
+        if route in ("users_list", "users_search"):
+            users = self.users
+            if route == "users_search":
+                q = query.get("q", "").lower()
+                users = [
+                    u for u in users
+                    if any(q in str(u[f]).lower() for f in ("firstName", "lastName", "maidenName", "username", "email"))
+                ]
+            page = self._page(users, query, "users")
+            page["users"] = [self._public_user(u) for u in page["users"]]
+            return 200, page
+
+        if route == "users_get":
+            user = self.users_by_id.get(params["id"])
+            if user is None:
+                return 404, {"message": f"User with id '{params['id']}' not found"}
+            return 200, self._public_user(user)
+
+        if route in ("products_list", "products_search", "products_category"):
+            products = self.products
+            if route == "products_search":
+                q = query.get("q", "").lower()
+                products = [p for p in products if q in p["title"].lower() or q in p["description"].lower()]
+            elif route == "products_category":
+                slug = unquote(params["slug"])
+                products = [p for p in products if p["category"] == slug]
+            return 200, self._page(products, query, "products")
+
+        if route == "products_categories":
+            return 200, self.categories
+
+        if route == "products_get":
+            product = self.products_by_id.get(params["id"])
+            if product is None:
+                return 404, {"message": f"Product with id '{params['id']}' not found"}
+            return 200, product
+
+        if route == "api_root":
+            return 200, {"message": "Hello World"}
+
+        if route == "api_status_create":
+            if not body.get("client_name"):
+                return 400, {"error": "client_name is required"}
+            status_obj = {
+                "id": str(uuid.uuid4()),
+                "client_name": body["client_name"],
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+            self.status_checks.append(status_obj)
+            return 200, status_obj
+
+        if route == "api_status_list":
+            return 200, self.status_checks[:1000]
+
+        return 404, {"error": f"Route {route} not found"}
+
+
+class StandInServer:
+    """Asyncio HTTP/1.1 keep-alive server wrapping a DummyJSONStandIn"""
+
+    def __init__(self, host="127.0.0.1", port=0, default_profile=None, route_profiles=None,
+                 seed=None, app=None):
+        self.host = host
+        self.port = port
+        self.default_profile = default_profile or RouteProfile()
+        self.route_profiles = dict(route_profiles or {})
+        self.rng = random.Random(seed)
+        self.app = app or DummyJSONStandIn()
+        self.request_count = 0
+        self.throttled_count = 0
+        self._inflight = {}
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def profile_for(self, route):
+        return self.route_profiles.get(route, self.default_profile)
+
+    async def _read_request(self, reader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        body = await reader.readexactly(length) if length else b""
+        return method, target, version, headers, body
+
+    async def _respond(self, writer, status, payload, keep_alive, extra_headers=None, if_none_match=None):
+        """`if_none_match` is the request's header for GETs ("" if absent) and None otherwise"""
+        body = json.dumps(payload).encode("utf-8")
+        extra_headers = dict(extra_headers or {})
+        if if_none_match is not None and status == 200:
+            etag = extra_headers["ETag"] = entity_tag(body)
+            if if_none_match == "*" or etag in (tag.strip() for tag in if_none_match.split(",")):
+                status, body = 304, b""
+        lines = [
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'Unknown')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        for key, value in extra_headers.items():
+            lines.append(f"{key}: {value}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    method, target, version, headers, raw_body = await self._read_request(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except (asyncio.LimitOverrunError, ValueError):
+                    # A malformed request line or header, or a head past the stream limit: the rest is unframed
+                    await self._respond(writer, 400, {"message": "Malformed request"}, keep_alive=False)
+                    break
+                self.request_count += 1
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                status, payload, extra = self._dispatch(method, target, raw_body)
+                route = extra.pop("_route", None)
+                if route:
+                    inflight = self._inflight.get(route, 0)
+                    self._inflight[route] = inflight + 1
+                try:
+                    delay = self.profile_for(route).delay_seconds(self.rng, inflight) if route else 0.0
+                    if delay:
+                        await asyncio.sleep(delay)
+                    conditional = headers.get("if-none-match", "") if method == "GET" else None
+                    await self._respond(writer, status, payload, keep_alive, extra, conditional)
+                finally:
+                    if route:
+                        self._inflight[route] -= 1
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, method, target, raw_body):
+        split = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(split.query).items()}
+        route, params = match_route(method, split.path)
+        if route is None:
+            return 404, {"message": f"Route {method} {split.path} not found"}, {}
+        profile = self.profile_for(route)
+        if profile.overloaded(self._inflight.get(route, 0)):
+            # Shed load immediately: no delay and not counted as in flight
+            self.throttled_count += 1
+            retry_after = f"{profile.retry_after_s:g}"
+            return 429, {"message": "Too many requests"}, {"Retry-After": retry_after}
+        if profile.error_rate and self.rng.random() < profile.error_rate:
+            return profile.error_status, {"message": "Injected failure"}, {"_route": route}
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            return 400, {"message": "Invalid JSON body"}, {"_route": route}
+        if not isinstance(body, dict):
+            return 400, {"message": "JSON body must be an object"}, {"_route": route}
+        try:
+            status, payload = self.app.handle(route, params, query, body)
+        except ValueError as e:
+            status, payload = 400, {"message": str(e)}
+        return status, payload, {"_route": route}
+
+    async def serve(self):
+        """Bind the listening socket and serve until cancelled"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self):
+        """Run the server on a background thread and return its base URL"""
+        def runner():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.serve())
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=runner, name="dummyjson-standin", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self.base_url
+
+    def stop(self):
+        """Stop a server started with start()"""
+        if self._loop and self._server:
+            def shutdown():
+                self._server.close()
+                for task in asyncio.all_tasks(self._loop):
+                    task.cancel()
+            self._loop.call_soon_threadsafe(shutdown)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def parse_route_profiles(specs, default_profile):
+    """Parse ``route:key=value,key=value`` overrides into RouteProfile objects"""
+    keys = {
+        "latency": ("latency_ms", float),
+        "jitter": ("jitter_ms", float),
+        "error_rate": ("error_rate", float),
+        "error_status": ("error_status", int),
+        "capacity": ("capacity", int),
+        "retry_after": ("retry_after_s", float),
+    }
+    profiles = {}
+    for spec in specs or []:
+        route, _, options = spec.partition(":")
+        if route not in ROUTE_NAMES:
+            raise ValueError(f"Unknown route '{route}', expected one of: {', '.join(ROUTE_NAMES)}")
+        changes = {}
+        for option in filter(None, options.split(",")):
+            key, _, value = option.partition("=")
+            if key not in keys:
+                raise ValueError(f"Unknown route option '{key}' in '{spec}'")
+            field, cast = keys[key]
+            changes[field] = cast(value)
+        profiles[route] = replace(profiles.get(route, default_profile), **changes)
+    return profiles
+
+
+def add_profile_arguments(parser):
+    """Register the latency/error injection flags shared by the server and tester CLIs"""
+    parser.add_argument("--latency", type=float, default=0.0, help="Base latency per response in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses replaced by errors")
+    parser.add_argument("--error-status", type=int, default=500, help="Status code for injected errors")
+    parser.add_argument("--capacity", type=int, default=0,
+                        help="In-flight requests per route before answering 429 (0 = unlimited); "
+                             "latency also inflates with load")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--route", action="append", metavar="NAME:key=value,...",
+                        help="Per-route override, e.g. users_list:latency=50,error_rate=0.1,capacity=8")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for jitter and error injection")
+
+
+def server_from_args(args, host="127.0.0.1", port=0, app=None):
+    """Build a StandInServer from parsed add_profile_arguments() flags"""
+    default_profile = RouteProfile(args.latency, args.jitter, args.error_rate, args.error_status,
+                                   args.capacity, args.retry_after)
+    return StandInServer(
+        host=host,
+        port=port,
+        default_profile=default_profile,
+        route_profiles=parse_route_profiles(args.route, default_profile),
+        seed=args.seed,
+        app=app,
+    )
+
+
+def _serve_in_child(args, synthetic, host, conn):
+    app = None
+    if synthetic:
+        from tests.synthetic import SyntheticStandIn  # tests.synthetic imports this module
+        app = SyntheticStandIn(users=synthetic, products=synthetic, seed=args.seed or 0)
+    server = server_from_args(args, host=host, app=app)
+    conn.send(server.start())
+    try:
+        conn.recv()  # until the parent asks us to stop
+    except EOFError:
+        pass
+    server.stop()
+
+
+class StandInProcess:
+    """A server_from_args() stand-in running in a child process
+
+    Keeps the stand-in's own state (status checks, refresh tokens) out of the
+    caller's RSS and tracemalloc numbers; `pid` lets the caller sample the
+    stand-in's memory on its own.
+    """
+
+    def __init__(self, args, synthetic=0, host="127.0.0.1"):
+        self.args = args
+        self.synthetic = synthetic
+        self.host = host
+        self.base_url = None
+        self._process = None
+        self._conn = None
+
+    @property
+    def pid(self):
+        return self._process.pid if self._process else None
+
+    def start(self):
+        """Start the child process and return the stand-in's base URL once it is listening"""
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve_in_child, name="dummyjson-standin", daemon=True,
+                                                args=(self.args, self.synthetic, self.host, child))
+        self._process.start()
+        child.close()
+        try:
+            self.base_url = self._conn.recv()
+        except EOFError:
+            raise RuntimeError(f"Stand-in process exited with status {self._process.exitcode}") from None
+        return self.base_url
+
+    def stop(self):
+        """Stop a process started with start()"""
+        if self._process is None:
+            return
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._conn.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local DummyJSON stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = server_from_args(args, args.host, args.port)
+    print(f"🧪 DummyJSON stand-in listening on http://{args.host}:{args.port}")
+    print(f"Routes: {', '.join(ROUTE_NAMES)}")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
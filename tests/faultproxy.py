@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Network Fault-injection Proxy for Admin Dashboard API Tests
+A local HTTP/1.1 reverse proxy that forwards to DummyJSON, the stand-in or the
+Next.js app and injects per-route delay distributions, jitter, bandwidth caps,
+mid-response stalls, connection resets and slow-loris responses
+"""
+
+import argparse
+import asyncio
+import random
+import socket
+import ssl
+import struct
+import threading
+from dataclasses import dataclass, field, replace
+from urllib.parse import urlsplit
+
+from tests.dummyjson_server import ROUTE_NAMES, match_route
+from tests.latency import Histogram, bucket_value
+
+ANY_ROUTE = "*"
+
+# End-to-end seconds a caller might be willing to wait, reported per scenario
+DEFAULT_BUDGETS = (1.0, 2.5, 5.0, 10.0)
+
+# Scenario with no faults injected: any failed check there is a real failure
+BASELINE_SCENARIO = "baseline"
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """Delay distribution in milliseconds
+
+    fixed:MS | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA |
+    exponential:MEAN | pareto:SCALE:ALPHA (heavy tail)
+    """
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec):
+        kind, *params = spec.split(":")
+        if not params:
+            kind, params = "fixed", [kind]
+        if kind not in ("fixed", "uniform", "normal", "lognormal", "exponential", "pareto"):
+            raise ValueError(f"Unknown delay distribution '{kind}'")
+        values = [float(p) for p in params] + [0.0]
+        return cls(kind, values[0], values[1])
+
+    def sample_ms(self, rng):
+        if self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(0.0, self.b) * self.a
+        elif self.kind == "exponential":
+            value = rng.expovariate(1.0 / self.a) if self.a else 0.0
+        elif self.kind == "pareto":
+            value = self.a * rng.paretovariate(self.b)
+        else:
+            value = self.a
+        return max(0.0, value)
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Faults injected into every request on a route"""
+    delay: Distribution = Distribution()
+    jitter_ms: float = 0.0
+    bandwidth_bps: int = 0  # response bytes per second, 0 = unlimited
+    reset_rate: float = 0.0
+    reset_after: int = 0  # response bytes forwarded before the reset
+    stall_rate: float = 0.0
+    stall_ms: float = 0.0
+    slowloris_rate: float = 0.0
+    trickle_bytes: int = 64
+    trickle_ms: float = 250.0
+
+
+@dataclass
+class FaultPlan:
+    """What happens to one request, drawn when its head arrives"""
+    delay_s: float = 0.0
+    bandwidth_bps: int = 0
+    reset_after: int = None
+    stall_s: float = 0.0
+    slowloris: bool = False
+    trickle_bytes: int = 64
+    trickle_s: float = 0.25
+    sent: int = 0
+    head_sent: bool = False
+
+
+class _Reset(Exception):
+    pass
+
+
+_OPTION_KEYS = {
+    "delay": ("delay", Distribution.parse),
+    "jitter": ("jitter_ms", float),
+    "bandwidth": ("bandwidth_bps", int),
+    "reset": ("reset_rate", float),
+    "reset_after": ("reset_after", int),
+    "stall": ("stall_rate", float),
+    "stall_ms": ("stall_ms", float),
+    "slowloris": ("slowloris_rate", float),
+    "trickle_bytes": ("trickle_bytes", int),
+    "trickle_ms": ("trickle_ms", float),
+}
+
+
+def parse_fault_specs(specs, base=None):
+    """Parse ``ROUTE:key=value,...`` specs (ROUTE is a stand-in route name or *) into profiles"""
+    base = base or FaultProfile()
+    profiles = {}
+    for spec in specs or []:
+        route, _, options = spec.partition(":")
+        if route != ANY_ROUTE and route not in ROUTE_NAMES:
+            raise ValueError(f"Unknown route '{route}', expected * or one of: {', '.join(ROUTE_NAMES)}")
+        changes = {}
+        for option in filter(None, options.split(",")):
+            key, _, value = option.partition("=")
+            if key not in _OPTION_KEYS:
+                raise ValueError(f"Unknown fault option '{key}' in '{spec}'")
+            name, cast = _OPTION_KEYS[key]
+            changes[name] = cast(value)
+        profiles[route] = replace(profiles.get(route, profiles.get(ANY_ROUTE, base)), **changes)
+    return profiles
+
+
+# Named scenarios applied to every route; see run_fault_scenarios in backend_test.py
+SCENARIOS = {
+    "baseline": [],
+    "slow-link": ["*:delay=lognormal:150:0.6,jitter=50"],
+    "heavy-tail": ["*:delay=pareto:20:1.2"],
+    "narrow-pipe": ["*:bandwidth=16000"],
+    "resets": ["*:reset=0.05"],
+    "mid-body-resets": ["*:reset=0.05,reset_after=200"],
+    "stalls": ["*:stall=0.1,stall_ms=4000"],
+    "slow-loris": ["*:slowloris=0.1,trickle_bytes=64,trickle_ms=250"],
+}
+
+
+class FaultProxy:
+    """Reverse proxy from a local port to `upstream`, injecting faults per route
+
+    Requests are parsed to find their route; responses are streamed back as
+    raw bytes with the request's FaultPlan applied. HTTPS upstreams are
+    spoken to over TLS while the proxy itself listens on plain HTTP.
+    """
+
+    def __init__(self, upstream, profiles=None, seed=None, host="127.0.0.1", port=0):
+        split = urlsplit(upstream)
+        self.upstream = upstream.rstrip("/")
+        self.upstream_host = split.hostname
+        self.upstream_tls = split.scheme == "https"
+        self.upstream_port = split.port or (443 if self.upstream_tls else 80)
+        self.upstream_netloc = split.netloc
+        self.profiles = dict(profiles or {})
+        self.rng = random.Random(seed)
+        self.host = host
+        self.port = port
+        self.stats = {"requests": 0, "delayed": 0, "resets": 0, "stalls": 0, "slowloris": 0, "throttled": 0}
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def profile_for(self, method, path):
+        route, _ = match_route(method, path)
+        return self.profiles.get(route) or self.profiles.get(ANY_ROUTE) or FaultProfile()
+
+    def plan_for(self, method, path):
+        profile = self.profile_for(method, path)
+        rng = self.rng
+        stats = self.stats
+        stats["requests"] += 1
+        plan = FaultPlan(trickle_bytes=profile.trickle_bytes, trickle_s=profile.trickle_ms / 1000.0,
+                         bandwidth_bps=profile.bandwidth_bps)
+        jitter = rng.uniform(-profile.jitter_ms, profile.jitter_ms) if profile.jitter_ms else 0.0
+        plan.delay_s = max(0.0, profile.delay.sample_ms(rng) + jitter) / 1000.0
+        if plan.delay_s:
+            stats["delayed"] += 1
+        if plan.bandwidth_bps:
+            stats["throttled"] += 1
+        if profile.reset_rate and rng.random() < profile.reset_rate:
+            plan.reset_after = profile.reset_after
+            stats["resets"] += 1
+        elif profile.slowloris_rate and rng.random() < profile.slowloris_rate:
+            plan.slowloris = True
+            stats["slowloris"] += 1
+        elif profile.stall_rate and rng.random() < profile.stall_rate:
+            plan.stall_s = profile.stall_ms / 1000.0
+            stats["stalls"] += 1
+        return plan
+
+    async def _read_request(self, reader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head[:-4].decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = []
+        length = 0
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            value = value.strip()
+            if key.lower() == "host":
+                value = self.upstream_netloc
+            elif key.lower() == "content-length":
+                length = int(value)
+            headers.append(f"{key}: {value}")
+        body = await reader.readexactly(length) if length else b""
+        raw = "\r\n".join([lines[0], *headers]).encode("latin-1") + b"\r\n\r\n" + body
+        return method, target, raw
+
+    async def _write(self, writer, data, plan):
+        """Forward response bytes under the plan's bandwidth cap, stall and slow-loris trickle"""
+        if plan.reset_after is not None:
+            room = plan.reset_after - plan.sent
+            if len(data) >= room:
+                writer.write(data[:room])
+                await writer.drain()
+                raise _Reset()
+        if not plan.head_sent:
+            end = data.find(b"\r\n\r\n")
+            if end >= 0 and (plan.slowloris or plan.stall_s):
+                # Headers go out at once; the body is what stalls or trickles
+                head, data = data[:end + 4], data[end + 4:]
+                writer.write(head)
+                await writer.drain()
+                plan.head_sent = True
+                plan.sent += len(head)
+                if plan.stall_s:
+                    await asyncio.sleep(plan.stall_s)
+            elif end >= 0:
+                plan.head_sent = True
+        if plan.slowloris and plan.head_sent:
+            step, pause = plan.trickle_bytes, plan.trickle_s
+        elif plan.bandwidth_bps:
+            step = max(1, plan.bandwidth_bps // 20)
+            pause = step / plan.bandwidth_bps
+        else:
+            writer.write(data)
+            await writer.drain()
+            plan.sent += len(data)
+            return
+        for offset in range(0, len(data), step):
+            piece = data[offset:offset + step]
+            writer.write(piece)
+            await writer.drain()
+            plan.sent += len(piece)
+            await asyncio.sleep(pause * len(piece) / step)
+
+    async def _pump(self, upstream_reader, writer, state):
+        try:
+            while True:
+                data = await upstream_reader.read(16384)
+                if not data:
+                    break
+                await self._write(writer, data, state["plan"])
+        except _Reset:
+            self._reset(writer)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if not writer.is_closing():
+                writer.close()
+
+    @staticmethod
+    def _reset(writer):
+        """Close with RST instead of FIN, like a peer that died"""
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        writer.transport.abort()
+
+    async def _handle_connection(self, reader, writer):
+        upstream_writer = pump = None
+        state = {"plan": FaultPlan()}
+        try:
+            while True:
+                try:
+                    method, target, raw = await self._read_request(reader)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+                    break
+                plan = self.plan_for(method, urlsplit(target).path)
+                if plan.delay_s:
+                    await asyncio.sleep(plan.delay_s)
+                if plan.reset_after == 0:
+                    self._reset(writer)
+                    break
+                if upstream_writer is None or pump.done():
+                    upstream_reader, upstream_writer = await asyncio.open_connection(
+                        self.upstream_host, self.upstream_port,
+                        ssl=ssl.create_default_context() if self.upstream_tls else None,
+                        server_hostname=self.upstream_host if self.upstream_tls else None,
+                    )
+                    pump = asyncio.ensure_future(self._pump(upstream_reader, writer, state))
+                state["plan"] = plan
+                upstream_writer.write(raw)
+                await upstream_writer.drain()
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass
+        finally:
+            if upstream_writer is not None:
+                upstream_writer.close()
+            if pump is not None:
+                pump.cancel()
+            if not writer.is_closing():
+                writer.close()
+
+    async def serve(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self):
+        """Run the proxy on a background thread and return its base URL"""
+        def runner():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.serve())
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=runner, name="fault-proxy", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self.base_url
+
+    def stop(self):
+        if self._loop and self._server:
+            def shutdown():
+                self._server.close()
+                for task in asyncio.all_tasks(self._loop):
+                    task.cancel()
+            self._loop.call_soon_threadsafe(shutdown)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def start_proxies(upstreams, profiles, seed=None):
+    """Start one FaultProxy per distinct upstream; returns {upstream: proxy}"""
+    proxies = {}
+    for upstream in dict.fromkeys(upstreams):
+        proxies[upstream] = FaultProxy(upstream, profiles, seed=seed)
+        proxies[upstream].start()
+    return proxies
+
+
+@dataclass(frozen=True)
+class ScenarioBudget:
+    """Limits one fault scenario must stay within for the run to pass
+
+    A request hit by an injected reset or stall may fail by design, so those
+    failures do not count against `max_error_rate`. A `p99_s` of None leaves
+    latency ungated.
+    """
+    max_error_rate: float = 0.0
+    p99_s: float = 5.0
+
+
+# What a healthy tester stays within under each scenario's faults
+SCENARIO_BUDGETS = {
+    "baseline": ScenarioBudget(p99_s=2.5),
+    "slow-link": ScenarioBudget(),  # lognormal delays, p99 under a second
+    "heavy-tail": ScenarioBudget(max_error_rate=0.05, p99_s=30.0),  # rare Pareto delays outlast any timeout
+    "narrow-pipe": ScenarioBudget(),
+    "resets": ScenarioBudget(p99_s=2.5),
+    "mid-body-resets": ScenarioBudget(p99_s=2.5),
+    "stalls": ScenarioBudget(p99_s=10.0),  # 4 s stalls
+    "slow-loris": ScenarioBudget(p99_s=None),  # trickle time grows with body size; see the >timeout column
+}
+
+
+def scenario_budget(name, max_error_rate=None, p99_s=None):
+    """SCENARIO_BUDGETS entry for `name`, with any limit given here overriding it"""
+    budget = SCENARIO_BUDGETS.get(name, ScenarioBudget())
+    if max_error_rate is not None:
+        budget = replace(budget, max_error_rate=max_error_rate)
+    if p99_s is not None:
+        budget = replace(budget, p99_s=p99_s)
+    return budget
+
+
+@dataclass
+class ScenarioResult:
+    """Every request's outcome under one fault scenario"""
+    name: str
+    latency: Histogram = field(default_factory=Histogram)  # microseconds, failures included
+    succeeded: Histogram = field(default_factory=Histogram)  # microseconds, successes only
+    errors: dict = field(default_factory=dict)
+    over_timeout: int = 0  # succeeded, but took longer than the per-read timeout
+    checks_failed: int = 0
+    checks_run: int = 0
+    injected: dict = field(default_factory=dict)
+
+    @property
+    def requests(self):
+        return self.latency.count
+
+    def within(self, budget_s):
+        """Share of requests that succeeded within `budget_s` seconds end to end"""
+        if not self.requests:
+            return 0.0
+        limit = budget_s * 1_000_000
+        return sum(n for key, n in self.succeeded.counts.items() if bucket_value(key) <= limit) / self.requests
+
+    @property
+    def unexplained_errors(self):
+        """Failed requests beyond those hit by an injected reset or stall"""
+        explained = self.injected.get("resets", 0) + self.injected.get("stalls", 0)
+        return max(0, sum(self.errors.values()) - explained)
+
+    def violations(self, budget):
+        """Reasons this scenario fails `budget`; empty when it passes"""
+        reasons = []
+        if self.name == BASELINE_SCENARIO and self.checks_failed:
+            reasons.append(f"{self.checks_failed} checks failed with no faults injected")
+        if not self.requests:
+            reasons.append("no requests completed")
+            return reasons
+        error_rate = self.unexplained_errors / self.requests
+        if error_rate > budget.max_error_rate:
+            reasons.append(f"{self.unexplained_errors} errors beyond injected faults "
+                           f"({error_rate * 100:.1f}% > {budget.max_error_rate * 100:g}%)")
+        p99 = self.latency.percentile(99) / 1_000_000
+        if budget.p99_s is not None and p99 > budget.p99_s:
+            reasons.append(f"p99 {p99:.2f}s > {budget.p99_s:g}s")
+        return reasons
+
+
+class ScenarioObserver:
+    """SessionPool observer collecting total time and outcome of every request"""
+
+    def __init__(self, result, timeout):
+        self.result = result
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def __call__(self, method, url, timing):
+        with self._lock:
+            self.result.latency.record(timing.total * 1_000_000)
+            if timing.error:
+                self.result.errors[timing.error] = self.result.errors.get(timing.error, 0) + 1
+                return
+            self.result.succeeded.record(timing.total * 1_000_000)
+            if timing.total > self.timeout:
+                self.result.over_timeout += 1
+
+
+def _describe(budget):
+    p99 = f"p99 ≤{budget.p99_s:g}s" if budget.p99_s is not None else "p99 ungated"
+    return f"errors beyond injected faults ≤{budget.max_error_rate * 100:g}%, {p99}"
+
+
+def print_scenarios(results, budgets, timeout, limits=None):
+    """Print the scenario table; `limits` maps scenario names to their ScenarioBudget"""
+    print("\n" + "=" * 60)
+    print("🌩️  FAULT SCENARIOS")
+    print("=" * 60)
+    budget_cols = "".join(f"{f'≤{b:g}s':>8}" for b in budgets)
+    print(f"  {'scenario':<16} {'reqs':>5} {'err':>4} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}{budget_cols}  "
+          f">{timeout:g}s ok")
+    for result in results:
+        lat = result.latency
+        cells = [f"{v / 1000:>9.1f}" if v is not None else f"{'-':>9}"
+                 for v in (lat.percentile(50), lat.percentile(99), lat.max)]
+        within = "".join(f"{result.within(b) * 100:>7.1f}%" for b in budgets)
+        print(f"  {result.name:<16} {result.requests:>5} {sum(result.errors.values()):>4} {' '.join(cells)}"
+              f"{within}  {result.over_timeout:>5}")
+    print()
+    for result in results:
+        injected = ", ".join(f"{n} {key}" for key, n in result.injected.items() if n and key != "requests")
+        errors = ", ".join(f"{name} ×{n}" for name, n in sorted(result.errors.items()))
+        print(f"  • {result.name}: {result.checks_failed}/{result.checks_run} checks failed"
+              f"{f'; injected {injected}' if injected else ''}{f'; errors {errors}' if errors else ''}")
+    print(f"\n  ≤Ns: share of requests that succeeded within N seconds end to end. "
+          f">{timeout:g}s ok: succeeded despite exceeding the {timeout:g}s timeout, "
+          f"which requests applies per socket read, not per request.")
+    if limits is None:
+        return
+    print()
+    for result in results:
+        reasons = result.violations(limits[result.name])
+        icon = "❌" if reasons else "✅"
+        print(f"  {icon} {result.name}: {'; '.join(reasons) if reasons else 'within budget'} "
+              f"({_describe(limits[result.name])})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a fault-injecting reverse proxy")
+    parser.add_argument("upstream", help="Origin to forward to, e.g. https://dummyjson.com")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--fault", action="append", metavar="ROUTE:key=value,...",
+                        help="Per-route faults, ROUTE is * or a stand-in route name")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), help="Apply a named scenario to every route")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    specs = (SCENARIOS[args.scenario] if args.scenario else []) + (args.fault or [])
+    proxy = FaultProxy(args.upstream, parse_fault_specs(specs), seed=args.seed, host=args.host, port=args.port)
+    print(f"🌩️  Fault proxy on http://{args.host}:{args.port} → {args.upstream}")
+    try:
+        asyncio.run(proxy.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
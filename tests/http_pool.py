@@ -0,0 +1,228 @@
+"""
+Pooled HTTP Sessions for Admin Dashboard API Tests
+One keep-alive requests.Session per base URL with tunable pool size,
+retry/backoff policy, connection reuse accounting and per-phase timings
+"""
+
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.retry import Retry
+
+from tests.latency import RequestTiming
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Timing of the request in flight on this thread, filled in by the connection hooks
+_current = threading.local()
+
+
+def origin_of(url):
+    """Return scheme://host[:port] for a URL"""
+    split = urlsplit(url)
+    return f"{split.scheme}://{split.netloc}"
+
+
+class ConnectionCounter:
+    """Thread-safe count of TCP connections opened for one origin"""
+
+    def __init__(self):
+        self.new_connections = 0
+        self._lock = threading.Lock()
+
+    def on_new_connection(self, connection):
+        with self._lock:
+            self.new_connections += 1
+
+
+def instrumented_connection_class(base_connection_cls, counter, tls):
+    """Connection class that counts connects and times DNS/TCP/TLS setup"""
+
+    class InstrumentedConnection(base_connection_cls):
+        def _new_conn(self):
+            timing = getattr(_current, "timing", None)
+            dns_host = self._dns_host
+            start = time.perf_counter()
+            try:
+                infos = socket.getaddrinfo(dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+            except OSError:
+                infos = None  # let urllib3 raise its own resolution error
+            resolved = time.perf_counter()
+            if infos:
+                # Connect to the address just resolved so DNS is not timed twice
+                self._dns_host = infos[0][4][0]
+            try:
+                sock = super()._new_conn()
+            finally:
+                self._dns_host = dns_host
+            if timing is not None:
+                timing.dns += resolved - start
+                timing.connect += time.perf_counter() - resolved
+            counter.on_new_connection(self)
+            return sock
+
+        def connect(self):
+            timing = getattr(_current, "timing", None)
+            before = timing.dns + timing.connect if timing is not None else 0.0
+            start = time.perf_counter()
+            super().connect()
+            if timing is not None and tls:
+                setup = timing.dns + timing.connect - before
+                timing.tls += max(0.0, time.perf_counter() - start - setup)
+
+    return InstrumentedConnection
+
+
+def instrumented_pool_classes(counter):
+    """Connection pool classes whose connections report to `counter`"""
+    classes = {}
+    for scheme, pool_cls in (("http", HTTPConnectionPool), ("https", HTTPSConnectionPool)):
+        connection_cls = instrumented_connection_class(pool_cls.ConnectionCls, counter, scheme == "https")
+        classes[scheme] = type(f"Instrumented{pool_cls.__name__}", (pool_cls,),
+                               {"ConnectionCls": connection_cls})
+    return classes
+
+
+class SessionPool:
+    """Keep-alive sessions keyed by origin, created lazily and shared across threads"""
+
+    def __init__(self, pool_size=10, retries=0, backoff_factor=0.0, keep_alive=True,
+                 retry_statuses=RETRY_STATUSES, recorder=None, transport=None, limiter=None):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.keep_alive = keep_alive
+        self.retry_statuses = tuple(retry_statuses)
+        self.recorder = recorder
+        # Optional hook wrapping or replacing each session's adapter (e.g. cassettes)
+        self.transport = transport
+        # Optional per-host concurrency limiter (tests.adaptive.AdaptiveLimiters)
+        self.limiter = limiter
+        # Callables invoked as observer(method, url, timing) after every request
+        self.observers = []
+        self._sessions = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._last = threading.local()
+
+    def _build_session(self, origin):
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.retry_statuses if self.retries else (),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                              max_retries=retry, pool_block=False)
+        counter = self._counters[origin] = ConnectionCounter()
+        adapter.poolmanager.pool_classes_by_scheme = instrumented_pool_classes(counter)
+        if self.transport is not None:
+            adapter = self.transport(adapter)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def session_for(self, url):
+        """Return the shared session for the URL's origin"""
+        origin = origin_of(url)
+        session = self._sessions.get(origin)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(origin)
+                if session is None:
+                    session = self._sessions[origin] = self._build_session(origin)
+        return session
+
+    def request(self, method, url, **kwargs):
+        """Send a request and attach its RequestTiming as response.timing"""
+        if self.limiter is None:
+            return self._send(method, url, **kwargs)
+        limiter = self.limiter.for_url(url)
+        limiter.acquire()
+        try:
+            response = self._send(method, url, **kwargs)
+        except Exception as e:
+            limiter.release(error=type(e).__name__)
+            raise
+        limiter.release(response.status_code, response.timing.total, response.headers.get("Retry-After"))
+        return response
+
+    def _send(self, method, url, **kwargs):
+        session = self.session_for(url)
+        timing = _current.timing = RequestTiming()
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+        except Exception as e:
+            timing.total = time.perf_counter() - start
+            timing.error = type(e).__name__
+            self._finish(method, url, timing)
+            raise
+        finally:
+            _current.timing = None
+        timing.total = time.perf_counter() - start
+        # elapsed runs from send until headers arrive, including connection setup
+        setup = timing.dns + timing.connect + timing.tls
+        timing.ttfb = max(0.0, response.elapsed.total_seconds() - setup)
+        if kwargs.get("stream"):
+            timing.size = int(response.headers.get("Content-Length", 0))
+        else:
+            timing.size = len(response.content)
+        timing.status = response.status_code
+        response.timing = timing
+        self._finish(method, url, timing)
+        return response
+
+    def _finish(self, method, url, timing):
+        self._last.timing = timing
+        if self.recorder is not None:
+            self.recorder.record(method, url, timing)
+        for observer in self.observers:
+            observer(method, url, timing)
+
+    def pop_last_timing(self):
+        """Timing of this thread's most recent request, cleared once read"""
+        timing = getattr(self._last, "timing", None)
+        self._last.timing = None
+        return timing
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def connection_stats(self):
+        """Per-origin counts of new vs reused connections"""
+        stats = {}
+        for origin, session in list(self._sessions.items()):
+            poolmanager = getattr(session.get_adapter(origin), "poolmanager", None)
+            if poolmanager is None:
+                continue  # replayed sessions never open connections
+            pools = poolmanager.pools
+            requests_sent = sum(pools[key].num_requests for key in list(pools.keys()))
+            new = self._counters[origin].new_connections
+            stats[origin] = {
+                "requests": requests_sent,
+                "new_connections": new,
+                "reused_connections": max(0, requests_sent - new),
+            }
+        return stats
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
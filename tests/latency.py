@@ -0,0 +1,228 @@
+"""
+Latency Histograms for Admin Dashboard API Tests
+HDR-style log-linear histograms recorded per endpoint and request phase,
+mergeable across threads, runs and processes, with JSON and CSV export
+"""
+
+import csv
+import io
+import json
+import threading
+from dataclasses import asdict, dataclass
+
+from tests.dummyjson_server import endpoint_template
+
+# Keep the top 8 bits of every value: < 0.8% relative error per bucket
+SUB_BUCKET_BITS = 8
+
+PHASES = ("dns", "connect", "tls", "ttfb", "total")
+PERCENTILES = (50, 90, 99)
+
+
+def bucket_key(value):
+    """Map a non-negative integer to its bucket key; keys sort in value order"""
+    shift = max(0, value.bit_length() - SUB_BUCKET_BITS)
+    return (shift << SUB_BUCKET_BITS) | (value >> shift)
+
+
+def bucket_value(key):
+    """Representative (midpoint) value of a bucket"""
+    shift = key >> SUB_BUCKET_BITS
+    sub = key & ((1 << SUB_BUCKET_BITS) - 1)
+    return (sub << shift) + ((1 << shift) >> 1)
+
+
+class Histogram:
+    """Log-linear integer histogram with exact count, sum, min and max"""
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value, count=1):
+        value = max(0, int(value))
+        key = bucket_key(value)
+        self.counts[key] = self.counts.get(key, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, pct):
+        """Value at the given percentile (0-100), clamped to the observed range"""
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * pct // 100))
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= rank:
+                return min(max(bucket_value(key), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def to_dict(self):
+        return {
+            "counts": {str(k): v for k, v in self.counts.items()},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls()
+        hist.counts = {int(k): v for k, v in data["counts"].items()}
+        hist.count = data["count"]
+        hist.total = data["total"]
+        hist.min = data["min"]
+        hist.max = data["max"]
+        return hist
+
+
+@dataclass
+class RequestTiming:
+    """Phase durations of one HTTP exchange, in seconds"""
+    dns: float = 0.0
+    connect: float = 0.0
+    tls: float = 0.0
+    ttfb: float = 0.0
+    total: float = 0.0
+    size: int = 0
+    status: int = 0
+    error: str = None
+
+    def to_dict(self):
+        data = asdict(self)
+        for phase in PHASES:
+            data[f"{phase}_ms"] = round(data.pop(phase) * 1000, 3)
+        return data
+
+
+class EndpointStats:
+    """Phase histograms (microseconds) and a response size histogram for one endpoint"""
+
+    def __init__(self):
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.size = Histogram()
+        self.errors = 0
+
+    def record(self, timing):
+        if timing.error:
+            self.errors += 1
+            return
+        for phase in PHASES:
+            self.phases[phase].record(getattr(timing, phase) * 1_000_000)
+        self.size.record(timing.size)
+
+    def merge(self, other):
+        for phase in PHASES:
+            self.phases[phase].merge(other.phases[phase])
+        self.size.merge(other.size)
+        self.errors += other.errors
+        return self
+
+    def to_dict(self):
+        return {
+            "phases": {phase: hist.to_dict() for phase, hist in self.phases.items()},
+            "size": self.size.to_dict(),
+            "errors": self.errors,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.phases = {phase: Histogram.from_dict(h) for phase, h in data["phases"].items()}
+        stats.size = Histogram.from_dict(data["size"])
+        stats.errors = data["errors"]
+        return stats
+
+
+class LatencyRecorder:
+    """Thread-safe per-endpoint latency statistics"""
+
+    def __init__(self):
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, url, timing):
+        endpoint = endpoint_template(method, url)
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointStats()
+            stats.record(timing)
+
+    def merge(self, other):
+        with self._lock:
+            for endpoint, stats in other.endpoints.items():
+                self.endpoints.setdefault(endpoint, EndpointStats()).merge(stats)
+        return self
+
+    def rows(self):
+        """One summary row per endpoint and phase, latencies in milliseconds"""
+        rows = []
+        for endpoint in sorted(self.endpoints):
+            stats = self.endpoints[endpoint]
+            for phase in PHASES:
+                hist = stats.phases[phase]
+                row = {"endpoint": endpoint, "phase": phase, "count": hist.count, "errors": stats.errors}
+                for pct in PERCENTILES:
+                    value = hist.percentile(pct)
+                    row[f"p{pct}_ms"] = None if value is None else round(value / 1000, 3)
+                row["max_ms"] = None if hist.max is None else round(hist.max / 1000, 3)
+                row["mean_size_bytes"] = None if stats.size.mean is None else round(stats.size.mean)
+                rows.append(row)
+        return rows
+
+    def to_dict(self):
+        with self._lock:
+            return {endpoint: stats.to_dict() for endpoint, stats in self.endpoints.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        recorder = cls()
+        recorder.endpoints = {endpoint: EndpointStats.from_dict(s) for endpoint, s in data.items()}
+        return recorder
+
+    def to_json(self):
+        return json.dumps({"summary": self.rows(), "histograms": self.to_dict()}, indent=2)
+
+    def to_csv(self):
+        buffer = io.StringIO()
+        rows = self.rows()
+        if rows:
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return buffer.getvalue()
+
+    def print_summary(self, phase="total"):
+        """Print p50/p90/p99/max per endpoint for one phase"""
+        rows = [row for row in self.rows() if row["phase"] == phase]
+        if not rows:
+            return
+        width = max(len(row["endpoint"]) for row in rows)
+        print(f"\n⏱️  LATENCY ({phase}, ms):")
+        print(f"  {'endpoint'.ljust(width)}  {'n':>5} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+        for row in rows:
+            cells = [f"{row[k]:>9.2f}" if row[k] is not None else f"{'-':>9}"
+                     for k in ("p50_ms", "p90_ms", "p99_ms", "max_ms")]
+            print(f"  {row['endpoint'].ljust(width)}  {row['count']:>5} {' '.join(cells)}")
@@ -0,0 +1,302 @@
+"""
+Open-loop Load Generator for Admin Dashboard API Routes
+Drives a fixed-rate read/write mix against /api/status and reports achieved
+throughput, coordinated-omission-safe latency percentiles and error breakdowns
+"""
+
+import multiprocessing
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+
+from tests.auth import TokenManager, TokenStats
+from tests.latency import Histogram, LatencyRecorder
+
+LOAD_PERCENTILES = (50, 90, 99, 99.9)
+
+OP_READ = "GET /api/status"
+OP_WRITE = "POST /api/status"
+
+
+@dataclass
+class LoadScenario:
+    """Target rate, duration and request mix for one open-loop run"""
+    rps: float = 50.0
+    duration: float = 10.0
+    write_ratio: float = 0.5
+    arrival: str = "constant"  # or "poisson"
+    max_workers: int = 256
+    timeout: float = 10.0
+    client_name: str = "load_client_admin_dashboard"
+    seed: int = None
+
+    def schedule(self):
+        """Yield (offset seconds, is_write) for every request in the run"""
+        rng = random.Random(self.seed)
+        offset = 0.0
+        index = 0
+        while True:
+            if self.arrival == "poisson":
+                offset += rng.expovariate(self.rps)
+            else:
+                offset = index / self.rps
+            if offset >= self.duration:
+                return
+            yield offset, rng.random() < self.write_ratio
+            index += 1
+
+
+class OperationStats:
+    """Response time (from intended start) and service time (from actual send) for one operation"""
+
+    def __init__(self):
+        self.response = Histogram()
+        self.service = Histogram()
+        self.ok = 0
+        self.errors = {}
+
+    def merge(self, other):
+        self.response.merge(other.response)
+        self.service.merge(other.service)
+        self.ok += other.ok
+        for kind, count in other.errors.items():
+            self.errors[kind] = self.errors.get(kind, 0) + count
+        return self
+
+    def to_dict(self):
+        return {
+            "response": self.response.to_dict(),
+            "service": self.service.to_dict(),
+            "ok": self.ok,
+            "errors": dict(self.errors),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.response = Histogram.from_dict(data["response"])
+        stats.service = Histogram.from_dict(data["service"])
+        stats.ok = data["ok"]
+        stats.errors = dict(data["errors"])
+        return stats
+
+
+class LoadReport:
+    """Mergeable outcome of a load run"""
+
+    def __init__(self, scenario=None):
+        self.scenario = scenario
+        self.operations = {}
+        self.scheduled = 0
+        self.elapsed = 0.0
+        self.max_dispatch_lag = 0.0
+        self._lock = threading.Lock()
+
+    def stats_for(self, operation):
+        stats = self.operations.get(operation)
+        if stats is None:
+            stats = self.operations[operation] = OperationStats()
+        return stats
+
+    def record(self, operation, response_time, service_time, error=None):
+        with self._lock:
+            stats = self.stats_for(operation)
+            stats.response.record(response_time * 1_000_000)
+            stats.service.record(service_time * 1_000_000)
+            if error:
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+            else:
+                stats.ok += 1
+
+    @property
+    def completed(self):
+        return sum(s.ok + sum(s.errors.values()) for s in self.operations.values())
+
+    @property
+    def error_count(self):
+        return sum(sum(s.errors.values()) for s in self.operations.values())
+
+    @property
+    def achieved_rps(self):
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self):
+        return self.error_count / self.completed if self.completed else 0.0
+
+    def merge(self, other):
+        for operation, stats in other.operations.items():
+            self.stats_for(operation).merge(stats)
+        self.scheduled += other.scheduled
+        # Shards run side by side, so wall-clock time is the longest shard
+        self.elapsed = max(self.elapsed, other.elapsed)
+        self.max_dispatch_lag = max(self.max_dispatch_lag, other.max_dispatch_lag)
+        return self
+
+    def to_dict(self):
+        return {
+            "scenario": asdict(self.scenario) if self.scenario else None,
+            "operations": {op: stats.to_dict() for op, stats in self.operations.items()},
+            "scheduled": self.scheduled,
+            "elapsed": self.elapsed,
+            "max_dispatch_lag": self.max_dispatch_lag,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        report = cls(LoadScenario(**data["scenario"]) if data.get("scenario") else None)
+        report.operations = {op: OperationStats.from_dict(s) for op, s in data["operations"].items()}
+        report.scheduled = data["scheduled"]
+        report.elapsed = data["elapsed"]
+        report.max_dispatch_lag = data["max_dispatch_lag"]
+        return report
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("📈 LOAD SUMMARY")
+        print("=" * 60)
+        if self.scenario:
+            print(f"Target: {self.scenario.rps:.1f} req/s for {self.scenario.duration:.0f}s "
+                  f"({self.scenario.arrival} arrivals, {self.scenario.write_ratio:.0%} writes)")
+        print(f"Scheduled: {self.scheduled}  Completed: {self.completed}  Elapsed: {self.elapsed:.2f}s")
+        print(f"Achieved Throughput: {self.achieved_rps:.1f} req/s")
+        print(f"Error Rate: {self.error_rate * 100:.2f}%  Max Dispatch Lag: {self.max_dispatch_lag * 1000:.1f}ms")
+        for operation in sorted(self.operations):
+            stats = self.operations[operation]
+            print(f"\n  {operation}: {stats.ok} ok, {sum(stats.errors.values())} errors")
+            for label, hist in (("response", stats.response), ("service", stats.service)):
+                cells = "  ".join(f"p{pct:g}={hist.percentile(pct) / 1000:.2f}" for pct in LOAD_PERCENTILES)
+                print(f"    {label:<8} ms: {cells}  max={(hist.max or 0) / 1000:.2f}")
+            for kind, count in sorted(stats.errors.items(), key=lambda item: -item[1]):
+                print(f"    ❌ {kind}: {count}")
+
+
+class OpenLoopLoadGenerator:
+    """Fires requests on a fixed schedule regardless of how fast responses come back
+
+    Latency is measured from each request's intended start time, so queueing
+    behind a slow server is counted instead of silently omitted.
+    """
+
+    def __init__(self, http, base_url, scenario, tokens=None):
+        self.http = http
+        self.base_url = base_url.rstrip("/")
+        self.scenario = scenario
+        # Optional TokenManager: every request then carries a bearer token
+        self.tokens = tokens
+        self.report = LoadReport(scenario)
+
+    def _send(self, intended, is_write):
+        scenario = self.scenario
+        operation = OP_WRITE if is_write else OP_READ
+        sent = time.perf_counter()
+        error = None
+        try:
+            headers = self.tokens.headers() if self.tokens else {}
+            if is_write:
+                response = self.http.post(
+                    f"{self.base_url}/api/status",
+                    headers={'Content-Type': 'application/json', **headers},
+                    json={"client_name": scenario.client_name},
+                    timeout=scenario.timeout,
+                )
+            else:
+                response = self.http.get(f"{self.base_url}/api/status", headers=headers, timeout=scenario.timeout)
+            if response.status_code != 200:
+                error = f"HTTP {response.status_code}"
+        except Exception as e:
+            error = type(e).__name__
+        done = time.perf_counter()
+        self.report.record(operation, done - intended, done - sent, error)
+
+    def run(self, start_at=None):
+        """Execute the scenario and return its LoadReport
+
+        `start_at` is an optional time.time() value to wait for, so shards in
+        separate processes begin their schedules together.
+        """
+        report = self.report
+        with ThreadPoolExecutor(max_workers=self.scenario.max_workers, thread_name_prefix="load") as pool:
+            if start_at is not None:
+                time.sleep(max(0.0, start_at - time.time()))
+            start = time.perf_counter()
+            for offset, is_write in self.scenario.schedule():
+                intended = start + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    report.max_dispatch_lag = max(report.max_dispatch_lag, -delay)
+                pool.submit(self._send, intended, is_write)
+                report.scheduled += 1
+        report.elapsed = time.perf_counter() - start
+        return report
+
+
+def _run_shard(base_url, scenario, http_options, start_at, auth_options=None):
+    """Process-pool entry point: run one shard with its own session pool"""
+    from tests.adaptive import AdaptiveLimiters
+    from tests.http_pool import SessionPool
+
+    http_options = dict(http_options)
+    limiter_options = http_options.pop("limiter_options", None)
+    limiter = AdaptiveLimiters(**limiter_options) if limiter_options is not None else None
+    recorder = LatencyRecorder()
+    http = SessionPool(recorder=recorder, limiter=limiter, **http_options)
+    tokens = TokenManager(http, **auth_options) if auth_options else None
+    try:
+        report = OpenLoopLoadGenerator(http, base_url, scenario, tokens=tokens).run(start_at=start_at)
+        auth_stats = tokens.stats.to_dict() if tokens else None
+        return report.to_dict(), recorder.to_dict(), http.connection_stats(), auth_stats
+    finally:
+        http.close()
+
+
+def shard_scenario(scenario, shards, index):
+    """Split a scenario's rate and worker budget evenly across shards"""
+    seed = None if scenario.seed is None else scenario.seed + index
+    return replace(
+        scenario,
+        rps=scenario.rps / shards,
+        max_workers=max(1, scenario.max_workers // shards),
+        seed=seed,
+    )
+
+
+def run_sharded(base_url, scenario, processes, http_options=None, startup_grace=2.0, auth_options=None):
+    """Run `scenario` split across worker processes and merge their results
+
+    `auth_options` are TokenManager keyword arguments; give them a `cache_path`
+    so the shards share one token instead of each logging in.
+
+    Returns (LoadReport, LatencyRecorder, connection stats per origin, merged
+    TokenStats or None).
+    """
+    http_options = dict(http_options or {})
+    http_options.setdefault("pool_size", max(1, scenario.max_workers // processes))
+    context = multiprocessing.get_context("spawn")
+    start_at = time.time() + startup_grace
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        futures = [
+            pool.submit(_run_shard, base_url, shard_scenario(scenario, processes, index), http_options, start_at,
+                        auth_options)
+            for index in range(processes)
+        ]
+        shards = [future.result() for future in futures]
+
+    report = LoadReport(scenario)
+    recorder = LatencyRecorder()
+    connections = {}
+    auth = TokenStats() if auth_options else None
+    for report_data, recorder_data, shard_connections, auth_stats in shards:
+        if auth is not None:
+            auth.merge(TokenStats.from_dict(auth_stats))
+        report.merge(LoadReport.from_dict(report_data))
+        recorder.merge(LatencyRecorder.from_dict(recorder_data))
+        for origin, counts in shard_connections.items():
+            merged = connections.setdefault(origin, dict.fromkeys(counts, 0))
+            for key, value in counts.items():
+                merged[key] += value
+    return report, recorder, connections, auth
@@ -0,0 +1,239 @@
+"""
+Per-check Profiling for Admin Dashboard API Tests
+Wall and CPU timers around every check, split into connect/wait/decode/validate
+phases, with cProfile or a sampling profiler feeding flamegraph-compatible
+collapsed stacks
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+PROFILE_PHASES = ("connect", "wait", "decode", "validate")
+PROFILE_MODES = ("sample", "cprofile")
+
+
+@dataclass
+class CheckProfile:
+    """Accumulated seconds for one check across every run of it"""
+    check: str
+    runs: int = 0
+    requests: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    phases: dict = field(default_factory=lambda: dict.fromkeys(PROFILE_PHASES, 0.0))
+
+    @property
+    def other(self):
+        """Wall time not spent in a measured phase: harness code, logging, waiting on locks"""
+        return max(0.0, self.wall - sum(self.phases.values()))
+
+
+def _label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _pstats_label(func):
+    filename, _, name = func
+    return f"{os.path.basename(filename)}:{name}" if filename != "~" else name.strip("<>")
+
+
+def collapse_pstats(stats, root):
+    """Approximate collapsed stacks (microseconds) from cProfile's caller/callee graph
+
+    cProfile keeps edges, not stacks, so each function's self time is spread
+    over its callers in proportion to the time each edge accounts for, the
+    way flameprof and similar tools rebuild a flamegraph.
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    stacks = {}
+
+    def walk(func, path, share, seen):
+        _, _, own, total, _ = entries[func]
+        path = f"{path};{_pstats_label(func)}"
+        weight = int(own * share * 1_000_000)
+        if weight:
+            stacks[path] = stacks.get(path, 0) + weight
+        for callee, edge_total in callees.get(func, ()):
+            callee_total = entries[callee][3]
+            if callee in seen or not callee_total:
+                continue
+            walk(callee, path, share * min(1.0, edge_total / callee_total), seen | {callee})
+
+    for func in roots:
+        walk(func, root, 1.0, {func})
+    return stacks
+
+
+class CheckProfiler:
+    """Times and profiles checks; attach `observe` to the SessionPool's observers
+
+    Phases are attributed to whichever check is running on the current
+    thread, so concurrent checks are profiled independently.
+    """
+
+    def __init__(self, mode="sample", interval=0.002):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of: {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+        self.interval = interval
+        self.checks = {}
+        # Collapsed stack -> weight (samples, or microseconds in cprofile mode)
+        self.stacks = {}
+        self.samples = 0
+        self.unprofiled = 0
+        self._pstats = {}
+        self._active = {}  # thread ident -> (check, frame the check was entered from)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        if self.mode == "sample" and self._sampler is None:
+            self._sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def profile_for(self, check):
+        with self._lock:
+            profile = self.checks.get(check)
+            if profile is None:
+                profile = self.checks[check] = CheckProfile(check)
+            return profile
+
+    def run(self, check, func, *args):
+        """Call func(*args) as one run of `check`, timing and profiling it"""
+        profile = self.profile_for(check)
+        phases = dict.fromkeys(PROFILE_PHASES, 0.0)
+        self._local.phases = phases
+        self._local.requests = 0
+        ident = threading.get_ident()
+        self._active[ident] = (check, sys._getframe())
+        profiler = None
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler already owns this interpreter (Python 3.12+ threads)
+                profiler = None
+                self.unprofiled += 1
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            return func(*args)
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+            if profiler is not None:
+                profiler.disable()
+            self._active.pop(ident, None)
+            self._local.phases = None
+            with self._lock:
+                profile.runs += 1
+                profile.requests += self._local.requests
+                profile.wall += wall
+                profile.cpu += cpu
+                for name, seconds in phases.items():
+                    profile.phases[name] += seconds
+                if profiler is not None:
+                    stats = self._pstats.get(check)
+                    if stats is None:
+                        self._pstats[check] = pstats.Stats(profiler)
+                    else:
+                        stats.add(profiler)
+
+    @contextmanager
+    def phase(self, name):
+        """Attribute the enclosed wall time to `name` for the check on this thread"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases = getattr(self._local, "phases", None)
+            if phases is not None:
+                phases[name] += time.perf_counter() - start
+
+    def observe(self, method, url, timing):
+        """SessionPool observer: connection setup counts as connect, the rest of the exchange as wait"""
+        phases = getattr(self._local, "phases", None)
+        if phases is None:
+            return
+        setup = timing.dns + timing.connect + timing.tls
+        phases["connect"] += setup
+        phases["wait"] += max(0.0, timing.total - setup)
+        self._local.requests += 1
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident, (check, entry) in list(self._active.items()):
+                frame = frames.get(ident)
+                labels = []
+                while frame is not None and frame is not entry:
+                    labels.append(_label(frame.f_code))
+                    frame = frame.f_back
+                if frame is None:
+                    continue  # the check finished while we were walking
+                stack = ";".join([check, *reversed(labels)])
+                with self._lock:
+                    self.stacks[stack] = self.stacks.get(stack, 0) + 1
+                    self.samples += 1
+
+    def collapsed(self):
+        """{stack: weight} in Brendan Gregg's collapsed format, ready for flamegraph.pl or speedscope"""
+        if self.mode == "sample":
+            return dict(self.stacks)
+        stacks = {}
+        for check, stats in self._pstats.items():
+            stacks.update(collapse_pstats(stats, check))
+        return stacks
+
+    def write_stacks(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, weight in sorted(self.collapsed().items()):
+                fh.write(f"{stack} {weight}\n")
+
+    def hot_frames(self, limit=10):
+        """Frames with the most self time (leaf weight) across all checks, as (frame, share)"""
+        leaves = {}
+        for stack, weight in self.collapsed().items():
+            leaf = stack.rsplit(";", 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + weight
+        total = sum(leaves.values())
+        ranked = sorted(leaves.items(), key=lambda item: -item[1])[:limit]
+        return [(leaf, weight / total) for leaf, weight in ranked] if total else []
+
+    def print_summary(self):
+        if not self.checks:
+            return
+        print("\n🔬 CHECK PROFILE (mean ms per run):")
+        header = "".join(f"{name:>10}" for name in (*PROFILE_PHASES, "other"))
+        print(f"  {'check':<24} {'runs':>4} {'wall':>9} {'cpu':>9} {'cpu%':>5}{header}")
+        for profile in sorted(self.checks.values(), key=lambda p: -p.wall):
+            runs = profile.runs or 1
+            cells = "".join(f"{profile.phases[name] / runs * 1000:>10.2f}" for name in PROFILE_PHASES)
+            cpu_share = profile.cpu / profile.wall * 100 if profile.wall else 0.0
+            print(f"  {profile.check:<24} {profile.runs:>4} {profile.wall / runs * 1000:>9.2f} "
+                  f"{profile.cpu / runs * 1000:>9.2f} {cpu_share:>4.0f}%{cells}{profile.other / runs * 1000:>10.2f}")
+        hot = self.hot_frames()
+        if hot:
+            source = f"{self.samples} wall-clock samples" if self.mode == "sample" else "cProfile self time"
+            print(f"\n  Hottest frames ({source}):")
+            for leaf, share in hot:
+                print(f"    {share * 100:5.1f}%  {leaf}")
+        if self.unprofiled:
+            print(f"  ⚠️  {self.unprofiled} check runs were timed but not profiled (profiler already active)")
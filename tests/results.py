@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Streaming Result Sink for Admin Dashboard API Tests
+Appends check results to a JSONL file as they happen with bounded buffering,
+keeps running counters for the summary, and aggregates result files in
+constant memory
+"""
+
+import argparse
+import json
+import sys
+import threading
+from collections import deque
+
+from tests.latency import Histogram
+
+try:
+    import orjson
+except ImportError:  # optional: faster decoding for large result files
+    orjson = None
+
+# Distinct failure messages tracked per test by the report tool
+MAX_FAILURE_MESSAGES = 20
+
+
+class ResultSink:
+    """Running pass/fail counters plus an optional append-only JSONL file
+
+    At most `buffer_size` results are held before a flush and at most
+    `keep_failures` recent failures are kept for the summary.
+    """
+
+    def __init__(self, path=None, buffer_size=256, keep_failures=100):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.total = 0
+        self.passed = 0
+        self.failures = deque(maxlen=keep_failures)
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._fh = open(path, "a", encoding="utf-8") if path else None
+
+    @property
+    def failed(self):
+        return self.total - self.passed
+
+    def append(self, result):
+        with self._lock:
+            self.total += 1
+            if result["success"]:
+                self.passed += 1
+            else:
+                self.failures.append((result["test"], result["message"]))
+            if self._fh is None:
+                return
+            self._buffer.append(json.dumps(result, default=str))
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            self._fh.write("\n".join(self._buffer) + "\n")
+            self._fh.flush()
+            self._buffer.clear()
+
+    def flush(self):
+        with self._lock:
+            if self._fh is not None:
+                self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                self._flush_locked()
+                self._fh.close()
+                self._fh = None
+
+
+class CheckAggregate:
+    """Constant-size rollup of every result for one test name"""
+
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.latency = Histogram()
+        self.first_seen = None
+        self.last_seen = None
+        self.failure_messages = {}
+        self.other_failures = 0
+
+    def add(self, result):
+        self.total += 1
+        timestamp = result.get("timestamp")
+        if timestamp:
+            self.first_seen = timestamp if self.first_seen is None else min(self.first_seen, timestamp)
+            self.last_seen = timestamp if self.last_seen is None else max(self.last_seen, timestamp)
+        timing = result.get("timing")
+        if timing and timing.get("total_ms") is not None:
+            self.latency.record(timing["total_ms"] * 1000)
+        if result.get("success"):
+            self.passed += 1
+            return
+        message = result.get("message", "")
+        if message in self.failure_messages or len(self.failure_messages) < MAX_FAILURE_MESSAGES:
+            self.failure_messages[message] = self.failure_messages.get(message, 0) + 1
+        else:
+            self.other_failures += 1
+
+
+def iter_results(path, chunk_size=1 << 20):
+    """Stream decoded results from a JSONL file, skipping torn or blank lines"""
+    loads = orjson.loads if orjson else json.loads
+    with open(path, "rb", buffering=chunk_size) as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                continue
+
+
+def aggregate(paths):
+    """Fold any number of result files into per-test aggregates"""
+    tests = {}
+    for path in paths:
+        for result in iter_results(path):
+            name = result.get("test", "<unknown>")
+            rollup = tests.get(name)
+            if rollup is None:
+                rollup = tests[name] = CheckAggregate()
+            rollup.add(result)
+    return tests
+
+
+def print_report(tests):
+    total = sum(t.total for t in tests.values())
+    passed = sum(t.passed for t in tests.values())
+    print("=" * 60)
+    print("📊 RESULT FILE REPORT")
+    print("=" * 60)
+    print(f"Total Results: {total}")
+    print(f"✅ Passed: {passed}")
+    print(f"❌ Failed: {total - passed}")
+    if total:
+        print(f"Success Rate: {passed / total * 100:.1f}%")
+    width = max((len(name) for name in tests), default=4)
+    print(f"\n  {'test'.ljust(width)}  {'runs':>7} {'pass %':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name in sorted(tests):
+        rollup = tests[name]
+        lat = rollup.latency
+        cells = [f"{v / 1000:>9.2f}" if v is not None else f"{'-':>9}"
+                 for v in (lat.percentile(50), lat.percentile(99), lat.max)]
+        print(f"  {name.ljust(width)}  {rollup.total:>7} {rollup.passed / rollup.total * 100:>7.1f} {' '.join(cells)}")
+    failing = [(name, t) for name, t in sorted(tests.items()) if t.failure_messages]
+    if failing:
+        print("\n🔍 FAILURES:")
+        for name, rollup in failing:
+            for message, count in sorted(rollup.failure_messages.items(), key=lambda item: -item[1]):
+                print(f"  • {name} ×{count}: {message}")
+            if rollup.other_failures:
+                print(f"  • {name} ×{rollup.other_failures}: (other messages)")
+    return total - passed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate JSONL result files in constant memory")
+    parser.add_argument("paths", nargs="+", help="Result files written with --results-jsonl")
+    args = parser.parse_args(argv)
+    failed = print_report(aggregate(args.paths))
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Compiled Response Schemas for Admin Dashboard API Tests
+Declarative user, product, category and status schemas compiled once into
+fast validator functions that check whole pages and report drift per field
+"""
+
+import argparse
+import json
+import time
+from itertools import count
+
+from tests.dummyjson_server import FIXTURES_DIR
+
+
+class Optional:
+    """Field that may be absent or null"""
+
+    def __init__(self, spec):
+        self.spec = spec
+
+
+class AnyValue:
+    """Field that must be present but may hold anything"""
+
+
+# float means "any JSON number": ints are accepted, bools are not
+ADDRESS = {
+    "address": str,
+    "city": str,
+    "state": str,
+    "stateCode": str,
+    "postalCode": str,
+    "coordinates": {"lat": float, "lng": float},
+    "country": str,
+}
+
+USER = {
+    "id": int,
+    "firstName": str,
+    "lastName": str,
+    "maidenName": str,
+    "age": int,
+    "gender": str,
+    "email": str,
+    "phone": str,
+    "username": str,
+    "password": Optional(str),
+    "birthDate": str,
+    "image": str,
+    "bloodGroup": str,
+    "height": float,
+    "weight": float,
+    "eyeColor": str,
+    "hair": {"color": str, "type": str},
+    "ip": str,
+    "address": ADDRESS,
+    "macAddress": str,
+    "university": str,
+    "bank": {"cardExpire": str, "cardNumber": str, "cardType": str, "currency": str, "iban": str},
+    "company": {"department": str, "name": str, "title": str, "address": ADDRESS},
+    "ein": str,
+    "ssn": str,
+    "userAgent": str,
+    "crypto": {"coin": str, "wallet": str, "network": str},
+    "role": str,
+}
+
+PRODUCT = {
+    "id": int,
+    "title": str,
+    "description": str,
+    "category": str,
+    "price": float,
+    "discountPercentage": float,
+    "rating": float,
+    "stock": int,
+    "tags": [str],
+    "brand": Optional(str),
+    "sku": str,
+    "weight": float,
+    "dimensions": {"width": float, "height": float, "depth": float},
+    "warrantyInformation": str,
+    "shippingInformation": str,
+    "availabilityStatus": str,
+    "reviews": [{"rating": int, "comment": str, "date": str, "reviewerName": str, "reviewerEmail": str}],
+    "returnPolicy": str,
+    "minimumOrderQuantity": int,
+    "meta": {"createdAt": str, "updatedAt": str, "barcode": str, "qrCode": str},
+    "images": [str],
+    "thumbnail": str,
+}
+
+CATEGORY = {"slug": str, "name": str, "url": str}
+
+STATUS = {"id": str, "client_name": str, "timestamp": str}
+
+SCHEMA_SPECS = {
+    "user": USER,
+    "product": PRODUCT,
+    "category": CATEGORY,
+    "status": STATUS,
+}
+
+def _type_name(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "integer" if isinstance(value, int) else "number"
+    return {str: "string", dict: "object", list: "array"}.get(type(value), type(value).__name__)
+
+
+class SchemaReport:
+    """Per-field drift counters across every record validated against one schema"""
+
+    def __init__(self, schema_name):
+        self.schema = schema_name
+        self.records = 0
+        self.invalid = 0
+        # field path -> {issue -> count}; issues are "missing", "unexpected" or "type:<observed>"
+        self.drift = {}
+
+    def note(self, path, issue):
+        issues = self.drift.setdefault(path, {})
+        issues[issue] = issues.get(issue, 0) + 1
+
+    @property
+    def errors(self):
+        """Field issues other than unexpected extra fields"""
+        return {
+            path: {issue: n for issue, n in issues.items() if issue != "unexpected"}
+            for path, issues in self.drift.items()
+            if any(issue != "unexpected" for issue in issues)
+        }
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def merge(self, other):
+        self.records += other.records
+        self.invalid += other.invalid
+        for path, issues in other.drift.items():
+            for issue, n in issues.items():
+                target = self.drift.setdefault(path, {})
+                target[issue] = target.get(issue, 0) + n
+        return self
+
+    def describe(self, limit=3):
+        """Short human-readable drift summary"""
+        parts = []
+        for path, issues in sorted(self.drift.items()):
+            for issue, n in sorted(issues.items()):
+                parts.append(f"{path} {issue} ×{n}")
+        more = f" (+{len(parts) - limit} more)" if len(parts) > limit else ""
+        return ", ".join(parts[:limit]) + more
+
+
+class _Compiler:
+    """Turns a spec into one boolean expression over a record"""
+
+    def __init__(self, track_unknown):
+        self.track_unknown = track_unknown
+        self.names = {}
+        self._temps = count()
+
+    def temp(self):
+        return f"_v{next(self._temps)}"
+
+    def constant(self, value):
+        name = f"_k{len(self.names)}"
+        self.names[name] = value
+        return name
+
+    def expr(self, spec, var):
+        if isinstance(spec, Optional):
+            return f"({var} is None or {self.expr(spec.spec, var)})"
+        if spec is AnyValue:
+            return "True"
+        if spec is float:
+            return f"(type({var}) is float or type({var}) is int)"
+        if spec in (str, int, bool):
+            return f"type({var}) is {spec.__name__}"
+        if isinstance(spec, list):
+            item = self.temp()
+            return f"(type({var}) is list and all({self.expr(spec[0], item)} for {item} in {var}))"
+        if isinstance(spec, dict):
+            parts = [f"type({var}) is dict"]
+            if self.track_unknown:
+                parts.append(f"{var}.keys() <= {self.constant(frozenset(spec))}")
+            for field, field_spec in spec.items():
+                value = self.temp()
+                if field_spec is AnyValue:
+                    parts.append(f"{field!r} in {var}")
+                    continue
+                parts.append(f"(({value} := {var}.get({field!r})) is not None or "
+                             f"{isinstance(field_spec, Optional)}) and {self.expr(field_spec, value)}")
+            return "(" + " and ".join(parts) + ")"
+        raise TypeError(f"Unsupported schema spec: {spec!r}")
+
+
+def _explain(spec, value, path, report, track_unknown):
+    """Slow path: record every issue in an invalid record"""
+    if isinstance(spec, Optional):
+        if value is not None:
+            _explain(spec.spec, value, path, report, track_unknown)
+        return
+    if spec is AnyValue:
+        return
+    if isinstance(spec, dict):
+        if not isinstance(value, dict):
+            report.note(path or "<record>", f"type:{_type_name(value)}")
+            return
+        for field, field_spec in spec.items():
+            field_path = f"{path}.{field}" if path else field
+            if field not in value:
+                if not isinstance(field_spec, Optional):
+                    report.note(field_path, "missing")
+                continue
+            if value[field] is None and not isinstance(field_spec, Optional) and field_spec is not AnyValue:
+                report.note(field_path, "type:null")
+                continue
+            _explain(field_spec, value[field], field_path, report, track_unknown)
+        if track_unknown:
+            for field in value.keys() - spec.keys():
+                report.note(f"{path}.{field}" if path else field, "unexpected")
+        return
+    if isinstance(spec, list):
+        if not isinstance(value, list):
+            report.note(path, f"type:{_type_name(value)}")
+            return
+        for item in value:
+            _explain(spec[0], item, f"{path}[]", report, track_unknown)
+        return
+    valid = (type(value) in (int, float)) if spec is float else type(value) is spec
+    if not valid:
+        report.note(path, f"type:{_type_name(value)}")
+
+
+class CompiledSchema:
+    """A spec compiled into `check(record)` and `validate_batch(records)`
+
+    The fast path is one generated boolean expression per record; only records
+    that fail it are walked again to attribute drift to individual fields.
+    """
+
+    def __init__(self, name, spec, track_unknown=True):
+        self.name = name
+        self.spec = spec
+        self.track_unknown = track_unknown
+        compiler = _Compiler(track_unknown)
+        expression = compiler.expr(spec, "r")
+        source = (
+            f"def check(r):\n"
+            f"    return {expression}\n"
+            f"def count_invalid(records):\n"
+            f"    return [r for r in records if not ({expression})]\n"
+        )
+        namespace = dict(compiler.names)
+        exec(compile(source, f"<schema {name}>", "exec"), namespace)
+        self.source = source
+        self.check = namespace["check"]
+        self._invalid = namespace["count_invalid"]
+
+    def validate_batch(self, records, report=None):
+        """Validate every record, adding counts and drift to `report` (created if None)"""
+        report = report or SchemaReport(self.name)
+        invalid = self._invalid(records)
+        report.records += len(records)
+        report.invalid += len(invalid)
+        for record in invalid:
+            _explain(self.spec, record, "", report, self.track_unknown)
+        return report
+
+    def validate(self, record, report=None):
+        return self.validate_batch([record], report)
+
+
+SCHEMAS = {name: CompiledSchema(name, spec) for name, spec in SCHEMA_SPECS.items()}
+
+
+def _interpretive_check(spec, value):
+    """Reference validator walking the spec per record, used as the benchmark baseline"""
+    if isinstance(spec, Optional):
+        return value is None or _interpretive_check(spec.spec, value)
+    if spec is AnyValue:
+        return True
+    if isinstance(spec, dict):
+        return (isinstance(value, dict) and value.keys() <= spec.keys() and all(
+            (field in value or isinstance(field_spec, Optional))
+            and _interpretive_check(field_spec, value.get(field))
+            for field, field_spec in spec.items()))
+    if isinstance(spec, list):
+        return isinstance(value, list) and all(_interpretive_check(spec[0], item) for item in value)
+    if spec is float:
+        return type(value) in (int, float)
+    return type(value) is spec
+
+
+def benchmark(records_per_schema=200_000, repeats=3):
+    """Records/sec of the compiled validators vs the interpretive baseline"""
+    rows = []
+    for name, fixture in (("user", "users"), ("product", "products"), ("category", "categories")):
+        with open(FIXTURES_DIR / f"{fixture}.json", encoding="utf-8") as fh:
+            sample = json.load(fh)
+        records = (sample * (records_per_schema // len(sample) + 1))[:records_per_schema]
+        schema = SCHEMAS[name]
+        compiled = interpreted = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            report = schema.validate_batch(records)
+            compiled = min(compiled, time.perf_counter() - start)
+            start = time.perf_counter()
+            for record in records:
+                _interpretive_check(schema.spec, record)
+            interpreted = min(interpreted, time.perf_counter() - start)
+        rows.append((name, len(records), len(records) / compiled, len(records) / interpreted, report))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schema validator micro-benchmark")
+    parser.add_argument("--records", type=int, default=200_000, help="Records validated per schema")
+    parser.add_argument("--repeats", type=int, default=3, help="Best-of repeats")
+    args = parser.parse_args(argv)
+    print(f"⚡ Schema validation throughput (best of {args.repeats})")
+    print(f"  {'schema':<10} {'records':>9} {'compiled rec/s':>15} {'interpreted rec/s':>18} {'speedup':>8}  drift")
+    for name, n, compiled, interpreted, report in benchmark(args.records, args.repeats):
+        drift = report.describe() if report.drift else "none"
+        print(f"  {name:<10} {n:>9} {compiled:>15,.0f} {interpreted:>18,.0f} {compiled / interpreted:>7.1f}x  {drift}")
+
+
+if __name__ == "__main__":
+    main()
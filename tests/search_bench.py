@@ -0,0 +1,164 @@
+"""
+Search-as-you-type Benchmark for Admin Dashboard API Tests
+Expands a query corpus into keystroke prefixes, replays them cold then warm
+against /users/search and /products/search, and models debounce savings
+"""
+
+import math
+import random
+import uuid
+from dataclasses import dataclass, field
+from urllib.parse import quote
+
+from tests.decoders import JsonDecoder
+from tests.latency import Histogram
+
+# resource -> (search path, records key, page size the store requests)
+SEARCH_RESOURCES = {
+    "users": ("/users/search", "users", 10),
+    "products": ("/products/search", "products", 12),
+}
+
+DEFAULT_QUERIES = ["john", "emily", "michael", "smith", "phone", "laptop", "apple", "mascara", "samsung", "sofa"]
+DEFAULT_DEBOUNCE_MS = (0, 100, 200, 300, 500)
+# cold: a new connection per request, and a unique cache-busting parameter so no HTTP cache can answer
+# warm: the cold pass's exact URLs again, on one already-connected pool
+PHASES = ("cold", "warm")
+CACHE_BUST_PARAM = "_cb"
+
+
+def load_corpus(path=None):
+    """One query per line; blank lines and # comments are skipped"""
+    if path is None:
+        return list(DEFAULT_QUERIES)
+    with open(path, encoding="utf-8") as fh:
+        return [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+
+
+def keystroke_prefixes(query):
+    """'john' -> ['j', 'jo', 'joh', 'john']"""
+    return [query[:end] for end in range(1, len(query) + 1)]
+
+
+def typing_gaps(count, rng, median_ms=180.0, sigma=0.5):
+    """Log-normal inter-keystroke gaps in ms for `count` keystrokes"""
+    return [rng.lognormvariate(math.log(median_ms), sigma) for _ in range(count)]
+
+
+def debounced_requests(gaps_ms, window_ms):
+    """Requests fired for one typed query under a trailing debounce of `window_ms`
+
+    gaps_ms[i] is the pause after keystroke i; the final keystroke always fires.
+    """
+    if window_ms <= 0:
+        return len(gaps_ms)
+    return sum(1 for gap in gaps_ms[:-1] if gap >= window_ms) + 1
+
+
+@dataclass
+class PrefixStats:
+    """Latency and result-count histograms for one prefix length in one phase"""
+    latency: Histogram = field(default_factory=Histogram)
+    results: Histogram = field(default_factory=Histogram)
+    errors: int = 0
+
+
+@dataclass
+class SearchBenchResult:
+    resource: str
+    phases: dict = field(default_factory=dict)  # phase -> {prefix length -> PrefixStats}
+    keystrokes: int = 0
+    debounce: dict = field(default_factory=dict)  # window ms -> requests fired
+
+
+class SearchBenchmark:
+    """Replay every keystroke prefix of a corpus against the search endpoints"""
+
+    def __init__(self, http_factory, base_url, queries, debounce_windows=DEFAULT_DEBOUNCE_MS,
+                 timeout=10, seed=None, decoder=None):
+        self.http_factory = http_factory
+        self.base_url = base_url.rstrip("/")
+        self.queries = queries
+        self.debounce_windows = debounce_windows
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.decoder = decoder or JsonDecoder()
+
+    def _url(self, resource, prefix):
+        """Search URL for one keystroke, made unique so no HTTP cache has seen it"""
+        path, _, limit = SEARCH_RESOURCES[resource]
+        return f"{self.base_url}{path}?q={quote(prefix)}&limit={limit}&skip=0&{CACHE_BUST_PARAM}={uuid.uuid4().hex}"
+
+    def _search(self, http, resource, url):
+        response = http.get(url, timeout=self.timeout)
+        if response.status_code != 200:
+            return None, response.timing.total
+        key = SEARCH_RESOURCES[resource][1]
+        return self.decoder.page(response.content, key).get("total", 0), response.timing.total
+
+    def _timed(self, stats, http, resource, prefix, url):
+        bucket = stats.setdefault(len(prefix), PrefixStats())
+        try:
+            total, elapsed = self._search(http, resource, url)
+        except Exception:
+            bucket.errors += 1
+            return
+        if total is None:
+            bucket.errors += 1
+            return
+        bucket.latency.record(elapsed * 1_000_000)
+        bucket.results.record(total)
+
+    def run(self, resource):
+        """Cold pass, each request on a new pool with a never-seen URL, then the same URLs on one warm pool"""
+        result = SearchBenchResult(resource)
+        sent = [(prefix, self._url(resource, prefix)) for query in self.queries for prefix in keystroke_prefixes(query)]
+        stats = result.phases["cold"] = {}
+        for prefix, url in sent:
+            http = self.http_factory()
+            try:
+                self._timed(stats, http, resource, prefix, url)
+            finally:
+                http.close()
+        stats = result.phases["warm"] = {}
+        http = self.http_factory()
+        try:
+            if sent:
+                try:
+                    http.get(sent[0][1], timeout=self.timeout)  # open the connection before timing
+                except Exception:
+                    pass
+            for prefix, url in sent:
+                self._timed(stats, http, resource, prefix, url)
+        finally:
+            http.close()
+
+        for query in self.queries:
+            gaps = typing_gaps(len(query), self.rng)
+            result.keystrokes += len(gaps)
+            for window in self.debounce_windows:
+                result.debounce[window] = result.debounce.get(window, 0) + debounced_requests(gaps, window)
+        return result
+
+
+def print_search_result(result):
+    print(f"\n=== Search Benchmark: {result.resource} ===")
+    for phase, stats in result.phases.items():
+        label = "new connection per request, unseen URLs" if phase == "cold" else "reused connection, repeated URLs"
+        print(f"  {phase} phase, {label} (ms by prefix length):")
+        print(f"    {'len':>4} {'n':>4} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} "
+              f"{'hits p50':>9} {'hits max':>9} {'errors':>7}")
+        for length in sorted(stats):
+            bucket = stats[length]
+            lat = bucket.latency
+            if not lat.count:
+                print(f"    {length:>4} {0:>4} {'-':>8} {'-':>8} {'-':>8} {'-':>8} {'-':>9} {'-':>9} {bucket.errors:>7}")
+                continue
+            print(f"    {length:>4} {lat.count:>4} {lat.percentile(50) / 1000:>8.2f} {lat.percentile(90) / 1000:>8.2f} "
+                  f"{lat.percentile(99) / 1000:>8.2f} {lat.max / 1000:>8.2f} "
+                  f"{bucket.results.percentile(50):>9} {bucket.results.max:>9} {bucket.errors:>7}")
+    print(f"  Debounce model over {result.keystrokes} keystrokes:")
+    for window, fired in sorted(result.debounce.items()):
+        saved = result.keystrokes - fired
+        print(f"    {window:>4} ms window: {fired:>4} requests, {saved:>4} saved "
+              f"({saved / result.keystrokes * 100 if result.keystrokes else 0:.0f}%)")
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Columnar Catalogue Snapshots for Admin Dashboard API Tests
+Pulls every product and user into NumPy columns, computes the dashboard
+aggregates vectorised, persists both as .npz and folds a newer snapshot into
+the previous aggregates by touching only the rows that changed
+"""
+
+import argparse
+import math
+import time
+from dataclasses import dataclass
+
+from tests.crawler import CATALOG_RESOURCES, CrawlError
+from tests.decoders import JsonDecoder, fields_projection
+
+try:
+    import numpy as np
+except ImportError:  # optional: only snapshot mode needs it
+    np = None
+
+# Rating histogram bins (0-5 stars in half-star steps) and age bins in years
+RATING_BINS = (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0)
+AGE_BINS = (0, 20, 30, 40, 50, 60, 70, 200)
+PERCENTILES = (50, 90, 99)
+LOW_STOCK = 10
+
+# The only fields from_records reads, so nothing else needs materialising
+SNAPSHOT_FIELDS = {
+    "products": fields_projection(("id", "price", "discountPercentage", "rating", "stock", "category", "brand")),
+    "users": fields_projection(("id", "age", "gender", "role")),
+}
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Snapshots need numpy (pip install numpy)")
+
+
+def fetch_all(http, base_url, resource, page_size=0, timeout=10, decoder=None):
+    """Every record of a catalogue resource, projected to SNAPSHOT_FIELDS; limit=0 first, paging if capped"""
+    path, key = CATALOG_RESOURCES[resource]
+    decoder = decoder or JsonDecoder()
+    base_url = base_url.rstrip("/")
+    records = []
+    while True:
+        response = http.get(f"{base_url}{path}?limit={page_size}&skip={len(records)}", timeout=timeout)
+        response.raise_for_status()
+        data = decoder.page(response.content, key, SNAPSHOT_FIELDS[resource])
+        records.extend(data[key])
+        if len(records) >= data["total"]:
+            return records
+        if not data[key]:
+            raise CrawlError(f"{resource}: got {len(records)} of {data['total']} records")
+
+
+def _encode(values):
+    """Dictionary-encode strings: (codes, vocabulary)"""
+    vocabulary, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+    return codes.astype(np.int32), vocabulary
+
+
+def _remap(codes, vocabulary, union):
+    """Codes against `vocabulary` re-expressed against the sorted superset `union`"""
+    return np.searchsorted(union, vocabulary)[codes] if len(codes) else codes
+
+
+class Snapshot:
+    """Columnar product and user arrays taken at one point in time"""
+
+    PRODUCT_COLUMNS = ("id", "price", "discount", "rating", "stock", "category", "brand")
+    USER_COLUMNS = ("id", "age", "gender", "role")
+
+    def __init__(self, products, users, vocabularies, taken_at):
+        self.products = products  # column name -> array
+        self.users = users
+        self.vocabularies = vocabularies  # "category"/"brand"/"gender"/"role" -> sorted str array
+        self.taken_at = taken_at
+
+    @classmethod
+    def from_records(cls, products, users, taken_at=None):
+        _require_numpy()
+        category, category_vocab = _encode([p.get("category") or "" for p in products])
+        brand, brand_vocab = _encode([p.get("brand") or "" for p in products])
+        gender, gender_vocab = _encode([u.get("gender") or "" for u in users])
+        role, role_vocab = _encode([u.get("role") or "" for u in users])
+        product_columns = {
+            "id": np.array([p["id"] for p in products], dtype=np.int64),
+            "price": np.array([p.get("price", 0) for p in products], dtype=np.float64),
+            "discount": np.array([p.get("discountPercentage", 0) for p in products], dtype=np.float64),
+            "rating": np.array([p.get("rating", 0) for p in products], dtype=np.float64),
+            "stock": np.array([p.get("stock", 0) for p in products], dtype=np.int64),
+            "category": category,
+            "brand": brand,
+        }
+        user_columns = {
+            "id": np.array([u["id"] for u in users], dtype=np.int64),
+            "age": np.array([u.get("age", 0) for u in users], dtype=np.int64),
+            "gender": gender,
+            "role": role,
+        }
+        vocabularies = {"category": category_vocab, "brand": brand_vocab, "gender": gender_vocab, "role": role_vocab}
+        return cls(product_columns, user_columns, vocabularies, time.time() if taken_at is None else taken_at)
+
+    @classmethod
+    def fetch(cls, http, base_url, page_size=0, timeout=10, decoder=None):
+        return cls.from_records(fetch_all(http, base_url, "products", page_size, timeout, decoder),
+                                fetch_all(http, base_url, "users", page_size, timeout, decoder))
+
+    def save(self, path, aggregates=None):
+        """Write columns, vocabularies and (optionally) additive aggregate state to one .npz"""
+        arrays = {"taken_at": np.array(self.taken_at)}
+        arrays.update({f"product_{name}": column for name, column in self.products.items()})
+        arrays.update({f"user_{name}": column for name, column in self.users.items()})
+        arrays.update({f"vocab_{name}": vocab for name, vocab in self.vocabularies.items()})
+        if aggregates is not None:
+            arrays.update({f"agg_{name}": value for name, value in aggregates.state().items()})
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """(Snapshot, Aggregates or None) from a .npz written by save()"""
+        _require_numpy()
+        with np.load(path) as data:
+            products = {name: data[f"product_{name}"] for name in cls.PRODUCT_COLUMNS}
+            users = {name: data[f"user_{name}"] for name in cls.USER_COLUMNS}
+            vocabularies = {name: data[f"vocab_{name}"] for name in ("category", "brand", "gender", "role")}
+            state = {key[4:]: data[key] for key in data.files if key.startswith("agg_")}
+            snapshot = cls(products, users, vocabularies, float(data["taken_at"]))
+        aggregates = Aggregates.from_state(state, snapshot) if state else None
+        return snapshot, aggregates
+
+
+def _product_parts(snapshot, rows, categories):
+    """Additive per-category sums for the given product rows, against `categories`"""
+    p = snapshot.products
+    codes = _remap(p["category"][rows], snapshot.vocabularies["category"], categories)
+    n = len(categories)
+    stock = p["stock"][rows]
+    revenue = p["price"][rows] * (1 - p["discount"][rows] / 100) * stock
+    return {
+        "products": np.bincount(codes, minlength=n),
+        "revenue": np.bincount(codes, weights=revenue, minlength=n),
+        "units": np.bincount(codes, weights=stock, minlength=n),
+        "stock_outs": np.bincount(codes, weights=stock <= 0, minlength=n),
+        "low_stock": np.bincount(codes, weights=(stock > 0) & (stock < LOW_STOCK), minlength=n),
+        "rating_sum": np.bincount(codes, weights=p["rating"][rows], minlength=n),
+        "rating_hist": np.histogram(p["rating"][rows], bins=RATING_BINS)[0],
+    }
+
+
+def _user_parts(snapshot, rows, genders, roles):
+    u = snapshot.users
+    return {
+        "users": np.array(len(rows)),
+        "gender": np.bincount(_remap(u["gender"][rows], snapshot.vocabularies["gender"], genders),
+                              minlength=len(genders)),
+        "role": np.bincount(_remap(u["role"][rows], snapshot.vocabularies["role"], roles), minlength=len(roles)),
+        "age_hist": np.histogram(u["age"][rows], bins=AGE_BINS)[0],
+    }
+
+
+class Aggregates:
+    """Dashboard aggregates: additive per-category/per-group state plus percentiles
+
+    The additive part can be updated in place from a snapshot diff; percentiles
+    are order statistics, so they are always recomputed (vectorised) from the
+    newest snapshot's columns.
+    """
+
+    def __init__(self, categories, genders, roles, parts, percentiles):
+        self.categories = categories
+        self.genders = genders
+        self.roles = roles
+        self.parts = parts
+        self.percentiles = percentiles
+
+    @classmethod
+    def compute(cls, snapshot):
+        _require_numpy()
+        v = snapshot.vocabularies
+        parts = _product_parts(snapshot, np.arange(len(snapshot.products["id"])), v["category"])
+        parts.update(_user_parts(snapshot, np.arange(len(snapshot.users["id"])), v["gender"], v["role"]))
+        return cls(v["category"], v["gender"], v["role"], parts, _percentiles(snapshot))
+
+    def state(self):
+        state = {f"part_{name}": value for name, value in self.parts.items()}
+        state.update(categories=self.categories, genders=self.genders, roles=self.roles)
+        return state
+
+    @classmethod
+    def from_state(cls, state, snapshot):
+        parts = {name[5:]: value for name, value in state.items() if name.startswith("part_")}
+        return cls(state["categories"], state["genders"], state["roles"], parts, _percentiles(snapshot))
+
+    def _widen(self, categories, genders, roles):
+        """Re-index the additive state onto larger vocabularies"""
+        for name, vocab, keys in (("categories", categories, ("products", "revenue", "units", "stock_outs",
+                                                              "low_stock", "rating_sum")),
+                                  ("genders", genders, ("gender",)), ("roles", roles, ("role",))):
+            old = getattr(self, name)
+            if len(old) == len(vocab):
+                continue
+            positions = np.searchsorted(vocab, old)
+            for key in keys:
+                widened = np.zeros(len(vocab), dtype=self.parts[key].dtype)
+                widened[positions] = self.parts[key]
+                self.parts[key] = widened
+            setattr(self, name, vocab)
+
+    def update(self, old, new):
+        """Fold snapshot `new` into aggregates computed for `old`; returns the diff"""
+        diff = SnapshotDiff.between(old, new)
+        categories = np.union1d(self.categories, new.vocabularies["category"])
+        genders = np.union1d(self.genders, new.vocabularies["gender"])
+        roles = np.union1d(self.roles, new.vocabularies["role"])
+        self._widen(categories, genders, roles)
+        for sign, snapshot, product_rows, user_rows in (
+                (-1, old, diff.old_products, diff.old_users),
+                (1, new, diff.new_products, diff.new_users)):
+            parts = _product_parts(snapshot, product_rows, categories)
+            parts.update(_user_parts(snapshot, user_rows, genders, roles))
+            for name, value in parts.items():
+                self.parts[name] = self.parts[name] + sign * value
+        self.percentiles = _percentiles(new)
+        return diff
+
+    def category_rows(self):
+        """[(category, products, revenue potential, units, stock-outs, low stock, mean rating)]"""
+        p = self.parts
+        mean_rating = np.divide(p["rating_sum"], p["products"], out=np.zeros(len(self.categories)),
+                                where=p["products"] > 0)
+        order = np.argsort(-p["revenue"])
+        return [(str(self.categories[i]), int(p["products"][i]), float(p["revenue"][i]), int(p["units"][i]),
+                 int(p["stock_outs"][i]), int(p["low_stock"][i]), float(mean_rating[i]))
+                for i in order if p["products"][i] > 0]
+
+    def mismatches(self, other, rel_tol=1e-9):
+        """Names of the aggregates that differ from `other`, e.g. incremental vs full recompute"""
+        mine, theirs = self.to_dict(), other.to_dict()
+        rows = {row[0]: row[1:] for row in self.category_rows()}
+        other_rows = {row[0]: row[1:] for row in other.category_rows()}
+        names = [] if rows.keys() == other_rows.keys() and all(
+            math.isclose(a, b, rel_tol=rel_tol, abs_tol=1e-6)
+            for category, row in rows.items() for a, b in zip(row, other_rows[category])) else ["categories"]
+        names += [name for name in ("rating_histogram", "users", "gender", "role", "age_histogram")
+                  if mine[name] != theirs[name]]
+        return names
+
+    def to_dict(self):
+        p = self.parts
+        return {
+            "categories": [
+                {"category": c, "products": n, "revenue_potential": round(r, 2), "units": u,
+                 "stock_outs": s, "low_stock": low, "mean_rating": round(m, 3)}
+                for c, n, r, u, s, low, m in self.category_rows()
+            ],
+            "rating_histogram": dict(zip([f"{lo}-{hi}" for lo, hi in zip(RATING_BINS, RATING_BINS[1:])],
+                                         p["rating_hist"].tolist())),
+            "users": int(p["users"]),
+            "gender": {str(g): int(n) for g, n in zip(self.genders, p["gender"]) if n},
+            "role": {str(r): int(n) for r, n in zip(self.roles, p["role"]) if n},
+            "age_histogram": dict(zip([f"{lo}-{hi}" for lo, hi in zip(AGE_BINS, AGE_BINS[1:])],
+                                      p["age_hist"].tolist())),
+            "percentiles": self.percentiles,
+        }
+
+
+def _percentiles(snapshot):
+    out = {}
+    for label, column in (("price", snapshot.products["price"]), ("rating", snapshot.products["rating"]),
+                          ("stock", snapshot.products["stock"]), ("age", snapshot.users["age"])):
+        values = np.percentile(column, PERCENTILES) if len(column) else [float("nan")] * len(PERCENTILES)
+        out[label] = {f"p{q}": float(v) for q, v in zip(PERCENTILES, values)}
+    return out
+
+
+@dataclass
+class SnapshotDiff:
+    """Row indices whose old contribution is removed and new contribution added"""
+    old_products: object
+    new_products: object
+    old_users: object
+    new_users: object
+    changed_products: int = 0
+    changed_users: int = 0
+
+    @classmethod
+    def between(cls, old, new):
+        old_p, new_p = _changed_rows(old, new, "products", ("price", "discount", "rating", "stock"),
+                                     ("category", "brand"))
+        old_u, new_u = _changed_rows(old, new, "users", ("age",), ("gender", "role"))
+        return cls(old_p, new_p, old_u, new_u, len(new_p), len(new_u))
+
+
+def _changed_rows(old, new, table, numeric, encoded):
+    """(rows of `old` to subtract, rows of `new` to add): removed/added ids plus rows whose values changed"""
+    old_cols, new_cols = getattr(old, table), getattr(new, table)
+    _, old_idx, new_idx = np.intersect1d(old_cols["id"], new_cols["id"], return_indices=True)
+    changed = np.zeros(len(old_idx), dtype=bool)
+    for name in numeric:
+        changed |= old_cols[name][old_idx] != new_cols[name][new_idx]
+    for name in encoded:
+        # compare decoded values, since the two snapshots may have different vocabularies
+        changed |= old.vocabularies[name][old_cols[name][old_idx]] != new.vocabularies[name][new_cols[name][new_idx]]
+    removed = np.setdiff1d(np.arange(len(old_cols["id"])), old_idx)
+    added = np.setdiff1d(np.arange(len(new_cols["id"])), new_idx)
+    return np.concatenate([old_idx[changed], removed]), np.concatenate([new_idx[changed], added])
+
+
+def print_aggregates(aggregates, diff=None):
+    print("\n" + "=" * 60)
+    print("📦 CATALOGUE SNAPSHOT")
+    print("=" * 60)
+    if diff is not None:
+        print(f"Incremental update: {diff.changed_products} product rows and {diff.changed_users} user rows changed")
+    print(f"\n  {'category':<22} {'products':>8} {'revenue potential':>18} {'units':>7} "
+          f"{'out':>4} {'low':>4} {'rating':>6}")
+    for category, n, revenue, units, outs, low, rating in aggregates.category_rows():
+        print(f"  {category:<22} {n:>8} {revenue:>18,.2f} {units:>7} {outs:>4} {low:>4} {rating:>6.2f}")
+    data = aggregates.to_dict()
+    print("\n  Rating histogram: " + "  ".join(f"{b}: {n}" for b, n in data["rating_histogram"].items() if n))
+    print(f"  Users: {data['users']}  gender {data['gender']}  role {data['role']}")
+    print("  Age histogram: " + "  ".join(f"{b}: {n}" for b, n in data["age_histogram"].items() if n))
+    for label, values in data["percentiles"].items():
+        print(f"  {label:<7} " + "  ".join(f"{q} {v:,.2f}" for q, v in values.items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the aggregates stored in a catalogue snapshot")
+    parser.add_argument("path", help="Snapshot .npz written with --snapshot")
+    args = parser.parse_args(argv)
+    snapshot, aggregates = Snapshot.load(args.path)
+    print_aggregates(aggregates or Aggregates.compute(snapshot))
+
+
+if __name__ == "__main__":
+    main()
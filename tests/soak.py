@@ -0,0 +1,228 @@
+"""
+Soak Mode for Admin Dashboard API Tests
+Loops the tester's checks for a long period, sampling RSS, open file
+descriptors and tracemalloc allocators, and fits latency trend lines per
+endpoint to flag leaks and drift
+"""
+
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+from tests.dummyjson_server import endpoint_template
+
+HOUR = 3600.0
+
+
+def read_rss_bytes(pid="self"):
+    """Resident set size from /proc/<pid>/status, or None off Linux"""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def count_open_fds(pid="self"):
+    """Number of open file descriptors from /proc/<pid>/fd, or None off Linux"""
+    try:
+        return len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return None
+
+
+def fit_line(xs, ys):
+    """Least-squares (slope, intercept); slope is 0 with fewer than two points"""
+    n = len(xs)
+    if n < 2:
+        return 0.0, (ys[0] if ys else 0.0)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if not var_x:
+        return 0.0, mean_y
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    return slope, mean_y - slope * mean_x
+
+
+@dataclass
+class SoakThresholds:
+    """Limits above which a soak run is flagged"""
+    rss_growth_mb_per_hour: float = 50.0
+    fd_growth: int = 20
+    latency_drift_pct: float = 25.0
+
+
+@dataclass
+class ResourceSample:
+    elapsed: float
+    rss_bytes: int
+    open_fds: int
+    traced_bytes: int
+    server_rss_bytes: int = 0  # stand-in child process, kept out of the leak check
+
+
+class RoundLatencies:
+    """SessionPool observer collecting mean total latency per endpoint for the current round"""
+
+    def __init__(self):
+        self._sums = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, method, url, timing):
+        if timing.error:
+            return
+        endpoint = endpoint_template(method, url)
+        with self._lock:
+            total, count = self._sums.get(endpoint, (0.0, 0))
+            self._sums[endpoint] = (total + timing.total, count + 1)
+
+    def drain(self):
+        """Return {endpoint: mean seconds} for the round and start a new one"""
+        with self._lock:
+            sums, self._sums = self._sums, {}
+        return {endpoint: total / count for endpoint, (total, count) in sums.items()}
+
+
+@dataclass
+class SoakReport:
+    duration: float = 0.0
+    rounds: int = 0  # excluding the warm-up round
+    warmup: float = 0.0
+    samples: list = field(default_factory=list)
+    latency_series: dict = field(default_factory=dict)  # endpoint -> [(elapsed, mean seconds)]
+    top_allocators: list = field(default_factory=list)
+    flags: list = field(default_factory=list)
+
+
+class SoakRunner:
+    """Run tester.run_checks() every `interval` seconds for `duration` seconds
+
+    One warm-up round runs first, so connection pools, caches and lazily
+    imported modules are in place before the tracemalloc and RSS baselines
+    are taken; it is left out of the trend fits. `server_pid` is a local
+    stand-in running in another process, whose RSS is reported separately.
+    """
+
+    def __init__(self, tester, duration, interval, concurrency=1, thresholds=None, tracemalloc_frames=1,
+                 server_pid=None):
+        self.tester = tester
+        self.duration = duration
+        self.interval = interval
+        self.concurrency = concurrency
+        self.thresholds = thresholds or SoakThresholds()
+        self.tracemalloc_frames = tracemalloc_frames
+        self.server_pid = server_pid
+
+    def _sample(self, elapsed):
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        server_rss = (read_rss_bytes(self.server_pid) or 0) if self.server_pid else 0
+        return ResourceSample(elapsed, read_rss_bytes() or 0, count_open_fds() or 0, traced, server_rss)
+
+    def run(self):
+        report = SoakReport()
+        round_latencies = RoundLatencies()
+        self.tester.http.observers.append(round_latencies)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.tracemalloc_frames)
+        try:
+            warmup_start = time.monotonic()
+            self.tester.run_checks(self.concurrency)
+            round_latencies.drain()
+            report.warmup = time.monotonic() - warmup_start
+            baseline = tracemalloc.take_snapshot()
+            start = time.monotonic()
+            report.samples.append(self._sample(0.0))
+            while True:
+                round_start = time.monotonic()
+                elapsed = round_start - start
+                if elapsed >= self.duration:
+                    break
+                self.tester.run_checks(self.concurrency)
+                report.rounds += 1
+                for endpoint, mean in round_latencies.drain().items():
+                    report.latency_series.setdefault(endpoint, []).append((elapsed, mean))
+                report.samples.append(self._sample(time.monotonic() - start))
+                time.sleep(max(0.0, self.interval - (time.monotonic() - round_start)))
+            report.duration = time.monotonic() - start
+            stats = tracemalloc.take_snapshot().compare_to(baseline, "lineno")
+            report.top_allocators = [stat for stat in stats if stat.size_diff > 0][:10]
+        finally:
+            self.tester.http.observers.remove(round_latencies)
+            if started_tracing:
+                tracemalloc.stop()
+        report.flags = self.evaluate(report)
+        return report
+
+    def evaluate(self, report):
+        """Compare trends against thresholds and return a list of flag messages"""
+        flags = []
+        limits = self.thresholds
+        samples = report.samples
+        if len(samples) >= 2:
+            xs = [s.elapsed for s in samples]
+            rss_slope, _ = fit_line(xs, [s.rss_bytes for s in samples])
+            rss_mb_per_hour = rss_slope * HOUR / (1024 * 1024)
+            if rss_mb_per_hour > limits.rss_growth_mb_per_hour:
+                flags.append(f"RSS grows {rss_mb_per_hour:.1f} MB/h "
+                             f"(limit {limits.rss_growth_mb_per_hour:.1f} MB/h)")
+            fd_growth = samples[-1].open_fds - samples[0].open_fds
+            if fd_growth > limits.fd_growth:
+                flags.append(f"Open file descriptors grew by {fd_growth} (limit {limits.fd_growth})")
+        for endpoint, series in sorted(report.latency_series.items()):
+            drift = latency_drift_pct(series)
+            if drift is not None and drift > limits.latency_drift_pct:
+                flags.append(f"{endpoint} latency drifts +{drift:.0f}% over the run "
+                             f"(limit {limits.latency_drift_pct:.0f}%)")
+        return flags
+
+
+def latency_drift_pct(series):
+    """Fitted latency change from first to last round, as a percentage of the fitted start"""
+    if len(series) < 3:
+        return None
+    xs = [x for x, _ in series]
+    slope, intercept = fit_line(xs, [y for _, y in series])
+    start_value = intercept + slope * xs[0]
+    if start_value <= 0:
+        return None
+    return slope * (xs[-1] - xs[0]) / start_value * 100
+
+
+def print_soak_report(report):
+    print("\n" + "=" * 60)
+    print("🧪 SOAK SUMMARY")
+    print("=" * 60)
+    print(f"Duration: {report.duration:.0f}s  Rounds: {report.rounds} (after a {report.warmup:.1f}s warm-up round)")
+    if report.samples:
+        first, last = report.samples[0], report.samples[-1]
+        print(f"RSS: {first.rss_bytes / 2**20:.1f} MB → {last.rss_bytes / 2**20:.1f} MB  "
+              f"Open FDs: {first.open_fds} → {last.open_fds}  "
+              f"Traced: {first.traced_bytes / 1024:.0f} KiB → {last.traced_bytes / 1024:.0f} KiB")
+        if last.server_rss_bytes:
+            print(f"Stand-in RSS (separate process, not checked): {first.server_rss_bytes / 2**20:.1f} MB → "
+                  f"{last.server_rss_bytes / 2**20:.1f} MB")
+    if report.latency_series:
+        print("\n  Latency trend (mean total ms per round):")
+        for endpoint, series in sorted(report.latency_series.items()):
+            drift = latency_drift_pct(series)
+            drift_text = f"{drift:+.1f}%" if drift is not None else "n/a"
+            print(f"    {endpoint:<32} first {series[0][1] * 1000:>8.2f}  last {series[-1][1] * 1000:>8.2f}  "
+                  f"drift {drift_text}")
+    if report.top_allocators:
+        print("\n  Top allocation growth (tracemalloc):")
+        for stat in report.top_allocators:
+            frame = stat.traceback[0]
+            print(f"    +{stat.size_diff / 1024:>8.1f} KiB  {frame.filename}:{frame.lineno}")
+    if report.flags:
+        print("\n⚠️  SOAK FLAGS:")
+        for flag in report.flags:
+            print(f"  • {flag}")
+    else:
+        print("\n✅ No leaks or drift above thresholds")
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Synthetic Catalogue Data Layer for the DummyJSON Stand-in
+Generates millions of users and products with the fixtures' shape, serves them
+with offset or cursor pagination and linear or inverted-index search, and
+benchmarks both strategies as the collections grow
+"""
+
+import argparse
+import json
+import re
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain, islice
+
+from tests.dummyjson_server import DummyJSONStandIn, StandInServer, _load_fixture
+from tests.http_pool import SessionPool
+from tests.latency import Histogram
+
+MASK64 = (1 << 64) - 1
+
+FIRST_NAMES = (
+    "Aaron", "Adam", "Aiden", "Alice", "Amir", "Anna", "Aria", "Arthur", "Beatrice", "Caleb", "Camila", "Carter",
+    "Clara", "Daniel", "David", "Diego", "Eleanor", "Elijah", "Elena", "Felix", "Freya", "Gabriel", "Hannah",
+    "Hugo", "Iris", "Isaac", "Jack", "Jacob", "John", "Johnny", "Jonah", "Julia", "Kai", "Layla", "Leo", "Lily",
+    "Luna", "Maya", "Mila", "Nathan", "Nora", "Oliver", "Oscar", "Penelope", "Quinn", "Riley", "Rose", "Ruby",
+    "Samuel", "Sara", "Sebastian", "Stella", "Theo", "Violet", "Wyatt", "Zoe",
+)
+LAST_NAMES = (
+    "Adams", "Allen", "Anderson", "Baker", "Bennett", "Brooks", "Brown", "Campbell", "Carter", "Clark", "Collins",
+    "Cook", "Cooper", "Davis", "Edwards", "Evans", "Fisher", "Foster", "Garcia", "Gray", "Green", "Hall", "Harris",
+    "Hughes", "Jackson", "Johnson", "Johnston", "Jones", "Kelly", "King", "Lee", "Lewis", "Martin", "Miller",
+    "Mitchell", "Moore", "Morgan", "Murphy", "Nelson", "Parker", "Perez", "Reed", "Roberts", "Rogers", "Scott",
+    "Smith", "Taylor", "Thomas", "Turner", "Walker", "Ward", "White", "Williams", "Wilson", "Wood", "Young",
+)
+MODIFIERS = ("Pro", "Max", "Mini", "Plus", "Lite", "Classic", "Deluxe", "Edition", "Ultra", "Air", "Essential",
+             "Premium", "Compact", "Signature", "Original", "Select")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _mix(x):
+    """splitmix64: a fast, well-distributed 64-bit hash"""
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def _scaled_price(base, r):
+    """Scale a fixture price by 0.5x-1.5x"""
+    return base * (0.5 + (r & 0xFFF) / 0xFFF)
+
+
+class SyntheticCollection:
+    """`size` records whose fields are derived on demand from (seed, id)
+
+    Ids 1..len(fixtures) are the fixture records themselves, so the tester's
+    checks (login as emilys, /users/1, ...) keep working; generated records
+    copy a fixture's shape and redraw the identifying and numeric fields. Only
+    ids, a search haystack and the inverted index are kept in memory.
+    """
+
+    def __init__(self, kind, size, seed=0, fixtures=None, gap_every=97):
+        if kind not in ("users", "products"):
+            raise ValueError(f"Unknown synthetic collection '{kind}'")
+        self.kind = kind
+        self.seed = seed
+        self.fixtures = fixtures if fixtures is not None else _load_fixture(kind)
+        self._templates = [json.dumps(record) for record in self.fixtures]
+        # Ids are sorted with occasional gaps, like a table that has seen deletes
+        fixed = len(self.fixtures)
+        generated = (i for i in range(fixed + 1, fixed + 1 + size * 2)
+                     if not gap_every or _mix(seed ^ i) % gap_every)
+        self.ids = array("q", [record["id"] for record in self.fixtures])
+        self.ids.extend(islice(generated, max(0, size - fixed)))
+        if kind == "products":
+            self._words = {}
+            for product in self.fixtures:
+                words = self._words.setdefault(product["category"], [])
+                words.extend(w for w in product["title"].split() if w not in words)
+        self._haystack = None
+        self._index = None
+        self._tokens = None
+        self._grams = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _draw(self, record_id, field):
+        return _mix((self.seed << 40) ^ (record_id << 6) ^ field)
+
+    def _pick(self, record_id, field, pool):
+        return pool[self._draw(record_id, field) % len(pool)]
+
+    def contains(self, record_id):
+        position = bisect_left(self.ids, record_id)
+        return position < len(self.ids) and self.ids[position] == record_id
+
+    def _search_fields(self, record_id):
+        """The fields DummyJSON's ?q= search looks at, without building the record"""
+        if record_id <= len(self.fixtures):
+            record = self.fixtures[record_id - 1]
+            if self.kind == "users":
+                return tuple(record[f] for f in ("firstName", "lastName", "maidenName", "username", "email"))
+            return record["title"], record["description"]
+        if self.kind == "users":
+            first = self._pick(record_id, 1, FIRST_NAMES)
+            last = self._pick(record_id, 2, LAST_NAMES)
+            maiden = self._pick(record_id, 3, LAST_NAMES) if self._draw(record_id, 4) % 3 == 0 else ""
+            username = f"{first[:5]}{last[:1]}{record_id}".lower()
+            return first, last, maiden, username, f"{first}.{last}{record_id}@x.dummyjson.com".lower()
+        template = self.fixtures[self._draw(record_id, 0) % len(self.fixtures)]
+        words = self._words[template["category"]]
+        title = " ".join(filter(None, (
+            template.get("brand") or "",
+            self._pick(record_id, 1, words),
+            self._pick(record_id, 2, words),
+            self._pick(record_id, 3, MODIFIERS),
+        )))
+        return title, f"{title}: {template['description'].partition(': ')[2] or template['description']}"
+
+    def record(self, record_id):
+        """Full record for an id, or None if it does not exist"""
+        if not self.contains(record_id):
+            return None
+        if record_id <= len(self.fixtures):
+            return json.loads(self._templates[record_id - 1])
+        template = self._draw(record_id, 0) % len(self.fixtures)
+        record = json.loads(self._templates[template])
+        record["id"] = record_id
+        fields = self._search_fields(record_id)
+        r = self._draw(record_id, 5)
+        if self.kind == "users":
+            record.update(zip(("firstName", "lastName", "maidenName", "username", "email"), fields))
+            record["age"] = 18 + r % 60
+            record["password"] = f"pass{record_id}"
+            record["role"] = self.fixtures[(r >> 8) % len(self.fixtures)]["role"]
+            record["image"] = f"https://dummyjson.com/icon/{fields[3]}/128"
+            record["address"]["city"] = self.fixtures[(r >> 16) % len(self.fixtures)]["address"]["city"]
+            return record
+        record["title"], record["description"] = fields
+        record["price"] = round(_scaled_price(record["price"], r), 2)
+        record["discountPercentage"] = round((r >> 12) % 2000 / 100, 2)
+        record["rating"] = round(1 + (r >> 24) % 400 / 100, 2)
+        record["stock"] = (r >> 36) % 150
+        record["availabilityStatus"] = "Out of Stock" if record["stock"] == 0 else (
+            "Low Stock" if record["stock"] < 10 else "In Stock")
+        record["sku"] = f"{r & 0xFFFFFFFF:08X}"
+        return record
+
+    # -- search ---------------------------------------------------------------
+
+    def haystack(self):
+        """Lower-cased search fields per record, one string each, built once (what a linear scan reads)"""
+        if self._haystack is None:
+            self._haystack = [tuple(field.lower() for field in self._search_fields(record_id))
+                              for record_id in self.ids]
+        return self._haystack
+
+    def index(self):
+        """Inverted index: token -> sorted id postings, plus 2- and 3-gram -> token positions over the vocabulary"""
+        if self._index is None:
+            index = {}
+            for record_id in self.ids:
+                tokens = set()
+                for field in self._search_fields(record_id):
+                    tokens.update(tokenize(field))
+                for token in tokens:
+                    postings = index.get(token)
+                    if postings is None:
+                        postings = index[token] = array("q")
+                    postings.append(record_id)
+            self._index = index
+            self._tokens = sorted(index)
+            grams = {}
+            for position, token in enumerate(self._tokens):
+                for gram in {token[i:i + n] for n in (2, 3) for i in range(len(token) - n + 1)}:
+                    postings = grams.get(gram)
+                    if postings is None:
+                        postings = grams[gram] = array("i")
+                    postings.append(position)
+            self._grams = grams
+        return self._index
+
+    def _tokens_containing(self, word):
+        """Vocabulary tokens having `word` as a substring"""
+        if len(word) < 3:
+            if len(word) == 2:
+                return [self._tokens[p] for p in self._grams.get(word, ())]
+            return [token for token in self._tokens if word in token]
+        postings = sorted((self._grams.get(word[i:i + 3], ()) for i in range(len(word) - 2)), key=len)
+        positions = set(postings[0])
+        for other in postings[1:]:
+            positions.intersection_update(other)
+            if not positions:
+                return []
+        return [self._tokens[p] for p in positions if word in self._tokens[p]]
+
+    def search_linear(self, q):
+        """Ids with a search field containing `q` as a substring (DummyJSON semantics)"""
+        q = q.lower()
+        ids = self.ids
+        return [ids[i] for i, fields in enumerate(self.haystack()) if any(q in field for field in fields)]
+
+    def search_indexed(self, q):
+        """The same ids as search_linear(), found through the index
+
+        Each alphanumeric run of `q` lies inside a single token of any field
+        containing `q`, so records holding a token that contains every run
+        are a superset of the answer. When `q` is one run they are the
+        answer; otherwise they are filtered field by field like the linear
+        scan, so runs found in different fields do not match.
+        Runs whose matching tokens and postings together outnumber 1/8 of the
+        collection are left to that filter, and the linear scan is used when
+        no run is selective.
+        """
+        index = self.index()
+        q = q.lower()
+        words = tokenize(q)
+        exact = len(words) == 1 and words[0] == q
+        budget = len(self.ids) // 8
+        candidates = None
+        for word in sorted(set(words), key=len, reverse=True):
+            if candidates is not None and len(word) < 3:
+                break
+            tokens = self._tokens_containing(word)
+            if exact and len(tokens) == 1:
+                # One token: its postings are already the sorted answer
+                return list(index[tokens[0]])
+            if len(tokens) + sum(len(index[token]) for token in islice(tokens, budget)) > budget:
+                continue
+            matched = set(chain.from_iterable(map(index.__getitem__, tokens)))
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return []
+        if candidates is None:
+            return self.search_linear(q)
+        result = sorted(candidates)
+        if exact:
+            return result
+        ids, haystack = self.ids, self.haystack()
+        return [record_id for record_id in result
+                if any(q in field for field in haystack[bisect_left(ids, record_id)])]
+
+    def check_search(self, queries):
+        """Raise ValueError unless search_indexed() and search_linear() agree on every query"""
+        for q in queries:
+            indexed, linear = self.search_indexed(q), self.search_linear(q)
+            if indexed != linear:
+                raise ValueError(f"{self.kind} search for {q!r}: index found {len(indexed)} ids, "
+                                 f"a linear scan {len(linear)}")
+
+    # -- pagination -------------------------------------------------------------
+
+    @staticmethod
+    def page_offset(ids, skip, limit):
+        """Offset paging walks past `skip` entries, as a database skip does"""
+        walker = iter(ids)
+        for _ in islice(walker, skip):
+            pass
+        return list(islice(walker, limit)) if limit else list(walker)
+
+    @staticmethod
+    def page_cursor(ids, cursor, limit):
+        """Cursor paging seeks to the first id after `cursor` in O(log n)"""
+        start = bisect_right(ids, cursor)
+        return list(ids[start:start + limit]) if limit else list(ids[start:])
+
+
+class SyntheticStandIn(DummyJSONStandIn):
+    """DummyJSON stand-in backed by SyntheticCollections
+
+    Extra query parameters: `cursor=<id>` switches list and search routes to
+    cursor paging (responses carry `nextCursor`), and `search=linear|index`
+    picks the search strategy (default index).
+    """
+
+    def __init__(self, users=100_000, products=100_000, seed=0):
+        self.synthetic = {
+            "users": SyntheticCollection("users", users, seed),
+            "products": SyntheticCollection("products", products, seed),
+        }
+        super().__init__(users=self.synthetic["users"].fixtures, products=self.synthetic["products"].fixtures)
+
+    def _synthetic_page(self, collection, ids, query, key, public=None):
+        limit = int(query.get("limit", 30))
+        if "cursor" in query:
+            page_ids = collection.page_cursor(ids, int(query["cursor"] or 0), limit)
+            skip = None
+        else:
+            skip = int(query.get("skip", 0))
+            page_ids = collection.page_offset(ids, skip, limit)
+        records = [collection.record(record_id) for record_id in page_ids]
+        if public:
+            records = [public(record) for record in records]
+        page = {key: records, "total": len(ids), "limit": len(records)}
+        if skip is None:
+            page["nextCursor"] = page_ids[-1] if page_ids and page_ids[-1] != ids[-1] else None
+        else:
+            page["skip"] = skip
+        return page
+
+    def handle(self, route, params, query, body):
+        kind = route.partition("_")[0]
+        collection = self.synthetic.get(kind)
+        if collection is None or route.endswith("_categories") or route == "products_category":
+            return super().handle(route, params, query, body)
+        public = self._public_user if kind == "users" else None
+        if route.endswith("_get"):
+            try:
+                record = collection.record(int(params["id"]))
+            except ValueError:
+                record = None
+            if record is None:
+                noun = "User" if kind == "users" else "Product"
+                return 404, {"message": f"{noun} with id '{params['id']}' not found"}
+            return 200, public(record) if public else record
+        if route.endswith("_search"):
+            search = collection.search_linear if query.get("search") == "linear" else collection.search_indexed
+            ids = search(query.get("q", ""))
+        else:
+            ids = collection.ids
+        return 200, self._synthetic_page(collection, ids, query, kind, public)
+
+
+def _time_requests(http, urls, repeats):
+    hist = Histogram()
+    for _ in range(repeats):
+        for url in urls:
+            start = time.perf_counter()
+            response = http.get(url, timeout=120)
+            response.raise_for_status()
+            hist.record((time.perf_counter() - start) * 1_000_000)
+    return hist
+
+
+def scale_benchmark(sizes, queries=("john", "smith", "apple pro", "jo"), page_size=30, repeats=3, seed=0):
+    """For each collection size, time deep offset vs cursor pages and linear vs indexed search
+
+    Returns rows of (size, build seconds, {scenario: Histogram}).
+    """
+    rows = []
+    for size in sizes:
+        build_start = time.perf_counter()
+        app = SyntheticStandIn(users=size, products=size, seed=seed)
+        for collection in app.synthetic.values():
+            collection.haystack()
+            collection.index()
+        build = time.perf_counter() - build_start
+        for collection in app.synthetic.values():
+            collection.check_search(("",) + tuple(queries))
+        with StandInServer(app=app) as server:
+            base_url = server.base_url
+            http = SessionPool()
+            try:
+                results = {}
+                for kind, collection in app.synthetic.items():
+                    ids = collection.ids
+                    # the same pages at 10%, 50% and 90% of the way through
+                    positions = [len(ids) * fraction // 10 for fraction in (1, 5, 9)]
+                    results[f"{kind} offset"] = _time_requests(
+                        http, [f"{base_url}/{kind}?limit={page_size}&skip={p}" for p in positions], repeats)
+                    results[f"{kind} cursor"] = _time_requests(
+                        http, [f"{base_url}/{kind}?limit={page_size}&cursor={ids[p - 1] if p else 0}"
+                               for p in positions], repeats)
+                for mode in ("linear", "index"):
+                    results[f"search {mode}"] = _time_requests(
+                        http, [f"{base_url}/users/search?q={q}&limit={page_size}&search={mode}" for q in queries],
+                        repeats)
+            finally:
+                http.close()
+        rows.append((size, build, results))
+    return rows
+
+
+def print_scale_benchmark(rows):
+    print("\n=== Scale Benchmark (ms per request, p50 / p99) ===")
+    scenarios = list(rows[0][2]) if rows else []
+    header = "".join(f"{name:>22}" for name in scenarios)
+    print(f"  {'records':>9} {'build s':>8}{header}")
+    for size, build, results in rows:
+        cells = "".join(
+            f"{results[name].percentile(50) / 1000:>10.2f} / {results[name].percentile(99) / 1000:>8.2f}"
+            for name in scenarios
+        )
+        print(f"  {size:>9} {build:>8.1f}{cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offset vs cursor paging and linear vs indexed search at scale")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated collection sizes")
+    parser.add_argument("--page-size", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print_scale_benchmark(scale_benchmark(sizes, page_size=args.page_size, repeats=args.repeats, seed=args.seed))
+
+
+if __name__ == "__main__":
+    main()